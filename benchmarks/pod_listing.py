@@ -0,0 +1,131 @@
+"""Compare parsing a pod list into V1Pod models with the raw JSON fast path.
+
+Usage: python -m benchmarks.pod_listing [--pods 5000] [--repeat 3]
+"""
+import argparse
+import json
+import os
+import time
+import tracemalloc
+
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+
+from kubernetes import client
+from k8s.azure_client import AzureClient
+
+
+class FakeResponse:
+    """Stands in for the urllib3 response ApiClient.deserialize reads from."""
+
+    def __init__(self, data):
+        self.data = data
+
+
+def make_pod(i):
+    """A pod as the API server returns it, with the usual spec and status noise."""
+    name = f"service-{i % 50}-7d9f8b6c4-{i:05d}"
+    return {
+        "metadata": {
+            "name": name,
+            "namespace": "bench",
+            "uid": f"00000000-0000-0000-0000-{i:012d}",
+            "resourceVersion": str(100000 + i),
+            "creationTimestamp": "2024-05-01T12:00:00Z",
+            "labels": {"app": f"service-{i % 50}", "pod-template-hash": "7d9f8b6c4"},
+            "annotations": {"kubectl.kubernetes.io/restartedAt": "2024-05-01T11:59:00Z"},
+            "ownerReferences": [{"apiVersion": "apps/v1", "kind": "ReplicaSet", "name": f"service-{i % 50}-7d9f8b6c4", "uid": "rs", "controller": True}],
+        },
+        "spec": {
+            "nodeName": f"aks-nodepool1-{i % 12}",
+            "containers": [
+                {
+                    "name": container,
+                    "image": f"registry.example.com/{container}:1.2.3",
+                    "ports": [{"containerPort": 8080, "protocol": "TCP"}],
+                    "env": [{"name": "LOG_LEVEL", "value": "info"}],
+                    "resources": {"limits": {"cpu": "500m", "memory": "512Mi"}, "requests": {"cpu": "100m", "memory": "128Mi"}},
+                    "volumeMounts": [{"name": "kube-api-access", "mountPath": "/var/run/secrets/kubernetes.io/serviceaccount", "readOnly": True}],
+                }
+                for container in ("app", "sidecar")
+            ],
+            "volumes": [{"name": "kube-api-access", "projected": {"sources": [{"serviceAccountToken": {"path": "token", "expirationSeconds": 3607}}]}}],
+        },
+        "status": {
+            "phase": "Running",
+            "hostIP": "10.0.0.4",
+            "podIP": f"10.244.{i // 250}.{i % 250}",
+            "startTime": "2024-05-01T12:00:01Z",
+            "conditions": [{"type": kind, "status": "True", "lastTransitionTime": "2024-05-01T12:00:05Z"} for kind in ("Initialized", "Ready", "ContainersReady", "PodScheduled")],
+            "containerStatuses": [
+                {
+                    "name": container,
+                    "ready": True,
+                    "restartCount": i % 3,
+                    "image": f"registry.example.com/{container}:1.2.3",
+                    "imageID": "sha256:0123456789abcdef",
+                    "containerID": f"containerd://{i:064d}",
+                    "state": {"running": {"startedAt": "2024-05-01T12:00:03Z"}},
+                }
+                for container in ("app", "sidecar")
+            ],
+        },
+    }
+
+
+def make_pod_list(count):
+    return json.dumps({
+        "kind": "PodList",
+        "apiVersion": "v1",
+        "metadata": {"resourceVersion": "200000"},
+        "items": [make_pod(i) for i in range(count)],
+    }).encode()
+
+
+def measure(fn, repeat):
+    """Return (best seconds, peak traced bytes) of fn over repeat runs."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pods', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    data = make_pod_list(args.pods)
+    azure_client = AzureClient()
+    api_client = client.ApiClient()
+
+    def model_path():
+        from datetime import datetime, timezone
+        pods = api_client.deserialize(FakeResponse(data.decode()), 'V1PodList')
+        now = datetime.now(timezone.utc)
+        return [azure_client._pod_to_dict(pod, now) for pod in pods.items]
+
+    def raw_path():
+        return azure_client._parse_pod_list(data)[0]
+
+    assert model_path() == raw_path(), "Both paths must produce the same rows"
+    print(f"{args.pods} pods, {len(data) / 1024 / 1024:.1f} MiB of JSON, best of {args.repeat}")
+    results = {}
+    for name, fn in (('model', model_path), ('raw', raw_path)):
+        seconds, peak = measure(fn, args.repeat)
+        results[name] = (seconds, peak)
+        print(f"  {name:<6} {seconds * 1000:8.1f} ms  peak {peak / 1024 / 1024:7.1f} MiB")
+    model, raw = results['model'], results['raw']
+    print(f"  raw path: {raw[0] / model[0]:.0%} of the time, {raw[1] / model[1]:.0%} of the memory")
+    azure_client.executor.shutdown()
+
+
+if __name__ == '__main__':
+    main()
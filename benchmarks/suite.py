@@ -0,0 +1,303 @@
+"""Headless benchmarks of the table, log filter, pod listing and spinner cascade hot paths.
+
+Usage: python -m benchmarks.suite [--only datatable] [--repeat 3] [--output results.json]
+                                  [--baseline benchmarks/baseline.json] [--save-baseline] [--tolerance 0.25]
+
+Kivy runs with an offscreen window. Each benchmark reports its best time over
+repeat runs and the peak traced memory of one more run. Results are written as
+JSON and compared with the baseline: a benchmark whose time or peak memory
+exceeds its baseline by more than tolerance is a regression, and the exit
+status is 1 if there is any. --save-baseline stores the results as the new
+baseline instead.
+
+Timings are absolute, so a baseline only holds for the machine it was saved
+on and none is committed. Before comparing, save a baseline of the unchanged
+tree on the machine running the comparison with --save-baseline.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+os.environ.setdefault('KIVY_LOG_MODE', 'PYTHON')
+if not os.environ.get('DISPLAY'):
+    os.environ.setdefault('SDL_VIDEODRIVER', 'offscreen')
+
+from kivy.config import Config
+Config.set('graphics', 'maxfps', '0')  # Frames in a benchmark must not wait for vsync
+Config.set('kivy', 'log_level', 'warning')
+
+from benchmarks.pod_listing import make_pod_list, measure
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+TABLE_SIZES = {'100': 100, '1k': 1000, '10k': 10000}
+LOG_SIZES = {'1MB': 1024 ** 2, '10MB': 10 * 1024 ** 2, '100MB': 100 * 1024 ** 2}
+FILTER_QUERIES = {'substring': 'error', 'regex': r'/slow query on \w+ took 1\d{3}ms/'}
+PARSE_SIZES = {'100': 100, '1k': 1000, '10k': 10000}
+FAKE_SERVER_SIZES = {'500': 500, '5k': 5000}
+TIME_NOISE = 0.001  # Seconds of slowdown too small to count as a regression
+MEMORY_NOISE = 1024 ** 2  # Bytes of growth too small to count as a regression
+BENCHMARKS = []  # (name, setup); setup() returns the function to time
+
+
+def benchmark(name):
+    def register(setup):
+        BENCHMARKS.append((name, setup))
+        return setup
+    return register
+
+
+def frame():
+    """Run one frame: scheduled callbacks, layout and drawing."""
+    from kivy.base import EventLoop
+    EventLoop.idle()
+
+
+def run_until(done, timeout=60):
+    """Run frames until done() is true."""
+    deadline = time.perf_counter() + timeout
+    while not done():
+        if time.perf_counter() > deadline:
+            raise TimeoutError("benchmark did not finish")
+        frame()
+
+
+def shown_table(rows):
+    """A virtualized pods table with rows, laid out in the window."""
+    from kivy.core.window import Window
+    from kivy.metrics import dp
+    from ui.datatable import CustomDataTable
+    for child in list(Window.children):
+        Window.remove_widget(child)
+    table = CustomDataTable(
+        column_data=["Name", "Status", "Age", "Restarts"],
+        row_data=rows,
+        column_widths=[dp(200), dp(150), dp(100), dp(100)],
+        virtualized=True,
+    )
+    Window.add_widget(table)
+    frame()
+    return table
+
+
+def table_rows(count, generation=0):
+    return [(f"service-{i % 50}-{i:06d}", "Running" if (i + generation) % 7 else "Pending", f"{i % 30} days ago", (i + generation) % 5)
+            for i in range(count)]
+
+
+def log_text(size):
+    """About size bytes of log lines, the same on every run."""
+    rng = random.Random(size)
+    levels = ['INFO'] * 6 + ['DEBUG'] * 3 + ['WARN', 'ERROR']
+    lines = []
+    total = 0
+    while total < size:
+        level = rng.choice(levels)
+        if level == 'WARN':
+            message = f"slow query on orders took {rng.randint(200, 2000)}ms"
+        else:
+            message = f"GET /api/v1/orders/{rng.randint(1, 99999)} {200 if level != 'ERROR' else 503} {rng.randint(1, 900)}ms"
+        line = f"2025-01-01T00:{total // 60000 % 60:02d}:{total // 1000 % 60:02d}Z {level:<5} {message} trace={rng.getrandbits(128):032x}"
+        lines.append(line)
+        total += len(line) + 1
+    return '\n'.join(lines) + '\n'
+
+
+def ensure_app():
+    """KivyMD widgets need a running MDApp for their theme."""
+    from kivy.app import App
+    from kivymd.app import MDApp
+    if App.get_running_app() is None:
+        App._running_app = MDApp()
+
+
+def pods_tab():
+    """A PodsTab on the dummy client, with its own log buffer settings."""
+    from k8s.dummy_azure_client import DummyAzureClient
+    from kivy.uix.spinner import Spinner
+    from ui.tabs.pods_tab import PodsTab
+    ensure_app()
+    return PodsTab(azure_client=DummyAzureClient(), namespace_spinner=Spinner())
+
+
+def register_benchmarks():
+    for label, count in TABLE_SIZES.items():
+        @benchmark(f"datatable.update_row_data[{label}]")
+        def update_row_data(count=count):
+            """Replace all rows and lay out the next frame."""
+            table = shown_table(table_rows(count))
+            generations = [table_rows(count, generation) for generation in (1, 2)]
+            turn = [0]
+
+            def run():
+                turn[0] += 1
+                table.update_row_data(generations[turn[0] % 2])
+                frame()
+            return run
+
+        @benchmark(f"datatable.select_row[{label}]")
+        def select_row(count=count):
+            """Select a row, alternating between two, and draw the next frame."""
+            table = shown_table(table_rows(count))
+            turn = [0]
+
+            def run():
+                turn[0] += 1
+                table.select_row(turn[0] % 2)
+                frame()
+            return run
+
+    for size_label, size in LOG_SIZES.items():
+        for query_label, query in FILTER_QUERIES.items():
+            @benchmark(f"pods_tab.filter_output[{size_label},{query_label}]")
+            def filter_output(size=size, query=query):
+                """Filter a loaded log and render the matches, waiting for the filter worker."""
+                tab = pods_tab()
+                tab.set_output(log_text(size))
+                assert tab.log_buffer.dropped == 0, "The log does not fit the Pods tab's buffer"
+
+                def run():
+                    tab.view_matches = None
+                    tab.command_output.text = ''  # Otherwise rendering the same matches again is a no-op
+                    tab.filter_input.text = query
+                    tab.filter_output()
+                    run_until(lambda: tab.view_matches is not None)
+                return run
+
+    for label, count in PARSE_SIZES.items():
+        @benchmark(f"azure_client.parse_pods[{label}]")
+        def parse_pods(count=count):
+            """Parse a raw PodList into table rows, the fast path of get_pods."""
+            from k8s.azure_client import AzureClient
+            azure_client = AzureClient()
+            data = make_pod_list(count)
+            return lambda: azure_client._parse_pod_list(data)
+
+    for label, count in FAKE_SERVER_SIZES.items():
+        @benchmark(f"azure_client.get_pods[{label},fake-server]")
+        def get_pods(count=count):
+            """get_pods end to end against the local fake API server, cache bypassed."""
+            from k8s.azure_client import AzureClient
+            from k8s.dummy_profile import DummyProfile
+            from k8s.fake_api_server import FakeApiServer
+            server = FakeApiServer(DummyProfile(pod_count=count, latency_median=0, churn_interval=3600)).start()
+            kubeconfig = server.write_kubeconfig(os.path.join(tempfile.mkdtemp(), 'kubeconfig.json'), [('rg-bench', 'aks-bench')])
+            azure_client = AzureClient(config_file=kubeconfig)
+            azure_client.safe_load_kube_config('aks-bench')
+            completed = []
+            azure_client.bind(on_pods_complete=lambda instance, total: completed.append(total))
+
+            def run():
+                azure_client.response_cache.invalidate()
+                completed.clear()
+                azure_client.get_pods('bench')
+                run_until(lambda: completed)
+            return run
+
+    @benchmark("main.load_cached_selections")
+    def load_cached_selections():
+        """Restore all cached spinner selections, cascading through the dependent spinners."""
+        from kivy.app import App
+        from data.DATA import SUBSCRIPTIONS
+        subscription = SUBSCRIPTIONS[1]
+        resource_group, clusters = next(iter(subscription.resource_groups.items()))
+        cwd = os.getcwd()
+        os.chdir(tempfile.mkdtemp())  # The app keeps cache.json and its other caches in the working directory
+        try:
+            with open('cache.json', 'w') as f:
+                json.dump({
+                    'region': {'value': subscription.region},
+                    'environment': {'value': subscription.environment},
+                    'subscription': {'value': subscription.name},
+                    'resource_group': {'value': resource_group},
+                    'cluster': {'value': clusters[0]},
+                }, f)
+            import main
+            app = main.KubernetesApp()
+            App._running_app = app
+            root = app.build()
+        finally:
+            os.chdir(cwd)
+        root.merge_cluster = lambda refresh_credentials=True: None  # Measure the cascade, not a merge and its popup
+        return root.load_cached_selections
+
+
+def compare(results, baseline, tolerance):
+    """Return (report lines, regressed benchmark names)."""
+    lines, regressions = [], []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            lines.append(f"  {name:<52} {result['seconds'] * 1000:10.2f} ms {result['peak_bytes'] / 1024 / 1024:8.1f} MiB  (new)")
+            continue
+        time_ratio = result['seconds'] / base['seconds'] if base['seconds'] else 1
+        memory_ratio = result['peak_bytes'] / base['peak_bytes'] if base['peak_bytes'] else 1
+        regressed = (time_ratio > 1 + tolerance and result['seconds'] - base['seconds'] > TIME_NOISE
+                     or memory_ratio > 1 + tolerance and result['peak_bytes'] - base['peak_bytes'] > MEMORY_NOISE)
+        if regressed:
+            regressions.append(name)
+        lines.append(f"  {name:<52} {result['seconds'] * 1000:10.2f} ms {result['peak_bytes'] / 1024 / 1024:8.1f} MiB"
+                     f"  time {time_ratio:6.2f}x  memory {memory_ratio:6.2f}x{'  REGRESSION' if regressed else ''}")
+    return lines, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--only', action='append', help="Run only benchmarks whose name contains this (repeatable)")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=0.25, help="Allowed slowdown or memory growth, 0.25 = 25%%")
+    args = parser.parse_args()
+    args.output = os.path.abspath(args.output)
+    args.baseline = os.path.abspath(args.baseline)
+
+    register_benchmarks()
+    results = {}
+    for name, setup in BENCHMARKS:
+        if args.only and not any(part in name for part in args.only):
+            continue
+        run = setup()
+        seconds, peak = measure(run, args.repeat)
+        results[name] = {'seconds': seconds, 'peak_bytes': peak}
+        print(f"  {name:<52} {seconds * 1000:10.2f} ms {peak / 1024 / 1024:8.1f} MiB", flush=True)
+
+    report = {
+        'created': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': args.repeat,
+        'results': results,
+    }
+    path = args.baseline if args.save_baseline else args.output
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {path}")
+    if args.save_baseline:
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; save one with --save-baseline")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if (baseline['python'], baseline['platform']) != (report['python'], report['platform']):
+        print(f"Note: the baseline was saved with Python {baseline['python']} on {baseline['platform']};"
+              " save one on this machine with --save-baseline to compare timings")
+    lines, regressions = compare(results, baseline['results'], args.tolerance)
+    print(f"Compared with {args.baseline} (tolerance {args.tolerance:.0%}):")
+    print("\n".join(lines))
+    if regressions:
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
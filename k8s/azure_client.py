@@ -1,13 +1,22 @@
+import base64
 import subprocess
 import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from kivy.clock import Clock
 from kivy.event import EventDispatcher
-from kubernetes import client, config
-from kubernetes.client.rest import ApiException
+from k8s import kube
+from k8s.client_pool import ApiClientPool
+from k8s.executor import RequestExecutor
+from k8s.metrics import Metrics
+from k8s.pod_describer import PodDescriber
+from k8s.singleflight import SingleFlight
+from k8s.response_cache import ResponseCache
 from datetime import datetime, timezone
 from humanize import naturaltime
 import logging
 import json
+import socket
 
 
 logging.getLogger('urllib3').setLevel(logging.WARNING)
@@ -15,222 +24,951 @@ logging.getLogger('http.client').setLevel(logging.WARNING)
 logging.getLogger('kubernetes').setLevel(logging.WARNING)
 
 class AzureClient(EventDispatcher):
-    def __init__(self):
+    WATCH_TIMEOUT_SECONDS = 60  # Server-side watch timeout, the stream is reopened after it
+    WATCH_RETRY_DELAY = 1
+    WATCH_MAX_RETRY_DELAY = 30
+    POD_PAGE_SIZE = 500  # Pods per list request (limit/continue)
+    RAW_POD_LISTING = True  # Parse pod lists from raw JSON instead of building V1Pod models
+    METADATA_PAGE_SIZE = 500  # Objects per metadata-only list request
+    METADATA_ACCEPT = 'application/json;as=PartialObjectMetadataList;g=meta.k8s.io;v=v1,application/json'
+    METADATA_WATCH_ACCEPT = 'application/json;as=PartialObjectMetadata;g=meta.k8s.io;v=v1,application/json'
+    LOG_FOLLOW_TAIL_LINES = 500  # Lines of history to start a log follow from
+    LOG_CHUNK_SIZE = 64 * 1024
+    MAX_WORKERS = 4  # Concurrent one-shot requests; watches and log follows use their own threads
+    CACHE_TTLS = {'pods': 10, 'secrets': 60, 'deployments': 30, 'namespaces': 300}  # Seconds a listing counts as fresh
+    CACHE_MAX_ENTRIES = 64
+    CACHE_MAX_STALE = 600  # Seconds a stale listing may still be shown while it is refreshed
+    MERGE_VERIFY_TIMEOUT = 5  # Seconds the /version check of an existing context may take
+    FAN_OUT_MAX_WORKERS = 4  # Clusters listed at the same time by get_pods_fan_out
+    FAN_OUT_CLUSTER_TIMEOUT = 15  # Seconds one cluster may take before it is reported as timed out
+
+    def __init__(self, max_workers=MAX_WORKERS, config_file=None):
         super().__init__()
+        self.executor = RequestExecutor(max_workers=max_workers)
+        self.fan_out_executor = ThreadPoolExecutor(max_workers=self.FAN_OUT_MAX_WORKERS, thread_name_prefix='fan-out')
+        self.single_flight = SingleFlight()
+        self.pod_describer = PodDescriber()
+        self.response_cache = ResponseCache(ttls=self.CACHE_TTLS, max_entries=self.CACHE_MAX_ENTRIES, max_stale=self.CACHE_MAX_STALE)
+        self.client_pool = ApiClientPool(config_file)  # None: $KUBECONFIG or ~/.kube/config
+        self.metrics = Metrics()
+        self.current_context = None
+        self.pod_page_size = self.POD_PAGE_SIZE
+        self.raw_pod_listing = self.RAW_POD_LISTING
+        self.pod_watch = None  # [threading.Event, response] of the active pod watch
+        self.namespace_watch = None  # [threading.Event, response] of the active namespace watch
+        self.pending_pod_events = []
+        self.pending_pod_events_lock = threading.Lock()
+        self.log_follow = None  # (threading.Event, response) of the active log follow
+        self.pending_log_text = []
+        self.pending_log_text_lock = threading.Lock()
         self.register_event_type('on_merge_output')
         self.register_event_type('on_pods_output')
+        self.register_event_type('on_pod_events')
+        self.register_event_type('on_pods_page')
+        self.register_event_type('on_pods_complete')
+        self.register_event_type('on_fan_out_pods')
+        self.register_event_type('on_fan_out_error')
+        self.register_event_type('on_fan_out_complete')
+        self.register_event_type('on_namespaces')
+        self.register_event_type('on_namespace_events')
         self.register_event_type('on_logs_output')
+        self.register_event_type('on_logs_append')
+        self.register_event_type('on_logs_follow_end')
         self.register_event_type('on_secrets_output')
+        self.register_event_type('on_secret_details')
         self.register_event_type('on_deployments_output')
+        self.register_event_type('on_deployment_details')
         self.register_event_type('on_describe_output')
 
-    def safe_load_kube_config(self):
-        """Load Kubernetes config from ~/.kube/config set by az aks get-credentials."""
+    def safe_load_kube_config(self, context=None):
+        """Make context (the kubeconfig's current-context by default) the current cluster.
+
+        Its ApiClient comes from the client pool, so returning to a cluster used
+        before reuses the warm client instead of reloading the kubeconfig.
+        """
         import sys
         original_stdout = sys.stdout
         original_stderr = sys.stderr
         try:
             sys.stdout = sys.__stdout__
             sys.stderr = sys.__stderr__
-            config.load_kube_config()
-
-            self.core_v1 = client.CoreV1Api()
-            self.apps_v1 = client.AppsV1Api()
+            context = context or self.client_pool.active_context()
+            self.client_pool.get(context)
+            self.current_context = context
         finally:
             sys.stdout = original_stdout
             sys.stderr = original_stderr
 
-    def execute_merge(self, subscription, resource_group, cluster_name):
-        """Execute the merge command asynchronously and dispatch event."""
-        import subprocess
-        command = f"az aks get-credentials --subscription {subscription} --resource-group {resource_group} --name {cluster_name}"
-        thread = threading.Thread(target=self._run_merge, args=(command,))
-        thread.start()
+    def clients(self, context=None):
+        """KubeClients of context, or of the current cluster."""
+        return self.client_pool.get(context or self.current_context)
 
-    def _run_merge(self, command):
-        """Run the merge command in a separate thread."""
+    def execute_merge(self, subscription, resource_group, cluster_name, refresh_credentials=True):
+        """Execute the merge command asynchronously and dispatch event.
+
+        A kubeconfig context that az wrote earlier for the resource group and cluster
+        is verified with a /version call, through its pooled client if there is one,
+        and az aks get-credentials only runs when there is none or it fails (and
+        refresh_credentials is set). The output says which path was taken.
+        """
+        return self.executor.submit('merge', self._run_merge, subscription, resource_group, cluster_name, refresh_credentials)
+
+    def _run_merge(self, handle, subscription, resource_group, cluster_name, refresh_credentials):
+        """Verify the existing context, running the merge command if needed, on a worker thread."""
+        problem = self._check_kubeconfig_context(resource_group, cluster_name)
+        if problem is None:
+            output = f"Using existing kubeconfig context \"{cluster_name}\" (verified with /version, az aks get-credentials skipped)"
+            self._dispatch(handle, 'on_merge_output', output, True)
+            return
+        if not refresh_credentials:
+            self._dispatch(handle, 'on_merge_output', f"{problem}, press Merge to fetch credentials", False)
+            return
+        command = f"az aks get-credentials --subscription {subscription} --resource-group {resource_group} --name {cluster_name}"
         process = subprocess.Popen(command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
         stdout, stderr = process.communicate()
         output = stdout.decode() if stdout else stderr.decode()
         success = "Merged" in output and "error" not in output.lower()
-        Clock.schedule_once(lambda dt: self.dispatch('on_merge_output', output, success), 0)
+        if success:
+            self.client_pool.invalidate(cluster_name)  # Credentials may have changed
+        self._dispatch(handle, 'on_merge_output', f"{problem}, ran az aks get-credentials:\n{output}", success)
+
+    def _check_kubeconfig_context(self, resource_group, cluster_name):
+        """Return None if kubeconfig has a working context for the cluster, otherwise why not."""
+        context = self.client_pool.find_context(cluster_name)
+        if context is None:
+            return f"No kubeconfig context for \"{cluster_name}\""
+        expected_user = f"clusterUser_{resource_group}_{cluster_name}"  # Named by az aks get-credentials
+        if context['context'].get('cluster') != cluster_name or context['context'].get('user') != expected_user:
+            return f"Kubeconfig context \"{cluster_name}\" does not belong to resource group {resource_group}"
+        try:
+            self.client_pool.get(cluster_name).version.get_code(_request_timeout=self.MERGE_VERIFY_TIMEOUT)
+            return None
+        except kube.ApiException as e:
+            problem = f"Kubeconfig context \"{cluster_name}\" failed verification: {e.reason} ({e.status})"
+        except Exception as e:
+            problem = f"Kubeconfig context \"{cluster_name}\" failed verification: {str(e)}"
+        self.client_pool.invalidate(cluster_name)
+        return problem
+
+    def _cache_key(self, context, namespace, kind):
+        return (context, namespace, kind)
+
+    def cache_stats(self):
+        """Hit/miss counters of the response cache."""
+        return self.response_cache.stats()
+
+    def _shared(self, context, namespace, kind, params, fn):
+        """Run fn() unless an identical request (same context, namespace, kind and params) is
+        already in flight, in which case its result is shared instead."""
+        return self.single_flight.do((context, namespace, kind, params), fn)
+
+    def _dispatch(self, handle, event, *args):
+        """Dispatch a request's result on the Kivy thread, unless it was cancelled or superseded by then."""
+        scheduled = time.perf_counter()
+
+        def dispatch(dt):
+            if handle.is_current():
+                self._timed_dispatch(scheduled, event, *args)
+        Clock.schedule_once(dispatch, 0)
+
+    def _timed_dispatch(self, scheduled, event, *args):
+        """Dispatch event, recording how long it waited for the Kivy thread and how long its handlers took."""
+        start = time.perf_counter()
+        self.metrics.record('dispatch.lag', start - scheduled)
+        self.dispatch(event, *args)
+        self.metrics.record(f"ui.{event}", time.perf_counter() - start)
 
     def on_merge_output(self, output, success):
         """Event handler for merge output."""
         pass
 
-    def get_pods(self, namespace):
-        """Fetch pods in the specified namespace using Kubernetes SDK asynchronously."""
-        def fetch_pods():
+    def get_pods(self, namespace, page_size=None, context=None):
+        """Fetch pods in the specified namespace using Kubernetes SDK asynchronously.
+
+        Pods are listed in chunks of page_size (pod_page_size by default). Each chunk
+        is dispatched with on_pods_page as soon as it arrives, followed by
+        on_pods_complete with the total count. Errors are dispatched with on_pods_output.
+
+        A cached listing is dispatched first as a single page; if it is stale the
+        namespace is listed again and the fresh pages follow.
+
+        context selects the cluster and defaults to the current one.
+        """
+        page_size = page_size or self.pod_page_size
+        context = context or self.current_context
+
+        def fetch_pods(handle):
+            key = self._cache_key(context, namespace, 'pods')
+            cached, fresh = self.response_cache.get(key)
+            if cached is not None:
+                self._dispatch(handle, 'on_pods_page', cached, 0)
+                self._dispatch(handle, 'on_pods_complete', len(cached))
+                if fresh:
+                    return
             try:
-                pods = self.core_v1.list_namespaced_pod(namespace)
-                now = datetime.now(timezone.utc)
-                pod_data = [
-                    {
-                        "name": pod.metadata.name,
-                        "status": pod.status.phase,
-                        "age": naturaltime(now - pod.metadata.creation_timestamp.replace(tzinfo=timezone.utc)),
-                        "restarts": sum(
-                            status.restart_count for status in (pod.status.container_statuses or [])
-                        )
-                    }
-                    for pod in pods.items
-                ]
-                Clock.schedule_once(lambda dt: self.dispatch('on_pods_output', pod_data), 0)
-            except ApiException as e:
-                error_output = f"Error fetching pods: {e.reason} ({e.status})"
-                Clock.schedule_once(lambda dt: self.dispatch('on_pods_output', error_output), 0)
+                span = self.metrics.span('pods.list')
+                all_pods = []
+                for page_index, (pod_data, resource_version) in enumerate(self._list_pod_pages(context, namespace, page_size)):
+                    all_pods.extend(pod_data)
+                    if handle.cancelled:
+                        return
+                    self._dispatch(handle, 'on_pods_page', pod_data, page_index)
+                self.response_cache.put(key, all_pods)
+                span.end()
+                self._dispatch(handle, 'on_pods_complete', len(all_pods))
+            except kube.ApiException as e:
+                if cached is None:
+                    error_output = f"Error fetching pods: {e.reason} ({e.status})"
+                    self._dispatch(handle, 'on_pods_output', error_output)
             except Exception as e:
-                error_output = f"Error fetching pods: {str(e)}"
-                Clock.schedule_once(lambda dt: self.dispatch('on_pods_output', error_output), 0)
+                if cached is None:
+                    error_output = f"Error fetching pods: {str(e)}"
+                    self._dispatch(handle, 'on_pods_output', error_output)
 
-        thread = threading.Thread(target=fetch_pods)
-        thread.start()
+        self.executor.cancel('fan_out')  # A list of all clusters is superseded too
+        return self.executor.submit('pods', fetch_pods)
+
+    def _list_pod_pages(self, context, namespace, page_size, request_timeout=None):
+        """Yield (pod_data, resource_version) for each chunk of a paginated pod list."""
+        continue_token = None
+        while True:
+            pod_data, resource_version, continue_token = self._shared(
+                context, namespace, 'pods', (page_size, continue_token),
+                lambda continue_token=continue_token: self._list_pod_page(context, namespace, page_size, continue_token, request_timeout)
+            )
+            yield pod_data, resource_version
+            if not continue_token:
+                return
+
+    def _list_pod_page(self, context, namespace, page_size, continue_token, request_timeout=None):
+        """Fetch one chunk of a pod list; returns (pod_data, resource_version, continue_token)."""
+        kwargs = {'limit': page_size}
+        if continue_token:
+            kwargs['_continue'] = continue_token
+        if request_timeout:
+            kwargs['_request_timeout'] = request_timeout
+        core_v1 = self.clients(context).core_v1
+        span = self.metrics.span('pods.page')
+        if not self.raw_pod_listing:
+            pods = core_v1.list_namespaced_pod(namespace, **kwargs)
+            span.mark('received_and_deserialized')
+            now = datetime.now(timezone.utc)
+            return [self._pod_to_dict(pod, now) for pod in pods.items], pods.metadata.resource_version, pods.metadata._continue
+        response = core_v1.list_namespaced_pod(namespace, _preload_content=False, **kwargs)
+        try:
+            data = response.data
+            span.mark('received', size=len(data))
+            page = self._parse_pod_list(data)
+            span.mark('parsed')
+            return page
+        finally:
+            response.release_conn()
+
+    def _parse_pod_list(self, data):
+        """Parse a raw PodList JSON body; returns (pod_data, resource_version, continue_token)."""
+        pod_list = json.loads(data)
+        metadata = pod_list.get('metadata') or {}
+        now = datetime.now(timezone.utc)
+        return [self._raw_pod_to_dict(item, now) for item in pod_list.get('items') or []], metadata.get('resourceVersion'), metadata.get('continue')
+
+    def _pod_to_dict(self, pod, now):
+        """Reduce a V1Pod to the fields shown in the pods table."""
+        return {
+            "name": pod.metadata.name,
+            "uid": pod.metadata.uid,
+            "resource_version": pod.metadata.resource_version,
+            "status": pod.status.phase,
+            "age": naturaltime(now - pod.metadata.creation_timestamp.replace(tzinfo=timezone.utc)),
+            "restarts": sum(
+                status.restart_count for status in (pod.status.container_statuses or [])
+            )
+        }
+
+    def _raw_pod_to_dict(self, item, now):
+        """Reduce a pod from a raw PodList to the fields shown in the pods table, like _pod_to_dict."""
+        metadata = item['metadata']
+        status = item.get('status') or {}
+        created = datetime.strptime(metadata['creationTimestamp'], '%Y-%m-%dT%H:%M:%SZ').replace(tzinfo=timezone.utc)
+        return {
+            "name": metadata['name'],
+            "uid": metadata.get('uid'),
+            "resource_version": metadata.get('resourceVersion'),
+            "status": status.get('phase'),
+            "age": naturaltime(now - created),
+            "restarts": sum(
+                container.get('restartCount', 0) for container in status.get('containerStatuses') or []
+            )
+        }
 
     def on_pods_output(self, output):
-        """Event handler for pods output."""
+        """Event handler for a pod list error message."""
+        pass
+
+    def on_pods_page(self, pods, page_index):
+        """Event handler for one page of pods."""
+        pass
+
+    def on_pods_complete(self, total):
+        """Event handler for the end of a paginated pod list."""
         pass
 
-    def get_logs(self, pod, namespace):
+    def get_pods_fan_out(self, namespace, clusters):
+        """List the pods of a namespace on several clusters concurrently.
+
+        clusters is a list of (resource_group, cluster_name); at most
+        FAN_OUT_MAX_WORKERS are listed at a time. Each cluster's pods are dispatched
+        with on_fan_out_pods(cluster_name, pods) as soon as it answers, failures with
+        on_fan_out_error(cluster_name, message), and on_fan_out_complete(total, failed)
+        follows once every cluster answered or timed out. Clusters without a usable
+        kubeconfig context are reported as failed; az is never run from here.
+        """
+        def fan_out(handle):
+            started = {}
+            pending = {
+                self.fan_out_executor.submit(self._list_cluster_pods, namespace, resource_group, cluster_name, started): cluster_name
+                for resource_group, cluster_name in clusters
+            }
+            total = failed = 0
+            while pending and not handle.cancelled:
+                done, _ = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+                for future in done:
+                    cluster_name = pending.pop(future)
+                    pods, error = future.result()
+                    if error is None:
+                        total += len(pods)
+                        self._dispatch(handle, 'on_fan_out_pods', cluster_name, pods)
+                    else:
+                        failed += 1
+                        self._dispatch(handle, 'on_fan_out_error', cluster_name, error)
+                now = time.monotonic()
+                # The timeout runs from when a cluster's listing starts, so clusters
+                # queued behind FAN_OUT_MAX_WORKERS others still get all of it.
+                for future, cluster_name in list(pending.items()):
+                    if now - started.get(cluster_name, now) > self.FAN_OUT_CLUSTER_TIMEOUT:
+                        del pending[future]  # Whatever it returns later is dropped
+                        failed += 1
+                        self._dispatch(handle, 'on_fan_out_error', cluster_name, f"Error fetching pods: timed out after {self.FAN_OUT_CLUSTER_TIMEOUT}s")
+            self._dispatch(handle, 'on_fan_out_complete', total, failed)
+
+        self.executor.cancel('pods')  # So is a single-cluster list
+        return self.executor.submit('fan_out', fan_out)
+
+    def _list_cluster_pods(self, namespace, resource_group, cluster_name, started):
+        """List one cluster's pods for get_pods_fan_out; returns (pods, error)."""
+        started[cluster_name] = time.monotonic()
+        key = self._cache_key(cluster_name, namespace, 'pods')
+        cached, fresh = self.response_cache.get(key)
+        if fresh:
+            return cached, None
+        try:
+            if not self.client_pool.has(cluster_name):
+                problem = self._check_kubeconfig_context(resource_group, cluster_name)
+                if problem is not None:
+                    return None, f"Error fetching pods: {problem}"
+            pods = []
+            for pod_data, resource_version in self._list_pod_pages(cluster_name, namespace, self.pod_page_size, self.FAN_OUT_CLUSTER_TIMEOUT):
+                pods.extend(pod_data)
+            self.response_cache.put(key, pods)
+            return pods, None
+        except kube.ApiException as e:
+            return None, f"Error fetching pods: {e.reason} ({e.status})"
+        except Exception as e:
+            return None, f"Error fetching pods: {str(e)}"
+
+    def on_fan_out_pods(self, cluster_name, pods):
+        """Event handler for one cluster's pods of a fan-out list."""
+        pass
+
+    def on_fan_out_error(self, cluster_name, message):
+        """Event handler for a cluster that failed or timed out in a fan-out list."""
+        pass
+
+    def on_fan_out_complete(self, total, failed):
+        """Event handler for the end of a fan-out list."""
+        pass
+
+    def watch_pods(self, namespace, context=None):
+        """List pods once, then stream changes until stop_watch_pods is called.
+
+        The initial list is dispatched page by page like get_pods, later changes are batched
+        per frame and dispatched with on_pod_events as (type, pod) tuples where type
+        is ADDED, MODIFIED or DELETED. Dropped connections resume from the last seen
+        resourceVersion, and an expired one (410 Gone) triggers a fresh list.
+        """
+        self.stop_watch_pods()
+        self.executor.cancel('pods')  # A pending one-shot list would interleave its pages
+        watch = [threading.Event(), None]
+        self.pod_watch = watch
+        context = context or self.current_context
+        thread = threading.Thread(target=self._run_pod_watch, args=(context, namespace, watch), daemon=True)
+        thread.start()
+
+    def stop_watch_pods(self):
+        """Stop the active pod watch; events still in flight are dropped."""
+        self._stop_watch(self.pod_watch)
+        self.pod_watch = None
+
+    def _stop_watch(self, watch):
+        """Set the stop event of a [stop_event, response] stream and end its connection.
+
+        Used for watches and log follows. The socket is shut down rather than the
+        response closed: close() would wait for the reading thread's blocked read,
+        while shutdown ends that read at once. The reading thread then closes the
+        response, so the connection is not reused.
+        """
+        if not watch:
+            return
+        stop_event, response = watch
+        stop_event.set()
+        connection = getattr(response, 'connection', None)
+        if connection is not None and connection.sock is not None:
+            try:
+                connection.sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass  # Already closed
+
+    def _watch_events(self, watch, response):
+        """Yield the decoded events of a watch response until it ends or the watch is stopped.
+
+        The response is stored in watch so that stopping it closes the response.
+        ERROR events raise ApiException, 410 Gone included.
+        """
+        watch[1] = response
+        try:
+            if watch[0].is_set():  # Stopped before the response was stored
+                return
+            for line in kube.watch.watch.iter_resp_lines(response):
+                if watch[0].is_set():
+                    return
+                event = json.loads(line)
+                if event['type'] == 'ERROR':
+                    status = event['object']
+                    raise kube.ApiException(status=status.get('code'), reason=status.get('reason'))
+                yield event
+        finally:
+            self._end_stream(watch, response)
+
+    def _end_stream(self, watch, response):
+        """Give the connection of a finished stream back to the pool, or close it if the stream was stopped."""
+        if watch[0].is_set():
+            response.close()
+        else:
+            response.release_conn()
+
+    def _run_pod_watch(self, context, namespace, watch):
+        """Run the list-then-watch loop in a separate thread."""
+        stop_event = watch[0]
+        resource_version = None
+        retry_delay = self.WATCH_RETRY_DELAY
+        reported_error = False
+        while not stop_event.is_set():
+            try:
+                if resource_version is None:
+                    # All pages of a chunked list share the resourceVersion of the first
+                    all_pods = []
+                    list_version = None
+                    for page_index, (pod_data, page_version) in enumerate(self._list_pod_pages(context, namespace, self.pod_page_size)):
+                        if stop_event.is_set():
+                            return
+                        all_pods.extend(pod_data)
+                        list_version = list_version or page_version
+                        self._dispatch_watch_output(stop_event, 'on_pods_page', pod_data, page_index)
+                    self.response_cache.put(self._cache_key(context, namespace, 'pods'), all_pods)
+                    self._dispatch_watch_output(stop_event, 'on_pods_complete', len(all_pods))
+                    resource_version = list_version
+                response = self.clients(context).core_v1.list_namespaced_pod(
+                    namespace,
+                    watch=True,
+                    resource_version=resource_version,
+                    timeout_seconds=self.WATCH_TIMEOUT_SECONDS,
+                    allow_watch_bookmarks=True,
+                    _preload_content=False,
+                )
+                for event in self._watch_events(watch, response):
+                    pod = event['object']
+                    resource_version = pod['metadata'].get('resourceVersion', resource_version)
+                    if event['type'] in ('ADDED', 'MODIFIED', 'DELETED'):
+                        self._queue_pod_event(stop_event, event['type'], self._raw_pod_to_dict(pod, datetime.now(timezone.utc)))
+                retry_delay = self.WATCH_RETRY_DELAY
+                reported_error = False
+            except kube.ApiException as e:
+                if e.status == 410:
+                    resource_version = None  # Too old to resume, relist
+                    continue
+                if not reported_error:
+                    self._dispatch_watch_output(stop_event, 'on_pods_output', f"Error watching pods: {e.reason} ({e.status})")
+                    reported_error = True
+                    resource_version = None  # The error cleared the table, relist once back
+                stop_event.wait(retry_delay)
+                retry_delay = min(retry_delay * 2, self.WATCH_MAX_RETRY_DELAY)
+            except Exception as e:
+                if stop_event.is_set():
+                    return  # Closing the response to stop the watch fails the read
+                if not reported_error:
+                    self._dispatch_watch_output(stop_event, 'on_pods_output', f"Error watching pods: {str(e)}")
+                    reported_error = True
+                    resource_version = None  # The error cleared the table, relist once back
+                stop_event.wait(retry_delay)
+                retry_delay = min(retry_delay * 2, self.WATCH_MAX_RETRY_DELAY)
+
+    def _dispatch_watch_output(self, stop_event, event, *args):
+        """Dispatch an event of a watch unless the watch was stopped meanwhile."""
+        scheduled = time.perf_counter()
+
+        def dispatch(dt):
+            if not stop_event.is_set():
+                self._timed_dispatch(scheduled, event, *args)
+        Clock.schedule_once(dispatch, 0)
+
+    def _queue_pod_event(self, stop_event, event_type, pod):
+        """Queue a watch event; all events queued within a frame are dispatched together."""
+        with self.pending_pod_events_lock:
+            self.pending_pod_events.append((stop_event, event_type, pod))
+            if len(self.pending_pod_events) > 1:
+                return  # Flush already scheduled
+        scheduled = time.perf_counter()
+        Clock.schedule_once(lambda dt: self._flush_pod_events(scheduled), 0)
+
+    def _flush_pod_events(self, scheduled):
+        with self.pending_pod_events_lock:
+            pending = self.pending_pod_events
+            self.pending_pod_events = []
+        events = [(event_type, pod) for stop_event, event_type, pod in pending if not stop_event.is_set()]
+        if events:
+            self._timed_dispatch(scheduled, 'on_pod_events', events)
+
+    def on_pod_events(self, events):
+        """Event handler for pod watch events."""
+        pass
+
+    def get_logs(self, pod, namespace, context=None):
         """Fetch logs for a specific pod in the specified namespace using Kubernetes SDK asynchronously."""
-        def fetch_logs():
+        context = context or self.current_context
+
+        def fetch_logs(handle):
             try:
-                logs = self.core_v1.read_namespaced_pod_log(name=pod, namespace=namespace)
-                Clock.schedule_once(lambda dt: self.dispatch('on_logs_output', logs), 0)
-            except ApiException as e:
+                span = self.metrics.span('logs')
+                logs = self._shared(context, namespace, 'logs', pod, lambda: self.clients(context).core_v1.read_namespaced_pod_log(name=pod, namespace=namespace))
+                span.mark('received', size=len(logs))
+                self._dispatch(handle, 'on_logs_output', logs)
+            except kube.ApiException as e:
                 error_output = f"Error fetching logs: {e.reason} ({e.status})"
-                Clock.schedule_once(lambda dt: self.dispatch('on_logs_output', error_output), 0)
+                self._dispatch(handle, 'on_logs_output', error_output)
             except Exception as e:
                 error_output = f"Error fetching logs: {str(e)}"
-                Clock.schedule_once(lambda dt: self.dispatch('on_logs_output', error_output), 0)
+                self._dispatch(handle, 'on_logs_output', error_output)
 
-        thread = threading.Thread(target=fetch_logs)
-        thread.start()
+        return self.executor.submit('pod_output', fetch_logs)
 
     def on_logs_output(self, output):
         """Event handler for logs output."""
         pass
 
-    def get_describe_pod(self, pod, namespace):
+    def follow_logs(self, pod, namespace, tail_lines=None, context=None):
+        """Stream logs of a pod like `kubectl logs -f` until stop_follow_logs is called.
+
+        Streaming starts from the last tail_lines lines. Complete lines are batched
+        per frame and dispatched with on_logs_append; on_logs_follow_end is dispatched
+        with a message when the stream ends on its own or fails.
+        """
+        self.stop_follow_logs()
+        stop_event = threading.Event()
+        self.log_follow = [stop_event, None]
+        tail_lines = tail_lines or self.LOG_FOLLOW_TAIL_LINES
+        context = context or self.current_context
+        thread = threading.Thread(target=self._run_log_follow, args=(context, pod, namespace, tail_lines, self.log_follow), daemon=True)
+        thread.start()
+
+    def stop_follow_logs(self):
+        """Stop the active log follow; text still in flight is dropped."""
+        self._stop_watch(self.log_follow)
+        self.log_follow = None
+
+    def _run_log_follow(self, context, pod, namespace, tail_lines, follow):
+        """Read the log stream in a separate thread."""
+        stop_event = follow[0]
+        try:
+            response = self.clients(context).core_v1.read_namespaced_pod_log(
+                name=pod,
+                namespace=namespace,
+                follow=True,
+                tail_lines=tail_lines,
+                _preload_content=False,
+            )
+            follow[1] = response
+            if stop_event.is_set():
+                return
+            partial = b''
+            for chunk in response.stream(self.LOG_CHUNK_SIZE):
+                if stop_event.is_set():
+                    break
+                lines, newline, partial = (partial + chunk).rpartition(b'\n')
+                if newline:
+                    self._queue_log_text(stop_event, (lines + newline).decode('utf-8', errors='replace'))
+            if partial and not stop_event.is_set():
+                self._queue_log_text(stop_event, partial.decode('utf-8', errors='replace'))
+            message = "Log stream ended"
+        except kube.ApiException as e:
+            message = f"Error following logs: {e.reason} ({e.status})"
+        except Exception as e:
+            message = f"Error following logs: {str(e)}"
+        finally:
+            if follow[1] is not None:
+                self._end_stream(follow, follow[1])
+
+        def dispatch_end(dt):
+            if not stop_event.is_set():
+                self.dispatch('on_logs_follow_end', message)
+        Clock.schedule_once(dispatch_end, 0)
+
+    def _queue_log_text(self, stop_event, text):
+        """Queue streamed log text; text queued within a frame is dispatched together."""
+        with self.pending_log_text_lock:
+            self.pending_log_text.append((stop_event, text))
+            if len(self.pending_log_text) > 1:
+                return  # Flush already scheduled
+        scheduled = time.perf_counter()
+        Clock.schedule_once(lambda dt: self._flush_log_text(scheduled), 0)
+
+    def _flush_log_text(self, scheduled):
+        with self.pending_log_text_lock:
+            pending = self.pending_log_text
+            self.pending_log_text = []
+        text = ''.join(text for stop_event, text in pending if not stop_event.is_set())
+        if text:
+            self.metrics.record('logs.follow.bytes', len(text), unit='bytes')
+            self._timed_dispatch(scheduled, 'on_logs_append', text)
+
+    def on_logs_append(self, text):
+        """Event handler for streamed log text."""
+        pass
+
+    def on_logs_follow_end(self, message):
+        """Event handler for the end of a log follow."""
+        pass
+
+    def get_describe_pod(self, pod, namespace, context=None):
         """Fetch detailed description of a pod using Kubernetes SDK asynchronously."""
-        def fetch_describe():
+        context = context or self.current_context
+
+        def fetch_describe(handle):
             try:
-                # Get pod details
-                pod_obj = self.core_v1.read_namespaced_pod(name=pod, namespace=namespace)
-                
-                # Build formatted output like kubectl describe
-                lines = []
-                lines.append(f"Name:         {pod_obj.metadata.name}")
-                lines.append(f"Namespace:    {pod_obj.metadata.namespace}")
-                lines.append(f"Priority:     {getattr(pod_obj, 'priority', 0) or 0}")
-                if pod_obj.spec.node_name:
-                    lines.append(f"Node:         {pod_obj.spec.node_name}/{pod_obj.status.host_ip or 'N/A'}")
-                lines.append(f"Start Time:   {pod_obj.metadata.creation_timestamp}")
-                lines.append(f"Labels:       {json.dumps(pod_obj.metadata.labels) or '<none>':10}")
-                lines.append(f"Annotations:  {json.dumps(pod_obj.metadata.annotations) or '<none>':10}")
-                lines.append(f"Status:       {pod_obj.status.phase}")
-                if pod_obj.status.pod_ip:
-                    lines.append(f"IP:           {pod_obj.status.pod_ip}")
-                lines.append("IPs:")
-                lines.append(f"  IP:  {pod_obj.status.pod_ip or 'N/A'}")
-                
-                # Containers
-                lines.append("Containers:")
-                for container in pod_obj.spec.containers:
-                    lines.append(f"  {container.name}:")
-                    lines.append(f"    Container ID:   {pod_obj.status.container_statuses[0].container_id if pod_obj.status.container_statuses else 'N/A'}")  # Simplify for single; extend for multi
-                    lines.append(f"    Image:          {container.image}")
-                    # State (Running/Waiting/Terminated)
-                    if pod_obj.status.container_statuses:
-                        state = pod_obj.status.container_statuses[0].state  # Assume first; loop for multi
-                        if state.running:
-                            lines.append(f"    State:          Running")
-                            lines.append(f"      Started:      {state.running.started_at}")
-                        elif state.waiting:
-                            lines.append(f"    State:          Waiting")
-                            lines.append(f"      Reason:        {state.waiting.reason}")
-                        elif state.terminated:
-                            lines.append(f"    State:          Terminated")
-                            lines.append(f"      Reason:        {state.terminated.reason}")
-                    lines.append(f"    Ready:          {pod_obj.status.container_statuses[0].ready if pod_obj.status.container_statuses else 'False'}")
-                    lines.append(f"    Restart Count:  {pod_obj.status.container_statuses[0].restart_count if pod_obj.status.container_statuses else 0}")
-                    lines.append("    Environment:    <none>")
-                    lines.append("    Mounts:")
-                    for volume_mount in container.volume_mounts or []:
-                        lines.append(f"      {volume_mount.mount_path} from {volume_mount.name} ({'ro' if volume_mount.read_only else 'rw'})")
-                
-                # Conditions
-                lines.append("Conditions:")
-                lines.append("  Type              Status")
-                for cond in pod_obj.status.conditions or []:
-                    status = "True " if cond.status == "True" else "False" if cond.status == "False" else cond.status
-                    lines.append(f"  {cond.type:<18} {status:<6}")
-                
-                # Volumes
-                if pod_obj.spec.volumes:
-                    lines.append("Volumes:")
-                    for vol in pod_obj.spec.volumes:
-                        lines.append(f"  {vol.name}:")
-                        lines.append(f"    Type:            {type(vol).__name__} ({vol.__dict__})")  # Simplified; expand as needed
-                
-                lines.append(f"QoS Class:           {getattr(pod_obj, 'qos_class', '<none>')}")
-                lines.append("Node-Selectors:      <none>")
-                lines.append("Tolerations:         <none>")  # Add parsing if needed
-                
-                output = "\n".join(lines)
-                Clock.schedule_once(lambda dt: self.dispatch('on_describe_output', output), 0)
-            except ApiException as e:
+                with self.metrics.timer('describe.total'):
+                    output = self._shared(context, namespace, 'describe', pod, lambda: self._describe_pod(context, pod, namespace))
+                self._dispatch(handle, 'on_describe_output', output)
+            except kube.ApiException as e:
                 error_output = f"Error describing pod: {e.reason} ({e.status})"
-                Clock.schedule_once(lambda dt: self.dispatch('on_describe_output', error_output), 0)
+                self._dispatch(handle, 'on_describe_output', error_output)
             except Exception as e:
                 error_output = f"Error describing pod: {str(e)}"
-                Clock.schedule_once(lambda dt: self.dispatch('on_describe_output', error_output), 0)
+                self._dispatch(handle, 'on_describe_output', error_output)
 
-        thread = threading.Thread(target=fetch_describe)
-        thread.start()
+        return self.executor.submit('pod_output', fetch_describe)
+
+    def _describe_pod(self, context, pod, namespace):
+        """Render a pod like `kubectl describe pod`, reusing the rendering of an unchanged pod."""
+        return self.pod_describer.describe(self.clients(context).core_v1, pod, namespace, self._listed_pod_version(context, namespace, pod))
+
+    def _listed_pod_version(self, context, namespace, pod):
+        """(uid, resource_version) of a pod from a fresh cached listing, or None."""
+        pods, fresh = self.response_cache.get(self._cache_key(context, namespace, 'pods'))
+        if not fresh:
+            return None
+        for pod_data in pods:
+            if pod_data["name"] == pod:
+                return pod_data.get("uid"), pod_data.get("resource_version")
+        return None
 
     def on_describe_output(self, output):
         """Event handler for describe output."""
         pass
 
-    def get_secrets(self, namespace):
-        """Fetch secrets in the specified namespace using Kubernetes SDK asynchronously."""
-        def fetch_secrets():
+    def _list_metadata_names(self, context, path, namespace):
+        """Return the names of a namespace's objects at path, sorted.
+
+        Only object metadata is requested (PartialObjectMetadataList), so bodies
+        such as secret data or deployment specs are never transferred.
+        """
+        return self._list_metadata(context, path, namespace)[0]
+
+    def _list_metadata(self, context, path, namespace):
+        """Return (sorted names, resourceVersion of the list) of the objects at path, metadata only."""
+        api_client = self.clients(context).api_client
+        operation = f"{path.rsplit('/', 1)[-1]}.page"
+        names = []
+        resource_version = None
+        continue_token = None
+        while True:
+            span = self.metrics.span(operation)
+            query_params = [('limit', self.METADATA_PAGE_SIZE)]
+            if continue_token:
+                query_params.append(('continue', continue_token))
+            response = api_client.call_api(
+                path, 'GET',
+                path_params={'namespace': namespace},
+                query_params=query_params,
+                header_params={'Accept': self.METADATA_ACCEPT},
+                auth_settings=['BearerToken'],
+                _return_http_data_only=True,
+                _preload_content=False,
+            )
             try:
-                secrets = self.core_v1.list_namespaced_secret(namespace)
-                output = "\n".join(secret.metadata.name for secret in secrets.items)
-                Clock.schedule_once(lambda dt: self.dispatch('on_secrets_output', output), 0)
-            except ApiException as e:
-                error_output = f"Error fetching secrets: {e.reason} ({e.status})"
-                Clock.schedule_once(lambda dt: self.dispatch('on_secrets_output', error_output), 0)
-            except Exception as e:
-                error_output = f"Error fetching secrets: {str(e)}"
-                Clock.schedule_once(lambda dt: self.dispatch('on_secrets_output', error_output), 0)
+                data = response.data
+                span.mark('received', size=len(data))
+                object_list = json.loads(data)
+                span.mark('parsed')
+            finally:
+                response.release_conn()
+            names.extend(item['metadata']['name'] for item in object_list.get('items') or [])
+            list_metadata = object_list.get('metadata') or {}
+            resource_version = resource_version or list_metadata.get('resourceVersion')  # All pages share the first one's
+            continue_token = list_metadata.get('continue')
+            if not continue_token:
+                return sorted(names), resource_version
+
+    def watch_namespaces(self, context=None):
+        """Keep the namespace list of a cluster current until stop_watch_namespaces is called.
 
-        thread = threading.Thread(target=fetch_secrets)
+        The list is dispatched with on_namespaces(context, names), straight from
+        the cache if the cluster was listed before, then namespace changes with
+        on_namespace_events(context, events) as (type, name) tuples. Listing and
+        watching only transfer object metadata. The cache entry is updated with
+        every change, so a cluster visited again resumes from its resourceVersion
+        instead of listing again while the entry is fresh.
+        """
+        self.stop_watch_namespaces()
+        context = context or self.current_context
+        watch = [threading.Event(), None]
+        self.namespace_watch = watch
+        thread = threading.Thread(target=self._run_namespace_watch, args=(context, watch), daemon=True)
         thread.start()
 
+    def get_namespaces(self, context=None):
+        """List the namespaces of a cluster once, metadata only, and dispatch them with on_namespaces."""
+        context = context or self.current_context
+
+        def fetch_namespaces(handle):
+            try:
+                listed, resource_version = self._list_metadata(context, '/api/v1/namespaces', None)
+                self.response_cache.put(self._cache_key(context, None, 'namespaces'), (listed, resource_version))
+                self._dispatch(handle, 'on_namespaces', context, listed)
+            except kube.ApiException as e:
+                self._dispatch(handle, 'on_namespaces', context, f"Error fetching namespaces: {e.reason} ({e.status})")
+            except Exception as e:
+                self._dispatch(handle, 'on_namespaces', context, f"Error fetching namespaces: {str(e)}")
+
+        return self.executor.submit('namespaces', fetch_namespaces)
+
+    def stop_watch_namespaces(self):
+        """Stop the active namespace watch; events still in flight are dropped."""
+        self._stop_watch(self.namespace_watch)
+        self.namespace_watch = None
+
+    def _run_namespace_watch(self, context, watch):
+        """Run the list-then-watch loop of namespaces in a separate thread."""
+        stop_event = watch[0]
+        key = self._cache_key(context, None, 'namespaces')
+        cached, fresh = self.response_cache.get(key)
+        names = set()
+        resource_version = None
+        if cached is not None:
+            names = set(cached[0])
+            resource_version = cached[1] if fresh else None
+            self._dispatch_watch_output(stop_event, 'on_namespaces', context, cached[0])
+        retry_delay = self.WATCH_RETRY_DELAY
+        reported_error = False
+        while not stop_event.is_set():
+            try:
+                if resource_version is None:
+                    listed, resource_version = self._list_metadata(context, '/api/v1/namespaces', None)
+                    names = set(listed)
+                    self.response_cache.put(key, (listed, resource_version))
+                    self._dispatch_watch_output(stop_event, 'on_namespaces', context, listed)
+                resource_version = self._stream_namespace_events(context, watch, names, resource_version)
+                retry_delay = self.WATCH_RETRY_DELAY
+                reported_error = False
+            except kube.ApiException as e:
+                if e.status == 410:
+                    resource_version = None  # Too old to resume, relist
+                    continue
+                if not reported_error and not names:
+                    self._dispatch_watch_output(stop_event, 'on_namespaces', context, f"Error fetching namespaces: {e.reason} ({e.status})")
+                reported_error = True
+                stop_event.wait(retry_delay)
+                retry_delay = min(retry_delay * 2, self.WATCH_MAX_RETRY_DELAY)
+            except Exception as e:
+                if stop_event.is_set():
+                    return  # Closing the response to stop the watch fails the read
+                if not reported_error and not names:
+                    self._dispatch_watch_output(stop_event, 'on_namespaces', context, f"Error fetching namespaces: {str(e)}")
+                reported_error = True
+                stop_event.wait(retry_delay)
+                retry_delay = min(retry_delay * 2, self.WATCH_MAX_RETRY_DELAY)
+
+    def _stream_namespace_events(self, context, watch, names, resource_version):
+        """Apply and dispatch namespace changes after resource_version until the server ends the watch.
+
+        Returns the resourceVersion to resume from; an expired one raises ApiException 410.
+        """
+        stop_event = watch[0]
+        key = self._cache_key(context, None, 'namespaces')
+        response = self.clients(context).api_client.call_api(
+            '/api/v1/namespaces', 'GET',
+            query_params=[('watch', 'true'), ('resourceVersion', resource_version), ('allowWatchBookmarks', 'true'),
+                          ('timeoutSeconds', self.WATCH_TIMEOUT_SECONDS)],
+            header_params={'Accept': self.METADATA_WATCH_ACCEPT},
+            auth_settings=['BearerToken'],
+            _return_http_data_only=True,
+            _preload_content=False,
+        )
+        for event in self._watch_events(watch, response):
+            metadata = event['object']['metadata']
+            resource_version = metadata.get('resourceVersion', resource_version)
+            if event['type'] == 'ADDED':
+                names.add(metadata['name'])
+            elif event['type'] == 'DELETED':
+                names.discard(metadata['name'])
+            else:
+                continue  # MODIFIED and BOOKMARK leave the names as they are
+            self.response_cache.put(key, (sorted(names), resource_version))
+            self._dispatch_watch_output(stop_event, 'on_namespace_events', context, [(event['type'], metadata['name'])])
+        return resource_version
+
+    def on_namespaces(self, context, names):
+        """Event handler for the namespace list of a cluster, or an error message."""
+        pass
+
+    def on_namespace_events(self, context, events):
+        """Event handler for namespace watch events."""
+        pass
+
+    def get_secrets(self, namespace, context=None):
+        """Fetch secret names in the specified namespace using Kubernetes SDK asynchronously."""
+        context = context or self.current_context
+
+        def fetch_secrets(handle):
+            key = self._cache_key(context, namespace, 'secrets')
+            cached, fresh = self.response_cache.get(key)
+            if cached is not None:
+                self._dispatch(handle, 'on_secrets_output', cached)
+                if fresh:
+                    return
+            try:
+                output = self._shared(context, namespace, 'secrets', None, lambda: "\n".join(
+                    self._list_metadata_names(context, '/api/v1/namespaces/{namespace}/secrets', namespace)
+                ))
+                self.response_cache.put(key, output)
+                self._dispatch(handle, 'on_secrets_output', output)
+            except kube.ApiException as e:
+                if cached is None:
+                    error_output = f"Error fetching secrets: {e.reason} ({e.status})"
+                    self._dispatch(handle, 'on_secrets_output', error_output)
+            except Exception as e:
+                if cached is None:
+                    error_output = f"Error fetching secrets: {str(e)}"
+                    self._dispatch(handle, 'on_secrets_output', error_output)
+
+        return self.executor.submit('secrets', fetch_secrets)
+
     def on_secrets_output(self, output):
         """Event handler for secrets output."""
         pass
 
-    def get_deployments(self, namespace):
-        """Fetch deployments in the specified namespace using Kubernetes SDK asynchronously."""
-        def fetch_deployments():
+    def get_secret_details(self, name, namespace, context=None):
+        """Fetch one secret and describe it by its keys and sizes; values are never shown."""
+        context = context or self.current_context
+
+        def fetch_secret(handle):
             try:
-                deployments = self.apps_v1.list_namespaced_deployment(namespace)
-                output = "\n".join(deployment.metadata.name for deployment in deployments.items)
-                Clock.schedule_once(lambda dt: self.dispatch('on_deployments_output', output), 0)
-            except ApiException as e:
-                error_output = f"Error fetching deployments: {e.reason} ({e.status})"
-                Clock.schedule_once(lambda dt: self.dispatch('on_deployments_output', error_output), 0)
+                secret = self.clients(context).core_v1.read_namespaced_secret(name=name, namespace=namespace)
+                sizes = {key: len(base64.b64decode(value)) for key, value in (secret.data or {}).items()}
+                secret.data = None  # Only the sizes are needed; the values are not kept
+                lines = [
+                    f"Name:         {secret.metadata.name}",
+                    f"Namespace:    {secret.metadata.namespace}",
+                    f"Type:         {secret.type}",
+                    f"Created:      {secret.metadata.creation_timestamp}",
+                    "",
+                    "Data",
+                    "====",
+                ]
+                lines.extend(f"{key}:  {size} bytes" for key, size in sorted(sizes.items()))
+                self._dispatch(handle, 'on_secret_details', "\n".join(lines))
+            except kube.ApiException as e:
+                self._dispatch(handle, 'on_secret_details', f"Error fetching secret: {e.reason} ({e.status})")
             except Exception as e:
-                error_output = f"Error fetching deployments: {str(e)}"
-                Clock.schedule_once(lambda dt: self.dispatch('on_deployments_output', error_output), 0)
+                self._dispatch(handle, 'on_secret_details', f"Error fetching secret: {str(e)}")
 
-        thread = threading.Thread(target=fetch_deployments)
-        thread.start()
+        return self.executor.submit('secret_details', fetch_secret)
+
+    def on_secret_details(self, output):
+        """Event handler for secret details."""
+        pass
+
+    def get_deployments(self, namespace, context=None):
+        """Fetch deployment names in the specified namespace using Kubernetes SDK asynchronously."""
+        context = context or self.current_context
+
+        def fetch_deployments(handle):
+            key = self._cache_key(context, namespace, 'deployments')
+            cached, fresh = self.response_cache.get(key)
+            if cached is not None:
+                self._dispatch(handle, 'on_deployments_output', cached)
+                if fresh:
+                    return
+            try:
+                output = self._shared(context, namespace, 'deployments', None, lambda: "\n".join(
+                    self._list_metadata_names(context, '/apis/apps/v1/namespaces/{namespace}/deployments', namespace)
+                ))
+                self.response_cache.put(key, output)
+                self._dispatch(handle, 'on_deployments_output', output)
+            except kube.ApiException as e:
+                if cached is None:
+                    error_output = f"Error fetching deployments: {e.reason} ({e.status})"
+                    self._dispatch(handle, 'on_deployments_output', error_output)
+            except Exception as e:
+                if cached is None:
+                    error_output = f"Error fetching deployments: {str(e)}"
+                    self._dispatch(handle, 'on_deployments_output', error_output)
+
+        return self.executor.submit('deployments', fetch_deployments)
 
     def on_deployments_output(self, output):
         """Event handler for deployments output."""
-        pass
\ No newline at end of file
+        pass
+
+    def get_deployment_details(self, name, namespace, context=None):
+        """Fetch one deployment and render its rollout state."""
+        context = context or self.current_context
+
+        def fetch_deployment(handle):
+            try:
+                deployment = self.clients(context).apps_v1.read_namespaced_deployment(name=name, namespace=namespace)
+                status = deployment.status
+                lines = [
+                    f"Name:         {deployment.metadata.name}",
+                    f"Namespace:    {deployment.metadata.namespace}",
+                    f"Created:      {deployment.metadata.creation_timestamp}",
+                    f"Replicas:     {deployment.spec.replicas} desired | {status.updated_replicas or 0} updated | "
+                    f"{status.replicas or 0} total | {status.available_replicas or 0} available | {status.unavailable_replicas or 0} unavailable",
+                    f"Strategy:     {deployment.spec.strategy.type if deployment.spec.strategy else '<none>'}",
+                    "Containers:",
+                ]
+                for container in deployment.spec.template.spec.containers:
+                    lines.append(f"  {container.name}:")
+                    lines.append(f"    Image:      {container.image}")
+                lines.append("Conditions:")
+                lines.append("  Type              Status  Reason")
+                for cond in status.conditions or []:
+                    lines.append(f"  {cond.type:<18} {cond.status:<7} {cond.reason or ''}")
+                self._dispatch(handle, 'on_deployment_details', "\n".join(lines))
+            except kube.ApiException as e:
+                self._dispatch(handle, 'on_deployment_details', f"Error fetching deployment: {e.reason} ({e.status})")
+            except Exception as e:
+                self._dispatch(handle, 'on_deployment_details', f"Error fetching deployment: {str(e)}")
+
+        return self.executor.submit('deployment_details', fetch_deployment)
+
+    def on_deployment_details(self, output):
+        """Event handler for deployment details."""
+        pass
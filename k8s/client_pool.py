@@ -0,0 +1,64 @@
+import threading
+from k8s import kube
+
+
+class KubeClients:
+    """API groups of one cluster, sharing one ApiClient and its connection pool."""
+
+    def __init__(self, context, api_client):
+        self.context = context
+        self.api_client = api_client
+        self.core_v1 = kube.client.CoreV1Api(api_client)
+        self.apps_v1 = kube.client.AppsV1Api(api_client)
+        self.version = kube.client.VersionApi(api_client)
+
+
+class ApiClientPool:
+    """One configured ApiClient per kubeconfig context, built on first use and kept warm.
+
+    Each ApiClient has its own Configuration and connection pool, so several
+    clusters can be used at once without touching the process-wide default
+    configuration that load_kube_config changes.
+    """
+
+    def __init__(self, config_file=None):
+        self.config_file = config_file
+        self.clients = {}
+        self.lock = threading.Lock()
+
+    def get(self, context):
+        """Return KubeClients for context, creating it if needed."""
+        with self.lock:
+            clients = self.clients.get(context)
+        if clients is not None:
+            return clients
+        api_client = kube.config.new_client_from_config(config_file=self.config_file, context=context, persist_config=False)
+        clients = KubeClients(context, api_client)
+        with self.lock:
+            pooled = self.clients.setdefault(context, clients)
+        if pooled is not clients:
+            api_client.close()  # Another thread built one first
+        return pooled
+
+    def has(self, context):
+        with self.lock:
+            return context in self.clients
+
+    def invalidate(self, context):
+        """Forget the client of context, e.g. after its credentials were refreshed."""
+        with self.lock:
+            clients = self.clients.pop(context, None)
+        if clients is not None:
+            clients.api_client.close()
+
+    def find_context(self, name):
+        """The kubeconfig entry of context name, or None if there is none."""
+        try:
+            contexts, _ = kube.config.list_kube_config_contexts(config_file=self.config_file)
+        except kube.config.ConfigException:
+            return None
+        return next((context for context in contexts if context['name'] == name), None)
+
+    def active_context(self):
+        """Name of the kubeconfig's current-context."""
+        return kube.config.list_kube_config_contexts(config_file=self.config_file)[1]['name']
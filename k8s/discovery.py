@@ -0,0 +1,227 @@
+import json
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from kivy.clock import Clock
+from kivy.event import EventDispatcher
+from k8s.entities import Subscription
+
+REGION_CODES = {'na': 'NA', 'emea': 'EMEA', 'eune': 'EMEA', 'apac': 'APAC', 'la': 'LATAM', 'latam': 'LATAM'}
+ENVIRONMENT_CODES = {'sit': 'SIT', 'uat': 'UAT', 'prod': 'PROD'}
+UNKNOWN = 'Other'
+
+
+def classify(name, tags=None):
+    """(region, environment) of a subscription, from its region/environment tags or a sub-<region>-<environment> name.
+
+    Both come out as the canonical codes, e.g. a ' na ' or 'NA' tag and a sub-na-sit name all give 'NA'.
+    """
+    tags = {key.lower(): (value or '').strip().lower() for key, value in (tags or {}).items()}
+    parts = name.lower().split('-')
+    region = tags.get('region') or next((part for part in parts if part in REGION_CODES), None)
+    environment = tags.get('environment') or next((part for part in parts if part in ENVIRONMENT_CODES), None)
+    return canonical(region, REGION_CODES), canonical(environment, ENVIRONMENT_CODES)
+
+
+def canonical(value, codes):
+    """The code of a lowercase tag or name part; unmapped values are uppercased, missing ones UNKNOWN."""
+    if not value:
+        return UNKNOWN
+    return codes.get(value, value.upper())
+
+
+class AzCliSource:
+    """Enumerates subscriptions and their AKS clusters with the az CLI's JSON output.
+
+    command can name any executable that answers the same az subcommands, e.g. a
+    local stand-in script.
+    """
+    TIMEOUT = 120  # Seconds per az call
+
+    def __init__(self, command='az'):
+        self.command = command
+
+    def run(self, *args):
+        process = subprocess.run([self.command, *args, '--output', 'json'], capture_output=True, text=True, timeout=self.TIMEOUT)
+        if process.returncode:
+            raise RuntimeError(process.stderr.strip() or f"{self.command} exited with {process.returncode}")
+        return json.loads(process.stdout or '[]')
+
+    def list_subscriptions(self):
+        """[{'id', 'name', 'tags'}] of the enabled subscriptions."""
+        return self.run('account', 'list', '--query', "[?state=='Enabled'].{id:id, name:name, tags:tags}")
+
+    def list_clusters(self, subscription_id):
+        """[(resource_group, cluster)] of the AKS clusters in a subscription."""
+        clusters = self.run('aks', 'list', '--subscription', subscription_id, '--query', "[].{name:name, resourceGroup:resourceGroup}")
+        return [(cluster['resourceGroup'], cluster['name']) for cluster in clusters]
+
+
+class StaticSource:
+    """Serves a fixed list of Subscriptions, e.g. data.DATA's, in place of az."""
+
+    def __init__(self, subscriptions, latency=0.0):
+        self.subscriptions = {subscription.name: subscription for subscription in subscriptions}
+        self.latency = latency  # Seconds per call, to behave like a remote source
+
+    def list_subscriptions(self):
+        time.sleep(self.latency)
+        return [{'id': subscription.name, 'name': subscription.name,
+                 'tags': {'region': subscription.region, 'environment': subscription.environment}}
+                for subscription in self.subscriptions.values()]
+
+    def list_clusters(self, subscription_id):
+        time.sleep(self.latency)
+        resource_groups = self.subscriptions[subscription_id].resource_groups
+        return [(resource_group, cluster) for resource_group, clusters in resource_groups.items() for cluster in clusters]
+
+
+class Inventory:
+    """Subscriptions and namespaces indexed for the spinner cascade, so every step is a dict lookup."""
+
+    def __init__(self, subscriptions, namespaces, region_order=(), environment_order=()):
+        self.subscriptions = subscriptions
+        self.by_name = {}
+        self.by_region_environment = {}  # (region, environment) -> [Subscription]
+        self.clusters_by_region_environment = {}  # (region, environment) -> [(resource_group, cluster)]
+        self.resource_groups = set()
+        self.clusters = set()
+        for subscription in subscriptions:
+            scope = (subscription.region, subscription.environment)
+            self.by_name[subscription.name] = subscription
+            self.by_region_environment.setdefault(scope, []).append(subscription)
+            clusters = self.clusters_by_region_environment.setdefault(scope, [])
+            for resource_group, cluster_names in subscription.resource_groups.items():
+                self.resource_groups.add(resource_group)
+                self.clusters.update(cluster_names)
+                clusters.extend((resource_group, cluster) for cluster in cluster_names)
+        self.namespaces_by_environment = {}
+        for namespace in namespaces:
+            self.namespaces_by_environment.setdefault(namespace.environment, []).append(namespace.name)
+        self.regions = self.ordered({subscription.region for subscription in subscriptions}, region_order)
+        self.environments = self.ordered({subscription.environment for subscription in subscriptions}, environment_order)
+
+    def ordered(self, values, order):
+        """The known values in order first, then the others sorted."""
+        return [value for value in order if value in values] + sorted(values - set(order))
+
+    def subscription(self, name):
+        return self.by_name.get(name)
+
+    def subscriptions_in(self, region, environment):
+        return self.by_region_environment.get((region, environment), [])
+
+    def clusters_in(self, region, environment):
+        return self.clusters_by_region_environment.get((region, environment), [])
+
+    def namespaces_in(self, environment):
+        return self.namespaces_by_environment.get(environment, [])
+
+
+class Discovery(EventDispatcher):
+    """Enumerates subscriptions and AKS clusters in the background, cached on disk for TTL seconds.
+
+    The namespaces each merged cluster reported are kept in the same cache, for
+    the same TTL.
+
+    Clusters are listed for up to max_workers subscriptions at a time. The result
+    arrives as on_discovery(subscriptions, errors) on the Kivy thread, where
+    errors are "subscription: message" lines of the subscriptions that failed;
+    those keep their clusters from the previous discovery, if any. A listing
+    without any subscription, e.g. from an expired az login, keeps the whole
+    previous discovery instead of replacing it.
+    """
+    TTL = 6 * 3600  # Seconds
+    CACHE_KEY = 'inventory'
+    VERSION = 1
+
+    def __init__(self, source, cache, max_workers=8, ttl=TTL):
+        super().__init__()
+        self.register_event_type('on_discovery')
+        self.source = source
+        self.cache = cache  # CacheManager; only touched on the Kivy thread
+        self.max_workers = max_workers
+        self.ttl = ttl
+        self.running = False
+
+    def cached(self):
+        """(subscriptions, fresh) from the cache, or (None, False) if there is nothing usable."""
+        entry = self.cache.get(self.CACHE_KEY)
+        if not entry or entry.get('version') != self.VERSION:
+            return None, False
+        subscriptions = [Subscription(item['name'], item['region'], item['environment'], item['resource_groups'])
+                         for item in entry['subscriptions']]
+        return subscriptions, time.time() - entry['saved'] < self.ttl
+
+    def namespaces(self, cluster):
+        """(namespaces, fresh) last seen in cluster, sorted, or (None, False) if it was never merged."""
+        entry = self.cache.get(f"namespaces|{cluster}")
+        if not isinstance(entry, dict):
+            return None, False
+        return entry['namespaces'], time.time() - entry['saved'] < self.ttl
+
+    def put_namespaces(self, cluster, namespaces):
+        """Remember cluster's namespaces for the next visit.
+
+        The cache is only written when they changed, or to mark an unchanged but stale entry fresh again.
+        """
+        namespaces = sorted(namespaces)
+        if self.namespaces(cluster) != (namespaces, True):
+            self.cache.put(f"namespaces|{cluster}", {'namespaces': namespaces, 'saved': time.time()})
+
+    def refresh(self):
+        """Enumerate again in a background thread, unless that is already running."""
+        if self.running:
+            return
+        self.running = True
+        threading.Thread(target=self._discover, name='discovery', daemon=True).start()
+
+    def _discover(self):
+        try:
+            listed = self.source.list_subscriptions()
+        except Exception as e:
+            self._finish(None, [f"Error listing subscriptions: {e}"])
+            return
+
+        def list_clusters(item):
+            try:
+                return self.source.list_clusters(item['id']), None
+            except Exception as e:
+                return None, f"{item['name']}: {e}"
+
+        subscriptions, errors, failed = [], [], []
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='discovery') as pool:
+            for item, (clusters, error) in zip(listed, pool.map(list_clusters, listed)):
+                if error:
+                    errors.append(error)
+                    failed.append(item['name'])
+                    continue
+                resource_groups = {}
+                for resource_group, cluster in clusters:
+                    resource_groups.setdefault(resource_group, []).append(cluster)
+                subscriptions.append(Subscription(item['name'], *classify(item['name'], item.get('tags')), resource_groups))
+        self._finish(subscriptions, errors, failed)
+
+    def _finish(self, subscriptions, errors, failed=()):
+        def finish(dt):
+            self.running = False
+            previous = self.cached()[0]
+            if subscriptions == [] and not errors and previous:
+                self.dispatch('on_discovery', previous, ["No subscriptions were listed; keeping the previous ones"])
+                return
+            if failed:  # Keep what the cache knows about the subscriptions that failed this time
+                by_name = {subscription.name: subscription for subscription in previous or []}
+                subscriptions.extend(by_name[name] for name in failed if name in by_name)
+            if subscriptions is not None:
+                self.cache.put(self.CACHE_KEY, {
+                    'version': self.VERSION,
+                    'saved': time.time(),
+                    'subscriptions': [{'name': s.name, 'region': s.region, 'environment': s.environment, 'resource_groups': s.resource_groups}
+                                      for s in subscriptions],
+                })
+            self.dispatch('on_discovery', subscriptions, errors)
+        Clock.schedule_once(finish, 0)
+
+    def on_discovery(self, subscriptions, errors):
+        pass
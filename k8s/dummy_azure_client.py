@@ -2,77 +2,392 @@ from kivy.event import EventDispatcher
 from kivy.clock import Clock
 from datetime import datetime, timezone, timedelta
 from humanize import naturaltime
-import random
+from functools import lru_cache
+from itertools import count, islice
+from k8s.dummy_profile import APPS, PHASES, PHASE_WEIGHTS, DummyProfile, name_suffix
+from k8s.metrics import Metrics
+
+FAN_OUT_CLUSTER_TIMEOUT = 15  # Seconds, as in AzureClient
+
+
+@lru_cache(maxsize=None)
+def age_text(hours):
+    """naturaltime of an age in whole hours; cached, since there are only a few hundred of them."""
+    return naturaltime(timedelta(hours=hours))
+
 
 class DummyAzureClient(EventDispatcher):
-    def __init__(self):
+    """Stand-in for AzureClient that serves generated data, shaped by a DummyProfile.
+
+    Data is derived from the profile seed and what is asked for (context,
+    namespace, pod), so the same requests return the same data on every run.
+    Latencies and injected errors are drawn from their own seeded generators.
+    """
+    def __init__(self, profile=None):
         super().__init__()
         self.register_event_type('on_merge_output')
         self.register_event_type('on_pods_output')
+        self.register_event_type('on_pod_events')
+        self.register_event_type('on_pods_page')
+        self.register_event_type('on_pods_complete')
+        self.register_event_type('on_fan_out_pods')
+        self.register_event_type('on_fan_out_error')
+        self.register_event_type('on_fan_out_complete')
+        self.profile = profile or DummyProfile.from_env()
+        self.latency_random = self.profile.rng('latency')
+        self.error_random = self.profile.rng('errors')
+        self.pod_page_size = self.profile.pod_page_size
+        self.metrics = Metrics()
+        self.current_context = None
+        self.loaded_contexts = set()
+        self.pods_list_events = None
+        self.watch_event = None
+        self.namespace_watch_event = None
+        self.register_event_type('on_namespaces')
+        self.register_event_type('on_namespace_events')
         self.register_event_type('on_logs_output')
+        self.register_event_type('on_logs_append')
+        self.register_event_type('on_logs_follow_end')
+        self.follow_event = None
         self.register_event_type('on_secrets_output')
+        self.register_event_type('on_secret_details')
         self.register_event_type('on_deployments_output')
+        self.register_event_type('on_deployment_details')
         self.register_event_type('on_describe_output')
 
-    def safe_load_kube_config(self):
-        """Mock loading kube config (no-op)."""
-        pass
+    def _delay(self):
+        """Latency of one simulated request."""
+        latency = self.profile.latency(self.latency_random)
+        self.metrics.record('request.latency', latency)
+        return latency
+
+    def _failed(self, kind):
+        """Error message of an injected failure, or None if the request succeeds."""
+        if self.error_random.random() < self.profile.error_rate:
+            return f"Error fetching {kind}: Internal Server Error (500)"
+        return None
+
+    def safe_load_kube_config(self, context=None):
+        """Mock loading kube config, remembering the context like the client pool."""
+        self.current_context = context
+        self.loaded_contexts.add(context)
 
-    def execute_merge(self, subscription, resource_group, cluster_name):
-        """Mock merge command, dispatching event with success."""
+    def execute_merge(self, subscription, resource_group, cluster_name, refresh_credentials=True):
+        """Mock merge command, dispatching event with success.
+
+        Without refresh_credentials the kubeconfig context is treated as present and valid.
+        """
         def _run_merge(dt):
             output = f"Merged \"{cluster_name}\" as current context in kubeconfig"
             success = True
             self.dispatch('on_merge_output', output, success)
-        Clock.schedule_once(_run_merge, 1)  # Simulate async delay
+
+        def _reuse_context(dt):
+            output = f"Switched to \"{cluster_name}\" using its existing client (az aks get-credentials skipped)"
+            self.dispatch('on_merge_output', output, True)
+        def _verified_context(dt):
+            output = f"Using existing kubeconfig context \"{cluster_name}\" (verified with /version, az aks get-credentials skipped)"
+            self.dispatch('on_merge_output', output, True)
+        if cluster_name in self.loaded_contexts:
+            Clock.schedule_once(_reuse_context, 0)
+        elif not refresh_credentials:
+            Clock.schedule_once(_verified_context, self._delay())
+        else:
+            Clock.schedule_once(_run_merge, 2 * self._delay())  # az aks get-credentials takes a couple of round trips
 
     def on_merge_output(self, output, success):
         """Event handler for merge output."""
         pass
 
-    def get_pods(self, namespace):
-        """Mock fetching pods, returning random pod data."""
+    def get_pods(self, namespace, page_size=None, context=None):
+        """Mock fetching pods, generating the profile's pods page by page.
+
+        Like a real list, a new one supersedes the previous one: its pages that
+        were not dispatched yet are dropped.
+        """
+        self._cancel_pods_list()
+        context = context or self.current_context
+
         def fetch_pods(dt):
-            try:
-                # Generate 5–50 random pods
-                pod_count = random.randint(5, 50)
-                now = datetime.now(timezone.utc)
-                statuses = ["Running", "Pending", "Failed", "Succeeded"]
-                pod_data = [
-                    {
-                        "name": f"pod-{i+1}",
-                        "status": random.choice(statuses),
-                        "age": naturaltime(now - timedelta(days=random.randint(0, 7), hours=random.randint(0, 23))),
-                        "restarts": random.randint(0, 5)
-                    }
-                    for i in range(pod_count)
-                ]
-                self.dispatch('on_pods_output', pod_data)
-            except Exception as e:
-                self.dispatch('on_pods_output', f"Error fetching pods: {str(e)}")
-        Clock.schedule_once(fetch_pods, 1)  # Simulate async delay
+            error = self._failed('pods')
+            if error:
+                self.dispatch('on_pods_output', error)
+                return
+            self._dispatch_pages(self._generate_pods(context, namespace), page_size or self.pod_page_size, scheduled=scheduled)
+        scheduled = [Clock.schedule_once(fetch_pods, self._delay())]  # ClockEvents of the list, to cancel it
+        self.pods_list_events = scheduled
+
+    def _cancel_pods_list(self):
+        if self.pods_list_events:
+            for event in self.pods_list_events:
+                event.cancel()
+            self.pods_list_events = None
+
+    def _dispatch_pages(self, pods, page_size, collect=None, complete=None, scheduled=None):
+        """Dispatch pods in pages page_interval apart, like a chunked list.
+
+        Pages are generated as they are dispatched, so large profiles do not
+        stall a frame; collect, if given, receives every dispatched pod and
+        complete is called after on_pods_complete. The ClockEvent of each later
+        page is added to scheduled, if given, so the list can be cancelled.
+        """
+        pods = iter(pods)
+        dispatched = [0]
+
+        def next_page(dt, page_index=0):
+            page = list(islice(pods, page_size))
+            if page or page_index == 0:
+                if collect is not None:
+                    collect(page)
+                dispatched[0] += len(page)
+                self.dispatch('on_pods_page', page, page_index)
+            if len(page) < page_size:
+                self.dispatch('on_pods_complete', dispatched[0])
+                if complete is not None:
+                    complete()
+            else:
+                event = Clock.schedule_once(lambda dt: next_page(dt, page_index + 1), self.profile.page_interval)
+                if scheduled is not None:
+                    scheduled.append(event)
+        next_page(0)
+
+    def _generate_pods(self, context, namespace):
+        """Yield the profile's pods of a namespace; the same for every call."""
+        rng = self.profile.rng('pods', context, namespace)
+        apps = self._names(context, namespace, 'deployments', self.profile.deployment_count) or ['app']
+        for index in range(self.profile.pod_count):
+            yield self._generate_pod(rng, f"{rng.choice(apps)}-{name_suffix(index)}")
+
+    def _generate_pod(self, rng, name, new=False):
+        return {
+            "name": name,
+            "uid": f"{rng.getrandbits(128):032x}",
+            "resource_version": "1",
+            "status": rng.choices(PHASES, weights=PHASE_WEIGHTS)[0],
+            "age": age_text(0 if new else rng.randint(0, 30 * 24)),
+            "restarts": min(int(rng.expovariate(1.5)), 50),
+        }
+
+    def _names(self, context, namespace, kind, amount):
+        """Names of the profile's secrets or deployments in a namespace."""
+        rng = self.profile.rng(kind, context, namespace)
+        apps = [rng.choice(APPS) for _ in range(amount)]
+        if kind == 'secrets':
+            return sorted(f"{app}-{rng.choice(list(DummyProfile.SECRET_KEYS))}-{index + 1}" for index, app in enumerate(apps))
+        return sorted(f"{app}-{index + 1}" for index, app in enumerate(apps))
 
     def on_pods_output(self, output):
-        """Event handler for pods output."""
+        """Event handler for a pod list error message."""
+        pass
+
+    def get_pods_fan_out(self, namespace, clusters):
+        """Mock fan-out list: each cluster answers after its own latency; slow ones time out."""
+        pod_counts = {}
+        for resource_group, cluster_name in clusters:
+            delay = self._delay()
+            error = self._failed('pods')
+
+            def answer(dt, cluster_name=cluster_name, delay=delay, error=error):
+                if delay > FAN_OUT_CLUSTER_TIMEOUT:
+                    error = f"Error fetching pods: timed out after {FAN_OUT_CLUSTER_TIMEOUT}s"
+                if error:
+                    pod_counts[cluster_name] = None
+                    self.dispatch('on_fan_out_error', cluster_name, error)
+                else:
+                    pods = list(self._generate_pods(cluster_name, namespace))
+                    pod_counts[cluster_name] = len(pods)
+                    self.dispatch('on_fan_out_pods', cluster_name, pods)
+                if len(pod_counts) == len(clusters):
+                    complete()
+            Clock.schedule_once(answer, min(delay, FAN_OUT_CLUSTER_TIMEOUT))
+
+        def complete():
+            counts = [pod_count for pod_count in pod_counts.values() if pod_count is not None]
+            self.dispatch('on_fan_out_complete', sum(counts), len(pod_counts) - len(counts))
+        if not clusters:
+            Clock.schedule_once(lambda dt: complete(), 0)
+
+    def on_fan_out_pods(self, cluster_name, pods):
+        """Event handler for one cluster's pods of a fan-out list."""
+        pass
+
+    def on_fan_out_error(self, cluster_name, message):
+        """Event handler for a cluster that failed or timed out in a fan-out list."""
+        pass
+
+    def on_fan_out_complete(self, total, failed):
+        """Event handler for the end of a fan-out list."""
+        pass
+
+    def watch_pods(self, namespace, context=None):
+        """Mock pod watch: an initial list, then churn_batch changes every churn_interval.
+
+        Churn starts once the initial list is complete, as a real watch resumes
+        from the list's resourceVersion; an ADDED event in the middle of the list
+        would be pruned with the pods the list did not contain.
+        """
+        self.stop_watch_pods()
+        self._cancel_pods_list()  # Its pages would interleave with the watch's list
+        context = context or self.current_context
+        rng = self.profile.rng('watch', context, namespace)
+        apps = self._names(context, namespace, 'deployments', self.profile.deployment_count) or ['app']
+        pods = {}
+        names = []  # Keys of pods in insertion order, so choices do not depend on dict iteration
+        next_index = count(self.profile.pod_count)
+
+        def collect(page):
+            for pod in page:
+                pods[pod["name"]] = pod
+                names.append(pod["name"])
+
+        def initial_list(dt):
+            self._dispatch_pages(self._generate_pods(context, namespace), self.pod_page_size, collect, start_churn, scheduled)
+
+        def start_churn():
+            scheduled.append(Clock.schedule_interval(churn, self.profile.churn_interval))
+
+        def churn(dt):
+            events = []
+            for _ in range(self.profile.churn_batch):
+                event_type = rng.choices(["ADDED", "MODIFIED", "DELETED"], weights=[1, 2, 1])[0] if names else "ADDED"
+                if event_type == "ADDED":
+                    pod = self._generate_pod(rng, f"{rng.choice(apps)}-{name_suffix(next(next_index))}", new=True)
+                    pods[pod["name"]] = pod
+                    names.append(pod["name"])
+                else:
+                    position = rng.randrange(len(names))
+                    name = names[position]
+                    if event_type == "MODIFIED":
+                        pod = dict(pods[name], resource_version=str(int(pods[name]["resource_version"]) + 1),
+                                   status=rng.choices(PHASES, weights=PHASE_WEIGHTS)[0],
+                                   restarts=pods[name]["restarts"] + rng.randint(0, 1))
+                        pods[name] = pod
+                    else:
+                        names[position] = names[-1]
+                        names.pop()
+                        pod = pods.pop(name)
+                events.append((event_type, pod))
+            self.dispatch('on_pod_events', events)
+
+        scheduled = [Clock.schedule_once(initial_list, self._delay())]  # ClockEvents of the watch, to cancel it
+        self.watch_event = scheduled
+
+    def stop_watch_pods(self):
+        """Stop the mock pod watch."""
+        if self.watch_event:
+            for event in self.watch_event:
+                event.cancel()
+            self.watch_event = None
+
+    def on_pod_events(self, events):
+        """Event handler for pod watch events."""
         pass
 
-    def get_logs(self, pod, namespace):
-        """Mock fetching logs for a pod."""
+    def watch_namespaces(self, context=None):
+        """Mock namespace watch: the profile's namespaces, then a preview namespace toggling every namespace_churn_interval."""
+        self.stop_watch_namespaces()
+        context = context or self.current_context
+        names = self.profile.namespaces(context)
+        previews = count()
+        preview = [f"preview-{next(previews)}"]
+
+        def initial_list(dt):
+            self.dispatch('on_namespaces', context, self._failed('namespaces') or list(names))
+
+        def churn(dt):
+            if preview[0] in names:
+                names.remove(preview[0])
+                self.dispatch('on_namespace_events', context, [("DELETED", preview[0])])
+                preview[0] = f"preview-{next(previews)}"
+            else:
+                names.append(preview[0])
+                self.dispatch('on_namespace_events', context, [("ADDED", preview[0])])
+
+        initial = Clock.schedule_once(initial_list, self._delay())
+        interval = Clock.schedule_interval(churn, self.profile.namespace_churn_interval)
+        self.namespace_watch_event = (initial, interval)
+
+    def get_namespaces(self, context=None):
+        """Mock listing the profile's namespaces of a cluster once."""
+        context = context or self.current_context
+
+        def fetch_namespaces(dt):
+            self.dispatch('on_namespaces', context, self._failed('namespaces') or list(self.profile.namespaces(context)))
+        Clock.schedule_once(fetch_namespaces, self._delay())
+
+    def stop_watch_namespaces(self):
+        """Stop the mock namespace watch."""
+        if self.namespace_watch_event:
+            for event in self.namespace_watch_event:
+                event.cancel()
+            self.namespace_watch_event = None
+
+    def on_namespaces(self, context, names):
+        """Event handler for the namespace list of a cluster."""
+        pass
+
+    def on_namespace_events(self, context, events):
+        """Event handler for namespace watch events."""
+        pass
+
+    def on_pods_page(self, pods, page_index):
+        """Event handler for one page of pods."""
+        pass
+
+    def on_pods_complete(self, total):
+        """Event handler for the end of a paginated pod list."""
+        pass
+
+    def get_logs(self, pod, namespace, context=None):
+        """Mock fetching logs for a pod: the profile's log_lines lines."""
+        context = context or self.current_context
+
         def fetch_logs(dt):
-            try:
-                logs = f"Mock logs for {pod} in namespace {namespace}\n" + \
-                       "Sample log line 1\nSample log line 2\n" + \
-                       f"Generated at {datetime.now(timezone.utc).isoformat()}"
-                self.dispatch('on_logs_output', logs)
-            except Exception as e:
-                self.dispatch('on_logs_output', f"Error fetching logs: {str(e)}")
-        Clock.schedule_once(fetch_logs, 1)  # Simulate async delay
+            error = self._failed('logs')
+            if error:
+                self.dispatch('on_logs_output', error)
+                return
+            start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+            interval = timedelta(seconds=1 / self.profile.log_rate)
+            moments = (start + index * interval for index in range(self.profile.log_lines))
+            self.dispatch('on_logs_output', "".join(self.profile.log((context, namespace, pod), moments)))
+        Clock.schedule_once(fetch_logs, self._delay())
 
     def on_logs_output(self, output):
         """Event handler for logs output."""
         pass
 
-    def get_describe_pod(self, pod, namespace):
+    def follow_logs(self, pod, namespace, tail_lines=None, context=None):
+        """Mock log follow, appending lines at the profile's log_rate."""
+        self.stop_follow_logs()
+        context = context or self.current_context
+        now = iter(lambda: datetime.now(timezone.utc), None)
+        lines = self.profile.log((context, namespace, pod), now, first=self.profile.log_lines)  # The lines after get_logs' ones
+        due = [0.0]  # Lines owed, carried over between frames
+
+        def append_lines(dt):
+            due[0] += dt * self.profile.log_rate
+            batch = int(due[0])
+            due[0] -= batch
+            if batch:
+                self.dispatch('on_logs_append', "".join(islice(lines, batch)))
+        self.follow_event = Clock.schedule_interval(append_lines, max(1 / self.profile.log_rate, 1 / 30))
+
+    def stop_follow_logs(self):
+        """Stop the mock log follow."""
+        if self.follow_event:
+            self.follow_event.cancel()
+            self.follow_event = None
+
+    def on_logs_append(self, text):
+        """Event handler for streamed log text."""
+        pass
+
+    def on_logs_follow_end(self, message):
+        """Event handler for the end of a log follow."""
+        pass
+
+    def get_describe_pod(self, pod, namespace, context=None):
         """Mock pod describe with formatted output."""
         def fetch_describe(dt):
             try:
@@ -127,36 +442,80 @@ class DummyAzureClient(EventDispatcher):
                 self.dispatch('on_describe_output', mock_output)
             except Exception as e:
                 self.dispatch('on_describe_output', f"Error describing pod: {str(e)}")
-        Clock.schedule_once(fetch_describe, 1)  # Simulate delay
+        Clock.schedule_once(fetch_describe, self._delay())
 
     def on_describe_output(self, output):
         """Event handler for describe output."""
         pass
 
-    def get_secrets(self, namespace):
-        """Mock fetching secrets in a namespace."""
+    def get_secrets(self, namespace, context=None):
+        """Mock fetching the names of the profile's secrets in a namespace."""
+        context = context or self.current_context
+
         def fetch_secrets(dt):
-            try:
-                secrets = "\n".join([f"secret-{i+1}" for i in range(random.randint(1, 10))])
-                self.dispatch('on_secrets_output', secrets)
-            except Exception as e:
-                self.dispatch('on_secrets_output', f"Error fetching secrets: {str(e)}")
-        Clock.schedule_once(fetch_secrets, 1)  # Simulate async delay
+            error = self._failed('secrets')
+            self.dispatch('on_secrets_output', error or "\n".join(self._names(context, namespace, 'secrets', self.profile.secret_count)))
+        Clock.schedule_once(fetch_secrets, self._delay())
 
     def on_secrets_output(self, output):
         """Event handler for secrets output."""
         pass
 
-    def get_deployments(self, namespace):
-        """Mock fetching deployments in a namespace."""
+    def get_secret_details(self, name, namespace, context=None):
+        """Mock fetching one secret, described by its keys and sizes like the fake API server's."""
+        context = context or self.current_context
+
+        def fetch_secret(dt):
+            secret_type, data = self.profile.secret(context, namespace, name)
+            lines = [
+                f"Name:         {name}",
+                f"Namespace:    {namespace}",
+                f"Type:         {secret_type}",
+                "",
+                "Data",
+                "====",
+            ]
+            lines.extend(f"{key}:  {len(value)} bytes" for key, value in sorted(data.items()))
+            self.dispatch('on_secret_details', self._failed('secret') or "\n".join(lines))
+        Clock.schedule_once(fetch_secret, self._delay())
+
+    def on_secret_details(self, output):
+        """Event handler for secret details."""
+        pass
+
+    def get_deployments(self, namespace, context=None):
+        """Mock fetching the names of the profile's deployments in a namespace."""
+        context = context or self.current_context
+
         def fetch_deployments(dt):
-            try:
-                deployments = "\n".join([f"deployment-{i+1}" for i in range(random.randint(1, 5))])
-                self.dispatch('on_deployments_output', deployments)
-            except Exception as e:
-                self.dispatch('on_deployments_output', f"Error fetching deployments: {str(e)}")
-        Clock.schedule_once(fetch_deployments, 1)  # Simulate async delay
+            error = self._failed('deployments')
+            self.dispatch('on_deployments_output', error or "\n".join(self._names(context, namespace, 'deployments', self.profile.deployment_count)))
+        Clock.schedule_once(fetch_deployments, self._delay())
 
     def on_deployments_output(self, output):
         """Event handler for deployments output."""
-        pass
\ No newline at end of file
+        pass
+
+    def get_deployment_details(self, name, namespace, context=None):
+        """Mock fetching one deployment."""
+        context = context or self.current_context
+
+        def fetch_deployment(dt):
+            rng = self.profile.rng('deployment', context, namespace, name)
+            replicas = rng.randint(1, 5)
+            available = rng.randint(0, replicas)
+            lines = [
+                f"Name:         {name}",
+                f"Namespace:    {namespace}",
+                f"Replicas:     {replicas} desired | {replicas} updated | {replicas} total | {available} available | {replicas - available} unavailable",
+                "Strategy:     RollingUpdate",
+                "Containers:",
+                f"  {name}:",
+                f"    Image:      registry.example.com/{name}:1.0.0",
+            ]
+            self.dispatch('on_deployment_details', self._failed('deployment') or "\n".join(lines))
+        Clock.schedule_once(fetch_deployment, self._delay())
+
+    def on_deployment_details(self, output):
+        """Event handler for deployment details."""
+        pass
@@ -0,0 +1,149 @@
+import json
+import math
+import os
+import random
+
+NAME_ALPHABET = 'bcdfghjklmnpqrstvwxz2456789'  # Characters of generated pod name suffixes, as in Kubernetes
+APPS = ['api', 'web', 'worker', 'scheduler', 'gateway', 'auth', 'billing', 'search', 'notifier', 'reports']
+PHASES = ['Running', 'Pending', 'Failed', 'Succeeded']
+PHASE_WEIGHTS = [90, 4, 3, 3]
+LOG_MESSAGES = [
+    ('INFO', 'GET /api/v1/orders/{n} 200 {ms}ms'),
+    ('INFO', 'POST /api/v1/orders 201 {ms}ms'),
+    ('DEBUG', 'cache hit for key order:{n}'),
+    ('INFO', 'processed batch {n} in {ms}ms'),
+    ('WARN', 'slow query on orders took {ms}ms'),
+    ('ERROR', 'upstream billing returned 503 after {ms}ms, retrying request {n}'),
+]
+LOG_LEVEL_WEIGHTS = [40, 20, 20, 12, 6, 2]
+LOG_BLOCK = 1024  # Log lines drawn from one seeded generator, so a log can be read from any line
+
+
+def name_suffix(index):
+    """A unique five character suffix for the index-th pod, like a ReplicaSet's pod names."""
+    index = index * 7919 % len(NAME_ALPHABET) ** 5  # Scatter consecutive indexes; 7919 is coprime, so no collisions
+    suffix = ''
+    for _ in range(5):
+        index, digit = divmod(index, len(NAME_ALPHABET))
+        suffix += NAME_ALPHABET[digit]
+    return suffix
+
+
+def random_name(rng, length):
+    return ''.join(rng.choice(NAME_ALPHABET) for _ in range(length))
+
+
+class DummyProfile:
+    """Sizes, timings and failure rates of the data DummyAzureClient serves.
+
+    Everything random is drawn from generators seeded with seed, so the same
+    profile produces the same pods, logs and names on every run. Profiles are
+    picked with the DUMMY_PROFILE environment variable: a preset name or the
+    path of a JSON file with overrides, optionally on top of {"base": preset}.
+    """
+    DEFAULTS = {
+        'seed': 42,
+        'pod_count': 30,
+        'pod_page_size': 10,
+        'page_interval': 0.1,  # Seconds between pages of a list
+        'log_lines': 200,
+        'log_line_length': 120,
+        'log_rate': 2.0,  # Lines per second while following
+        'secret_count': 10,
+        'deployment_count': 5,
+        'namespace_count': 3,  # namespace-<n>-<environment> namespaces per cluster, besides default and kube-system
+        'namespace_churn_interval': 30.0,  # Seconds between a preview namespace appearing or disappearing
+        'latency_median': 0.5,  # Seconds; request latency is log-normal around it
+        'latency_sigma': 0.5,
+        'error_rate': 0.0,  # Probability that a request fails
+        'churn_interval': 2.0,  # Seconds between batches of watch events
+        'churn_batch': 1,  # Watch events per batch
+    }
+    MAX_POD_COUNT = 100000
+    PRESETS = {
+        'default': {},
+        'large': {'pod_count': 5000, 'pod_page_size': 500, 'page_interval': 0.05, 'log_lines': 20000, 'log_rate': 50,
+                  'secret_count': 300, 'deployment_count': 150, 'namespace_count': 50, 'churn_interval': 0.5, 'churn_batch': 10},
+        'huge': {'pod_count': 100000, 'pod_page_size': 500, 'page_interval': 0.02, 'log_lines': 200000, 'log_rate': 500,
+                 'secret_count': 2000, 'deployment_count': 1000, 'namespace_count': 1000, 'churn_interval': 0.1, 'churn_batch': 50},
+        'flaky': {'latency_median': 1.5, 'latency_sigma': 1.0, 'error_rate': 0.2},
+    }
+    SECRET_KEYS = {'tls': ['tls.crt', 'tls.key'], 'credentials': ['username', 'password'], 'config': ['config.yaml'], 'token': ['token']}
+
+    def __init__(self, **overrides):
+        unknown = set(overrides) - set(self.DEFAULTS)
+        if unknown:
+            raise ValueError(f"Unknown dummy profile settings: {', '.join(sorted(unknown))}")
+        settings = dict(self.DEFAULTS, **overrides)
+        if settings['pod_count'] > self.MAX_POD_COUNT:
+            raise ValueError(f"Dummy profile pod_count {settings['pod_count']} exceeds {self.MAX_POD_COUNT}")
+        for name, value in settings.items():
+            setattr(self, name, value)
+
+    @classmethod
+    def preset(cls, name, **overrides):
+        if name not in cls.PRESETS:
+            raise ValueError(f"Unknown dummy profile {name!r}, expected one of {', '.join(cls.PRESETS)}")
+        return cls(**dict(cls.PRESETS[name], **overrides))
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path) as f:
+            overrides = json.load(f)
+        return cls.preset(overrides.pop('base', 'default'), **overrides)
+
+    @classmethod
+    def load(cls, value):
+        """The profile of a preset name or a JSON file path."""
+        return cls.from_file(value) if value.endswith('.json') else cls.preset(value)
+
+    @classmethod
+    def from_env(cls):
+        """The profile named by DUMMY_PROFILE (preset or JSON file), or the default one."""
+        return cls.load(os.environ.get('DUMMY_PROFILE', 'default'))
+
+    def rng(self, *key):
+        """A generator seeded by the profile seed and key, e.g. ('pods', namespace)."""
+        return random.Random(':'.join(str(part) for part in (self.seed,) + key))
+
+    def namespaces(self, cluster):
+        """Sorted namespace names of a cluster; the environment is taken from its name, e.g. aks-na-sit-1."""
+        environment = next((part for part in cluster.split('-') if part in ('sit', 'uat', 'prod')), 'dev')
+        return sorted(['default', 'kube-system'] + [f"namespace-{index + 1}-{environment}" for index in range(self.namespace_count)])
+
+    def secret(self, cluster, namespace, name):
+        """(type, {key: value bytes}) of a generated secret; its kind is taken from its name, e.g. api-tls-3."""
+        rng = self.rng('secret', cluster, namespace, name)
+        kind = name.split('-')[-2]
+        return ('kubernetes.io/tls' if kind == 'tls' else 'Opaque'), {key: rng.randbytes(rng.randint(16, 4096)) for key in self.SECRET_KEYS[kind]}
+
+    def log(self, key, moments, first=0):
+        """Yield the lines of a generated log from line number first on, one per timestamp of moments.
+
+        key names the log, e.g. (cluster, namespace, pod). Every LOG_BLOCK lines
+        start a generator of their own and a line draws the same numbers whatever
+        its timestamp, so reading the tail of a long log, or following it, only
+        generates the lines since the start of their block.
+        """
+        index = first - first % LOG_BLOCK
+        rng = self.rng('logs', *key, index // LOG_BLOCK)
+        for _ in range(index, first):
+            self._log_draws(rng)
+        for index, moment in enumerate(moments, first):
+            if index % LOG_BLOCK == 0 and index != first:
+                rng = self.rng('logs', *key, index // LOG_BLOCK)
+            level, template, n, ms, trace = self._log_draws(rng)
+            line = f"{moment.isoformat()} {level:<5} {template.format(n=n, ms=ms)}"
+            digits = self.log_line_length - len(line) - len(" trace=")
+            if digits > 0:
+                line += f" trace={trace:0{self.log_line_length}x}"[:digits + len(" trace=")]
+            yield line + "\n"
+
+    def _log_draws(self, rng):
+        """(level, template, n, ms, trace bits) of one log line."""
+        level, template = rng.choices(LOG_MESSAGES, weights=LOG_LEVEL_WEIGHTS)[0]
+        return level, template, rng.randint(1, 99999), rng.randint(1, 2000), rng.getrandbits(4 * self.log_line_length)
+
+    def latency(self, rng):
+        """One request latency in seconds."""
+        return self.latency_median * math.exp(rng.gauss(0, self.latency_sigma))
@@ -0,0 +1,61 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class RequestHandle:
+    """Handle of a request submitted to a RequestExecutor."""
+
+    def __init__(self, executor, kind, generation):
+        self.executor = executor
+        self.kind = kind
+        self.generation = generation
+        self.future = None
+        self.cancelled = False
+
+    def cancel(self):
+        """Cancel the request; it is dropped if not started and its results are discarded."""
+        self.cancelled = True
+        if self.future is not None:
+            self.future.cancel()
+
+    def is_current(self):
+        """True while the request is not cancelled and no newer request of its kind exists."""
+        return not self.cancelled and self.executor.generations.get(self.kind) == self.generation
+
+
+class RequestExecutor:
+    """Bounded worker pool shared by all requests of a client.
+
+    Every request has a kind (e.g. 'pods') and gets the next generation number of
+    that kind. Submitting a request supersedes the previous one of the same kind:
+    it is cancelled, and callers use RequestHandle.is_current to drop its results.
+    """
+
+    def __init__(self, max_workers=4):
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='azure-client')
+        self.generations = {}
+        self.active = {}
+        self.lock = threading.Lock()
+
+    def submit(self, kind, fn, *args):
+        """Run fn(handle, *args) on the pool as the newest request of its kind."""
+        with self.lock:
+            generation = self.generations.get(kind, 0) + 1
+            self.generations[kind] = generation
+            handle = RequestHandle(self, kind, generation)
+            previous = self.active.get(kind)
+            self.active[kind] = handle
+        if previous is not None:
+            previous.cancel()
+        handle.future = self.pool.submit(fn, handle, *args)
+        return handle
+
+    def cancel(self, kind):
+        """Cancel the active request of a kind, if any."""
+        with self.lock:
+            handle = self.active.pop(kind, None)
+        if handle is not None:
+            handle.cancel()
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,642 @@
+"""A local stand-in for the Kubernetes API server, to run the real AzureClient without a cluster.
+
+Serves what AzureClient uses: /version, namespaces (list and watch), pods
+(chunked lists, watch, read, logs with follow), events, secrets and deployments
+(including metadata-only lists), for every cluster of a kubeconfig it writes. Each cluster lives under
+/clusters/<name> and its data is generated from a DummyProfile, so the size,
+latency, error rate and churn are configurable and a seed always serves the
+same objects.
+
+Usage: python -m k8s.fake_api_server [--port 8080] [--profile large] [--kubeconfig fake-kubeconfig.json]
+then start the app, a benchmark or a test with KUBECONFIG set to that file.
+"""
+import argparse
+import base64
+import bisect
+import json
+import re
+import threading
+import time
+import uuid
+from collections import deque
+from itertools import count, islice
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+from k8s.dummy_profile import APPS, LOG_BLOCK, PHASES, PHASE_WEIGHTS, DummyProfile, name_suffix, random_name
+
+TOKEN = 'fake-token'
+WATCH_HISTORY = 10000  # Watch events kept per namespace; older resource versions get 410 Gone
+ROUTES = [(re.compile(pattern), name) for pattern, name in (
+    (r'/version/?', 'version'),
+    (r'/api/v1/namespaces', 'list_namespaces'),
+    (r'/api/v1/namespaces/(?P<namespace>[^/]+)/pods', 'list_pods'),
+    (r'/api/v1/namespaces/(?P<namespace>[^/]+)/pods/(?P<name>[^/]+)', 'read_pod'),
+    (r'/api/v1/namespaces/(?P<namespace>[^/]+)/pods/(?P<name>[^/]+)/log', 'read_log'),
+    (r'/api/v1/namespaces/(?P<namespace>[^/]+)/events', 'list_events'),
+    (r'/api/v1/namespaces/(?P<namespace>[^/]+)/secrets', 'list_secrets'),
+    (r'/api/v1/namespaces/(?P<namespace>[^/]+)/secrets/(?P<name>[^/]+)', 'read_secret'),
+    (r'/apis/apps/v1/namespaces/(?P<namespace>[^/]+)/deployments', 'list_deployments'),
+    (r'/apis/apps/v1/namespaces/(?P<namespace>[^/]+)/deployments/(?P<name>[^/]+)', 'read_deployment'),
+)]
+
+
+def timestamp(moment):
+    return moment.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def flag(query, name):
+    """A boolean query parameter; the SDK sends True, kubectl true."""
+    return query.get(name, '').lower() in ('true', '1')
+
+
+class FakeCluster:
+    """Namespaces of one cluster, and the namespace changes a watch replays."""
+
+    def __init__(self, name, profile, started):
+        self.name = name
+        self.started = started
+        self.changed = threading.Condition()
+        self.namespaces = profile.namespaces(name)  # Sorted
+        self.versions = {namespace: 1 for namespace in self.namespaces}  # Namespace -> its resourceVersion
+        self.events = deque(maxlen=WATCH_HISTORY)  # (resource_version, type, namespace)
+        self.resource_version = 1
+        self.previews = 0  # preview-<n> namespaces created and deleted so far
+
+    def churn(self):
+        """Create the next preview namespace, or delete the current one, and wake up the watches."""
+        with self.changed:
+            self.resource_version += 1
+            preview = f"preview-{self.previews}"
+            if preview in self.versions:
+                self.namespaces.remove(preview)
+                del self.versions[preview]
+                self.previews += 1
+                event_type = 'DELETED'
+            else:
+                bisect.insort(self.namespaces, preview)
+                self.versions[preview] = self.resource_version
+                event_type = 'ADDED'
+            self.events.append((self.resource_version, event_type, preview))
+            self.changed.notify_all()
+
+    def namespace_json(self, name, metadata_only=False, resource_version=None):
+        metadata = {
+            'name': name,
+            'uid': str(uuid.uuid5(uuid.NAMESPACE_URL, f"{self.name}/{name}")),
+            'resourceVersion': str(resource_version or self.versions[name]),
+            'creationTimestamp': timestamp(self.started),
+        }
+        if metadata_only:
+            return {'kind': 'PartialObjectMetadata', 'apiVersion': 'meta.k8s.io/v1', 'metadata': metadata}
+        return {'kind': 'Namespace', 'apiVersion': 'v1', 'metadata': metadata, 'spec': {'finalizers': ['kubernetes']}, 'status': {'phase': 'Active'}}
+
+
+class FakeNamespace:
+    """Generated objects of one namespace, and the pod changes a watch replays."""
+
+    def __init__(self, cluster, name, profile, started):
+        self.cluster = cluster
+        self.name = name
+        self.profile = profile
+        self.started = started
+        self.rng = profile.rng('server', cluster, name)
+        self.changed = threading.Condition()
+        self.deployments = sorted(f"{self.rng.choice(APPS)}-{index + 1}" for index in range(profile.deployment_count)) or ['app']
+        self.template_hashes = {app: random_name(self.rng, 10) for app in self.deployments}
+        self.secrets = sorted(
+            f"{self.rng.choice(APPS)}-{self.rng.choice(list(DummyProfile.SECRET_KEYS))}-{index + 1}"
+            for index in range(profile.secret_count)
+        )
+        self.pods = {}  # name -> pod record
+        self.names = []  # Pod names in list order, which is creation order
+        self.indexes = []  # Creation index of each pod in names; continue tokens are the last index of a page
+        self.events = deque(maxlen=WATCH_HISTORY)  # (resource_version, type, pod record)
+        self.resource_version = 0
+        for index in range(profile.pod_count):
+            self.add_pod(index, self.started - timedelta(minutes=self.rng.randint(1, 30 * 24 * 60)))
+        self.next_index = profile.pod_count
+
+    def add_pod(self, index, created):
+        """Create the index-th pod; its name suffix is unique per index."""
+        app = self.rng.choice(self.deployments)
+        self.resource_version += 1
+        pod = {
+            'name': f"{app}-{self.template_hashes[app]}-{name_suffix(index)}",
+            'uid': str(uuid.UUID(int=self.rng.getrandbits(128))),
+            'app': app,
+            'index': index,
+            'phase': self.rng.choices(PHASES, weights=PHASE_WEIGHTS)[0],
+            'restarts': min(int(self.rng.expovariate(1.5)), 50),
+            'created': created,
+            'resource_version': self.resource_version,
+        }
+        self.pods[pod['name']] = pod
+        self.names.append(pod['name'])
+        self.indexes.append(index)
+        return pod
+
+    def churn(self, batch):
+        """Add, change or delete batch pods and wake up the watches."""
+        with self.changed:
+            for _ in range(batch):
+                event_type = self.rng.choices(['ADDED', 'MODIFIED', 'DELETED'], weights=[1, 2, 1])[0] if self.names else 'ADDED'
+                if event_type == 'ADDED':
+                    pod = self.add_pod(self.next_index, datetime.now(timezone.utc))
+                    self.next_index += 1
+                else:
+                    position = self.rng.randrange(len(self.names))
+                    name = self.names[position]
+                    self.resource_version += 1
+                    if event_type == 'MODIFIED':
+                        pod = dict(self.pods[name], resource_version=self.resource_version,
+                                   phase=self.rng.choices(PHASES, weights=PHASE_WEIGHTS)[0],
+                                   restarts=self.pods[name]['restarts'] + self.rng.randint(0, 1))
+                        self.pods[name] = pod
+                    else:
+                        del self.names[position], self.indexes[position]
+                        pod = dict(self.pods.pop(name), resource_version=self.resource_version)
+                self.events.append((self.resource_version, event_type, pod))
+            self.changed.notify_all()
+
+    def pod_json(self, pod):
+        """A pod record as the API server returns it."""
+        index = pod['index']
+        started = timestamp(pod['created'] + timedelta(seconds=5))
+        running = pod['phase'] == 'Running'
+        containers = [pod['app'], 'sidecar']
+        return {
+            'kind': 'Pod',
+            'apiVersion': 'v1',
+            'metadata': {
+                'name': pod['name'],
+                'namespace': self.name,
+                'uid': pod['uid'],
+                'resourceVersion': str(pod['resource_version']),
+                'creationTimestamp': timestamp(pod['created']),
+                'labels': {'app': pod['app'], 'pod-template-hash': self.template_hashes[pod['app']]},
+                'ownerReferences': [{
+                    'apiVersion': 'apps/v1', 'kind': 'ReplicaSet', 'name': f"{pod['app']}-{self.template_hashes[pod['app']]}",
+                    'uid': str(uuid.uuid5(uuid.NAMESPACE_DNS, pod['app'])), 'controller': True,
+                }],
+            },
+            'spec': {
+                'nodeName': f"aks-nodepool1-{index % 12}",
+                'containers': [{
+                    'name': container,
+                    'image': f"registry.example.com/{container}:1.2.3",
+                    'ports': [{'containerPort': 8080, 'protocol': 'TCP'}],
+                    'env': [{'name': 'LOG_LEVEL', 'value': 'info'}],
+                    'resources': {'limits': {'cpu': '500m', 'memory': '512Mi'}, 'requests': {'cpu': '100m', 'memory': '128Mi'}},
+                    'volumeMounts': [{'name': 'kube-api-access', 'mountPath': '/var/run/secrets/kubernetes.io/serviceaccount', 'readOnly': True}],
+                } for container in containers],
+                'volumes': [{'name': 'kube-api-access', 'projected': {'defaultMode': 420, 'sources': [{'serviceAccountToken': {'path': 'token', 'expirationSeconds': 3607}}]}}],
+                'tolerations': [
+                    {'key': 'node.kubernetes.io/not-ready', 'operator': 'Exists', 'effect': 'NoExecute', 'tolerationSeconds': 300},
+                    {'key': 'node.kubernetes.io/unreachable', 'operator': 'Exists', 'effect': 'NoExecute', 'tolerationSeconds': 300},
+                ],
+            },
+            'status': {
+                'phase': pod['phase'],
+                'hostIP': f"10.224.0.{index % 12 + 4}",
+                'podIP': f"10.244.{index // 250 % 256}.{index % 250 + 2}",
+                'startTime': timestamp(pod['created']),
+                'qosClass': 'Burstable',
+                'conditions': [
+                    {'type': kind, 'status': 'True' if running or kind == 'PodScheduled' else 'False', 'lastTransitionTime': started}
+                    for kind in ('Initialized', 'Ready', 'ContainersReady', 'PodScheduled')
+                ],
+                'containerStatuses': [{
+                    'name': container,
+                    'ready': running,
+                    'restartCount': pod['restarts'] if position == 0 else 0,
+                    'image': f"registry.example.com/{container}:1.2.3",
+                    'imageID': f"registry.example.com/{container}@sha256:{uuid.uuid5(uuid.NAMESPACE_DNS, container).hex * 2}",
+                    'containerID': f"containerd://{uuid.uuid5(uuid.NAMESPACE_DNS, pod['uid'] + container).hex * 2}",
+                    'state': {'running': {'startedAt': started}} if running else {'waiting': {'reason': 'ContainerCreating'}},
+                } for position, container in enumerate(containers)],
+            },
+        }
+
+    def pod_events(self, pod):
+        """Events of a pod, as a describe shows them."""
+        created = pod['created']
+        events = [
+            ('Normal', 'Scheduled', 'default-scheduler', 0, f"Successfully assigned {self.name}/{pod['name']} to aks-nodepool1-{pod['index'] % 12}", 1),
+            ('Normal', 'Pulling', 'kubelet', 1, f"Pulling image \"registry.example.com/{pod['app']}:1.2.3\"", 1),
+            ('Normal', 'Pulled', 'kubelet', 3, f"Successfully pulled image \"registry.example.com/{pod['app']}:1.2.3\"", 1),
+            ('Normal', 'Created', 'kubelet', 4, f"Created container {pod['app']}", 1),
+            ('Normal', 'Started', 'kubelet', 5, f"Started container {pod['app']}", 1),
+        ]
+        if pod['restarts']:
+            events.append(('Warning', 'BackOff', 'kubelet', 600, 'Back-off restarting failed container', pod['restarts']))
+        return [{
+            'metadata': {'name': f"{pod['name']}.{position:016x}", 'namespace': self.name, 'creationTimestamp': timestamp(created)},
+            'involvedObject': {'kind': 'Pod', 'name': pod['name'], 'namespace': self.name, 'uid': pod['uid']},
+            'type': event_type,
+            'reason': reason,
+            'source': {'component': component},
+            'message': message,
+            'count': repeats,
+            'firstTimestamp': timestamp(created + timedelta(seconds=offset)),
+            'lastTimestamp': timestamp(created + timedelta(seconds=offset * repeats)),
+        } for position, (event_type, reason, component, offset, message, repeats) in enumerate(events)]
+
+    def secret_json(self, name):
+        secret_type, data = self.profile.secret(self.cluster, self.name, name)
+        return {
+            'kind': 'Secret',
+            'apiVersion': 'v1',
+            'metadata': self.object_metadata(name),
+            'type': secret_type,
+            'data': {key: base64.b64encode(value).decode() for key, value in data.items()},
+        }
+
+    def deployment_json(self, name):
+        rng = self.profile.rng('deployment', self.cluster, self.name, name)
+        replicas = rng.randint(1, 5)
+        available = rng.randint(0, replicas)
+        transition = timestamp(self.started - timedelta(hours=rng.randint(1, 720)))
+        return {
+            'kind': 'Deployment',
+            'apiVersion': 'apps/v1',
+            'metadata': dict(self.object_metadata(name), generation=1, labels={'app': name}),
+            'spec': {
+                'replicas': replicas,
+                'selector': {'matchLabels': {'app': name}},
+                'strategy': {'type': 'RollingUpdate', 'rollingUpdate': {'maxSurge': '25%', 'maxUnavailable': '25%'}},
+                'template': {
+                    'metadata': {'labels': {'app': name}},
+                    'spec': {'containers': [{
+                        'name': name,
+                        'image': f"registry.example.com/{name}:1.2.3",
+                        'ports': [{'containerPort': 8080, 'protocol': 'TCP'}],
+                        'resources': {'limits': {'cpu': '500m', 'memory': '512Mi'}, 'requests': {'cpu': '100m', 'memory': '128Mi'}},
+                    }]},
+                },
+            },
+            'status': {
+                'observedGeneration': 1,
+                'replicas': replicas,
+                'updatedReplicas': replicas,
+                'readyReplicas': available,
+                'availableReplicas': available,
+                'unavailableReplicas': replicas - available or None,
+                'conditions': [
+                    {'type': 'Available', 'status': 'True' if available == replicas else 'False',
+                     'reason': 'MinimumReplicasAvailable' if available == replicas else 'MinimumReplicasUnavailable',
+                     'lastUpdateTime': transition, 'lastTransitionTime': transition},
+                    {'type': 'Progressing', 'status': 'True', 'reason': 'NewReplicaSetAvailable',
+                     'lastUpdateTime': transition, 'lastTransitionTime': transition},
+                ],
+            },
+        }
+
+    def object_metadata(self, name):
+        rng = self.profile.rng('metadata', self.cluster, self.name, name)
+        return {
+            'name': name,
+            'namespace': self.name,
+            'uid': str(uuid.UUID(int=rng.getrandbits(128))),
+            'resourceVersion': str(rng.randint(1, 10 ** 6)),
+            'creationTimestamp': timestamp(self.started - timedelta(hours=rng.randint(1, 720))),
+        }
+
+
+class FakeApiServer:
+    """Serves generated clusters over HTTP on a background thread.
+
+    start() binds host:port (port 0 picks a free one) and starts the watch
+    churn; write_kubeconfig() writes a kubeconfig with one context per cluster,
+    named and owned the way az aks get-credentials names them.
+    """
+
+    def __init__(self, profile=None, host='127.0.0.1', port=0):
+        self.profile = profile or DummyProfile.from_env()
+        self.started = datetime.now(timezone.utc).replace(microsecond=0)
+        self.namespaces = {}  # (cluster, namespace) -> FakeNamespace
+        self.clusters = {}  # name -> FakeCluster
+        self.lock = threading.Lock()
+        self.request_random = self.profile.rng('server-requests')
+        self.request_lock = threading.Lock()
+        self.stopping = threading.Event()
+        self.httpd = ThreadingHTTPServer((host, port), FakeApiHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.fake = self
+        self.threads = []
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        for target in (self.httpd.serve_forever, self.run_churn):
+            thread = threading.Thread(target=target, name='fake-api-server', daemon=True)
+            thread.start()
+            self.threads.append(thread)
+        return self
+
+    def stop(self):
+        self.stopping.set()
+        for watched in list(self.namespaces.values()) + list(self.clusters.values()):
+            with watched.changed:
+                watched.changed.notify_all()
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        for thread in self.threads:
+            thread.join()
+
+    def namespace(self, cluster, name):
+        """The generated namespace, created on first use."""
+        with self.lock:
+            namespace = self.namespaces.get((cluster, name))
+            if namespace is None:
+                namespace = self.namespaces[(cluster, name)] = FakeNamespace(cluster, name, self.profile, self.started)
+            return namespace
+
+    def cluster(self, name):
+        """The generated cluster's namespaces, created on first use."""
+        with self.lock:
+            cluster = self.clusters.get(name)
+            if cluster is None:
+                cluster = self.clusters[name] = FakeCluster(name, self.profile, self.started)
+            return cluster
+
+    def request_outcome(self):
+        """(latency in seconds, whether to fail) of one request."""
+        with self.request_lock:
+            return self.profile.latency(self.request_random), self.request_random.random() < self.profile.error_rate
+
+    def run_churn(self):
+        namespace_churn_ticks = max(1, round(self.profile.namespace_churn_interval / self.profile.churn_interval))
+        for tick in count(1):
+            if self.stopping.wait(self.profile.churn_interval):
+                return
+            for namespace in list(self.namespaces.values()):
+                namespace.churn(self.profile.churn_batch)
+            if tick % namespace_churn_ticks == 0:
+                for cluster in list(self.clusters.values()):
+                    cluster.churn()
+
+    def write_kubeconfig(self, path, clusters=None):
+        """Write a kubeconfig for clusters ([(resource_group, cluster)], all of data.DATA by default)."""
+        if clusters is None:
+            from data.DATA import SUBSCRIPTIONS
+            clusters = [(resource_group, cluster) for subscription in SUBSCRIPTIONS
+                        for resource_group, names in subscription.resource_groups.items() for cluster in names]
+        kubeconfig = {
+            'apiVersion': 'v1',
+            'kind': 'Config',
+            'clusters': [{'name': cluster, 'cluster': {'server': f"{self.url}/clusters/{cluster}"}} for _, cluster in clusters],
+            'users': [{'name': f"clusterUser_{resource_group}_{cluster}", 'user': {'token': TOKEN}} for resource_group, cluster in clusters],
+            'contexts': [{'name': cluster, 'context': {'cluster': cluster, 'user': f"clusterUser_{resource_group}_{cluster}"}}
+                         for resource_group, cluster in clusters],
+            'current-context': clusters[0][1] if clusters else '',
+        }
+        with open(path, 'w') as f:
+            json.dump(kubeconfig, f, indent=2)  # JSON is valid YAML
+        return path
+
+
+class FakeApiHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep-alive, as the SDK's connection pool expects
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        fake = self.server.fake
+        url = urlsplit(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        match = re.fullmatch(r'/clusters/(?P<cluster>[^/]+)(?P<path>/.*)', url.path)
+        if self.headers.get('Authorization') != f"Bearer {TOKEN}":
+            return self.send_status(401, 'Unauthorized', 'Unauthorized')
+        route = next(((name, route_match) for pattern, name in ROUTES for route_match in [pattern.fullmatch(match['path'])] if route_match), None) if match else None
+        if route is None:
+            return self.send_status(404, 'NotFound', f"the server could not find the requested resource ({url.path})")
+        latency, failed = fake.request_outcome()
+        time.sleep(latency)
+        if failed:
+            return self.send_status(500, 'InternalError', 'Internal error injected by the fake API server')
+        name, route_match = route
+        groups = route_match.groupdict()
+        if 'namespace' in groups:
+            groups['namespace'] = fake.namespace(match['cluster'], groups['namespace'])
+        elif name == 'list_namespaces':
+            groups['cluster'] = fake.cluster(match['cluster'])
+        try:
+            getattr(self, f"handle_{name}")(query, **groups)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # The client went away, e.g. a stopped watch or log follow
+
+    def send_json(self, body, status=200):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def send_status(self, code, reason, message):
+        self.send_json({'kind': 'Status', 'apiVersion': 'v1', 'metadata': {}, 'status': 'Failure',
+                        'message': message, 'reason': reason, 'code': code}, code)
+
+    def start_stream(self, content_type):
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+
+    def write_chunk(self, data):
+        if data:
+            self.wfile.write(b'%x\r\n%s\r\n' % (len(data), data))
+            self.wfile.flush()
+
+    def end_stream(self):
+        self.wfile.write(b'0\r\n\r\n')
+
+    def page(self, items, query, keys=None):
+        """(items of the page asked for with limit/continue, continue token of the next one).
+
+        With keys, the ascending key of each item, a token is the last key of
+        its page, so items added or removed meanwhile do not shift later pages.
+        """
+        token = query.get('continue')
+        if keys is None:
+            offset = int(token or 0)
+        else:
+            offset = bisect.bisect_right(keys, int(token)) if token else 0
+        end = offset + (int(query.get('limit') or 0) or len(items))
+        if end >= len(items):
+            return items[offset:], None
+        return items[offset:end], str(keys[end - 1] if keys is not None else end)
+
+    def handle_version(self, query):
+        self.send_json({
+            'major': '1', 'minor': '30', 'gitVersion': 'v1.30.0-fake', 'gitCommit': '0' * 40, 'gitTreeState': 'clean',
+            'buildDate': timestamp(self.server.fake.started), 'goVersion': 'go1.22.0', 'compiler': 'gc', 'platform': 'linux/amd64',
+        })
+
+    def handle_list_namespaces(self, query, cluster):
+        metadata_only = 'as=PartialObjectMetadata' in self.headers.get('Accept', '')
+        if flag(query, 'watch'):
+            return self.watch(query, cluster, lambda name, version: cluster.namespace_json(name, metadata_only, version))
+        with cluster.changed:
+            resource_version = cluster.resource_version
+            names, token = self.page(cluster.namespaces, query)
+            items = [cluster.namespace_json(name, metadata_only) for name in names]
+        metadata = {'resourceVersion': str(resource_version), **({'continue': token} if token else {})}
+        if metadata_only:
+            self.send_json({'kind': 'PartialObjectMetadataList', 'apiVersion': 'meta.k8s.io/v1', 'metadata': metadata, 'items': items})
+        else:
+            self.send_json({'kind': 'NamespaceList', 'apiVersion': 'v1', 'metadata': metadata, 'items': items})
+
+    def handle_list_pods(self, query, namespace):
+        if flag(query, 'watch'):
+            return self.watch(query, namespace, lambda pod, version: namespace.pod_json(pod))
+        with namespace.changed:
+            resource_version = namespace.resource_version
+            names, token = self.page(namespace.names, query, namespace.indexes)
+            pods = [namespace.pods[name] for name in names]
+        self.send_json({
+            'kind': 'PodList',
+            'apiVersion': 'v1',
+            'metadata': {'resourceVersion': str(resource_version), **({'continue': token} if token else {})},
+            'items': [namespace.pod_json(pod) for pod in pods],
+        })
+
+    def watch(self, query, watched, render):
+        """Stream watched's changes after resourceVersion until timeoutSeconds pass.
+
+        watched is a FakeNamespace (pod changes) or a FakeCluster (namespace
+        changes); render(object, resource_version) gives an event's object.
+        """
+        fake = self.server.fake
+        deadline = time.monotonic() + int(query.get('timeoutSeconds') or 1800)
+        resource_version = int(query.get('resourceVersion') or 0)
+        self.start_stream('application/json')
+        with watched.changed:
+            if watched.events and resource_version < watched.events[0][0] - 1:
+                gone = {'kind': 'Status', 'apiVersion': 'v1', 'status': 'Failure', 'reason': 'Expired', 'code': 410,
+                        'message': f"too old resource version: {resource_version}"}
+                self.write_chunk(json.dumps({'type': 'ERROR', 'object': gone}).encode() + b'\n')
+                return self.end_stream()
+        while not fake.stopping.is_set():
+            with watched.changed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                events = [event for event in watched.events if event[0] > resource_version]
+                if not events:
+                    watched.changed.wait(remaining)
+                    continue
+            resource_version = events[-1][0]
+            self.write_chunk(b''.join(
+                json.dumps({'type': event_type, 'object': render(changed, version)}).encode() + b'\n' for version, event_type, changed in events
+            ))
+        self.end_stream()
+
+    def find_pod(self, namespace, name):
+        with namespace.changed:
+            pod = namespace.pods.get(name)
+        if pod is None:
+            self.send_status(404, 'NotFound', f"pods \"{name}\" not found")
+        return pod
+
+    def handle_read_pod(self, query, namespace, name):
+        pod = self.find_pod(namespace, name)
+        if pod is not None:
+            self.send_json(namespace.pod_json(pod))
+
+    def handle_read_log(self, query, namespace, name):
+        """The pod's log_lines lines (the last tailLines of them), then new ones at log_rate if following."""
+        pod = self.find_pod(namespace, name)
+        if pod is None:
+            return
+        fake = self.server.fake
+        key = (namespace.cluster, namespace.name, name)
+        rate = namespace.profile.log_rate
+        lines = namespace.profile.log_lines
+        first = lines - min(int(query['tailLines']), lines) if 'tailLines' in query else 0
+        start = fake.started - timedelta(seconds=lines / rate)
+        history = namespace.profile.log(key, (start + timedelta(seconds=index / rate) for index in range(first, lines)), first)
+        self.start_stream('text/plain')
+        while chunk := ''.join(islice(history, LOG_BLOCK)):
+            self.write_chunk(chunk.encode())
+        if not flag(query, 'follow'):
+            self.end_stream()
+            return
+        followed = namespace.profile.log(key, iter(lambda: datetime.now(timezone.utc), None), lines)
+        interval = max(1 / rate, 0.05)
+        due = 0.0
+        while not fake.stopping.wait(interval):
+            due += interval * rate
+            batch, due = int(due), due - int(due)
+            self.write_chunk(''.join(islice(followed, batch)).encode())
+
+    def handle_list_events(self, query, namespace):
+        selector = dict(part.split('=', 1) for part in query.get('fieldSelector', '').split(',') if '=' in part)
+        with namespace.changed:
+            pod = namespace.pods.get(selector.get('involvedObject.name'))
+        self.send_json({
+            'kind': 'EventList',
+            'apiVersion': 'v1',
+            'metadata': {'resourceVersion': str(namespace.resource_version)},
+            'items': namespace.pod_events(pod) if pod else [],
+        })
+
+    def list_objects(self, query, namespace, names, kind, api_version, render):
+        """A list of names, full or as PartialObjectMetadataList if the Accept header asks for it."""
+        names, token = self.page(names, query)
+        metadata = {'resourceVersion': str(namespace.resource_version), **({'continue': token} if token else {})}
+        if 'as=PartialObjectMetadataList' in self.headers.get('Accept', ''):
+            self.send_json({
+                'kind': 'PartialObjectMetadataList',
+                'apiVersion': 'meta.k8s.io/v1',
+                'metadata': metadata,
+                'items': [{'kind': 'PartialObjectMetadata', 'apiVersion': 'meta.k8s.io/v1', 'metadata': namespace.object_metadata(name)} for name in names],
+            })
+        else:
+            self.send_json({'kind': f"{kind}List", 'apiVersion': api_version, 'metadata': metadata, 'items': [render(name) for name in names]})
+
+    def read_object(self, namespace, names, name, kind, render):
+        if name in names:
+            self.send_json(render(name))
+        else:
+            self.send_status(404, 'NotFound', f"{kind} \"{name}\" not found")
+
+    def handle_list_secrets(self, query, namespace):
+        self.list_objects(query, namespace, namespace.secrets, 'Secret', 'v1', namespace.secret_json)
+
+    def handle_read_secret(self, query, namespace, name):
+        self.read_object(namespace, namespace.secrets, name, 'secrets', namespace.secret_json)
+
+    def handle_list_deployments(self, query, namespace):
+        self.list_objects(query, namespace, namespace.deployments, 'Deployment', 'apps/v1', namespace.deployment_json)
+
+    def handle_read_deployment(self, query, namespace, name):
+        self.read_object(namespace, namespace.deployments, name, 'deployments.apps', namespace.deployment_json)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--profile', help="DummyProfile preset or JSON file (default: DUMMY_PROFILE or 'default')")
+    parser.add_argument('--kubeconfig', default='fake-kubeconfig.json')
+    args = parser.parse_args()
+
+    profile = DummyProfile.load(args.profile) if args.profile else DummyProfile.from_env()
+    server = FakeApiServer(profile, args.host, args.port).start()
+    path = server.write_kubeconfig(args.kubeconfig)
+    print(f"Serving fake Kubernetes API on {server.url}, run with KUBECONFIG={path}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,30 @@
+"""The kubernetes SDK, imported on first use.
+
+Importing kubernetes is a noticeable part of startup and nothing needs it
+before a cluster is merged, so the k8s modules reach it through this module:
+`kube.client`, `kube.config`, `kube.watch` and `kube.ApiException` import the
+SDK the first time one of them is accessed.
+"""
+import importlib
+import threading
+
+_ATTRIBUTES = {
+    'client': ('kubernetes.client', None),
+    'config': ('kubernetes.config', None),
+    'watch': ('kubernetes.watch', None),
+    'ApiException': ('kubernetes.client.rest', 'ApiException'),
+}
+_lock = threading.Lock()
+
+
+def __getattr__(name):
+    if name not in _ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attribute = _ATTRIBUTES[name]
+    with _lock:
+        value = importlib.import_module(module_name)
+        if attribute:
+            value = getattr(value, attribute)
+        globals()[name] = value  # Later lookups no longer reach __getattr__
+    return value
+
@@ -0,0 +1,138 @@
+import csv
+import json
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+BUCKET_GROWTH = 1.05  # Width of a histogram bucket relative to its lower bound; percentiles are within 5%
+LOG_GROWTH = math.log(BUCKET_GROWTH)
+
+
+class Histogram:
+    """Log-bucketed histogram: constant-time recording, bounded memory, approximate percentiles."""
+
+    def __init__(self, unit):
+        self.unit = unit
+        self.buckets = {}  # Bucket index -> count; bucket i holds values in [GROWTH**i, GROWTH**(i+1))
+        self.zeros = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def record(self, value):
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        if value <= 0:
+            self.zeros += 1
+            return
+        index = math.floor(math.log(value) / LOG_GROWTH)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def percentile(self, fraction):
+        """Approximate value below which fraction of the recorded values fall."""
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = self.zeros
+        if seen >= rank:
+            return 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(max(BUCKET_GROWTH ** (index + 0.5), self.min), self.max)  # Middle of the bucket
+        return self.max
+
+    def summary(self):
+        return {
+            'unit': self.unit,
+            'count': self.count,
+            'mean': self.total / self.count if self.count else None,
+            'min': self.min,
+            'p50': self.percentile(0.5),
+            'p95': self.percentile(0.95),
+            'p99': self.percentile(0.99),
+            'max': self.max,
+        }
+
+
+class Span:
+    """Times the stages of one operation, e.g. request, bytes received, parsed, applied.
+
+    Each mark(stage) records the time since the previous mark (or the start) in
+    the histogram "<operation>.<stage>"; size, if given, goes to "<operation>.bytes".
+    """
+
+    def __init__(self, metrics, operation):
+        self.metrics = metrics
+        self.operation = operation
+        self.start = self.last = time.perf_counter()
+
+    def mark(self, stage, size=None):
+        now = time.perf_counter()
+        self.metrics.record(f"{self.operation}.{stage}", now - self.last)
+        if size is not None:
+            self.metrics.record(f"{self.operation}.bytes", size, unit='bytes')
+        self.last = now
+
+    def end(self, stage='total'):
+        """Record the whole duration of the operation."""
+        self.metrics.record(f"{self.operation}.{stage}", time.perf_counter() - self.start)
+
+
+class Metrics:
+    """In-memory histograms of durations and sizes, safe to record from any thread.
+
+    Recording only updates a histogram; nothing is logged, so it can sit on hot
+    paths. Durations are in seconds, sizes in bytes.
+    """
+
+    def __init__(self):
+        self.histograms = {}
+        self.lock = threading.Lock()
+
+    def record(self, name, value, unit='seconds'):
+        with self.lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram(unit)
+            histogram.record(value)
+
+    def span(self, operation):
+        return Span(self, operation)
+
+    @contextmanager
+    def timer(self, name):
+        """Record how long the with block takes under name."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def summaries(self):
+        """{name: summary} of every histogram, sorted by name."""
+        with self.lock:
+            return {name: self.histograms[name].summary() for name in sorted(self.histograms)}
+
+    def reset(self):
+        with self.lock:
+            self.histograms = {}
+
+    def export(self, path):
+        """Write the summaries to path, as CSV if it ends in .csv and as JSON otherwise."""
+        summaries = self.summaries()
+        if path.endswith('.csv'):
+            fields = ['unit', 'count', 'mean', 'min', 'p50', 'p95', 'p99', 'max']
+            with open(path, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(['name'] + fields)
+                for name, summary in summaries.items():
+                    writer.writerow([name] + [summary[field] for field in fields])
+        else:
+            with open(path, 'w') as f:
+                json.dump({'exported': time.strftime('%Y-%m-%dT%H:%M:%S%z'), 'metrics': summaries}, f, indent=2)
+        return path
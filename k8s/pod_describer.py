@@ -0,0 +1,236 @@
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from k8s import kube
+
+VOLUME_SOURCE_DETAILS = {  # Volume source attribute -> fields worth showing
+    'config_map': ('name', 'optional'),
+    'secret': ('secret_name', 'optional'),
+    'persistent_volume_claim': ('claim_name', 'read_only'),
+    'empty_dir': ('medium', 'size_limit'),
+    'host_path': ('path', 'type'),
+    'projected': ('default_mode',),
+    'downward_api': ('default_mode',),
+    'csi': ('driver', 'read_only'),
+    'azure_file': ('share_name', 'secret_name'),
+    'azure_disk': ('disk_name', 'disk_uri'),
+    'nfs': ('server', 'path'),
+}
+
+
+def short_age(timestamp, now):
+    """Age of a timestamp in kubectl's style (45s, 12m, 3h, 5d)."""
+    if timestamp is None:
+        return '<unknown>'
+    seconds = int((now - timestamp.replace(tzinfo=timezone.utc)).total_seconds())
+    for unit, size in (('d', 86400), ('h', 3600), ('m', 60)):
+        if seconds >= size:
+            return f"{seconds // size}{unit}"
+    return f"{max(seconds, 0)}s"
+
+
+class PodDescriber:
+    """Renders pods like `kubectl describe pod`, including their events.
+
+    The pod and its events are fetched concurrently, so a describe costs a single
+    round trip. The rendered pod is cached per (uid, resourceVersion): when the
+    caller already knows the pod's current version, e.g. from a fresh listing,
+    an unchanged pod is not read again. New events do not change the pod's
+    version, so events are always fetched.
+    """
+    MAX_ENTRIES = 128
+
+    def __init__(self, max_workers=2):
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='describe')
+        self.rendered = OrderedDict()  # (uid, resource_version) -> rendered pod, without events
+        self.lock = threading.Lock()
+
+    def cached(self, version):
+        """Rendered pod of a (uid, resource_version), or None."""
+        with self.lock:
+            output = self.rendered.get(version)
+            if output is not None:
+                self.rendered.move_to_end(version)
+            return output
+
+    def describe(self, core_v1, name, namespace, version=None):
+        """Return the description of a pod; version is its (uid, resource_version) if known."""
+        events = self.pool.submit(self.list_events, core_v1, name, namespace)
+        output = self.cached(version) if version is not None else None
+        if output is None:
+            pod = core_v1.read_namespaced_pod(name=name, namespace=namespace)
+            version = (pod.metadata.uid, pod.metadata.resource_version)
+            output = self.cached(version)
+            if output is None:
+                output = self.render_pod(pod)
+                with self.lock:
+                    self.rendered[version] = output
+                    while len(self.rendered) > self.MAX_ENTRIES:
+                        self.rendered.popitem(last=False)
+        try:
+            pod_events = events.result()
+        except kube.ApiException as e:
+            pod_events = f"<unable to list events: {e.reason} ({e.status})>"
+        except Exception as e:
+            pod_events = f"<unable to list events: {str(e)}>"
+        lines = [output]
+        self.render_events(lines, pod_events, datetime.now(timezone.utc))
+        return "\n".join(lines)
+
+    def list_events(self, core_v1, name, namespace):
+        """Events of a pod, oldest first."""
+        events = core_v1.list_namespaced_event(
+            namespace,
+            field_selector=f"involvedObject.kind=Pod,involvedObject.name={name},involvedObject.namespace={namespace}",
+        ).items
+        return sorted(events, key=self.event_time)
+
+    def event_time(self, event):
+        timestamp = event.last_timestamp or event.event_time or event.first_timestamp or event.metadata.creation_timestamp
+        return timestamp.replace(tzinfo=timezone.utc) if timestamp else datetime.min.replace(tzinfo=timezone.utc)
+
+    def render_pod(self, pod):
+        """Render a pod without its events."""
+        metadata, spec, status = pod.metadata, pod.spec, pod.status
+        lines = []
+        lines.append(f"Name:         {metadata.name}")
+        lines.append(f"Namespace:    {metadata.namespace}")
+        lines.append(f"Priority:     {spec.priority or 0}")
+        if spec.node_name:
+            lines.append(f"Node:         {spec.node_name}/{status.host_ip or 'N/A'}")
+        lines.append(f"Start Time:   {status.start_time or metadata.creation_timestamp}")
+        lines.append(f"Labels:       {json.dumps(metadata.labels) if metadata.labels else '<none>'}")
+        lines.append(f"Annotations:  {json.dumps(metadata.annotations) if metadata.annotations else '<none>'}")
+        lines.append(f"Status:       {'Terminating' if metadata.deletion_timestamp else status.phase}")
+        if status.reason:
+            lines.append(f"Reason:       {status.reason}")
+        lines.append(f"IP:           {status.pod_ip or '<none>'}")
+        lines.append("IPs:")
+        pod_ips = [pod_ip.ip for pod_ip in status.pod_i_ps or []] or ([status.pod_ip] if status.pod_ip else [])
+        lines.extend(f"  IP:  {pod_ip}" for pod_ip in pod_ips)
+        if metadata.owner_references:
+            owner = metadata.owner_references[0]
+            lines.append(f"Controlled By:  {owner.kind}/{owner.name}")
+
+        if spec.init_containers:
+            lines.append("Init Containers:")
+            self.render_containers(lines, spec.init_containers, status.init_container_statuses)
+        lines.append("Containers:")
+        self.render_containers(lines, spec.containers, status.container_statuses)
+
+        lines.append("Conditions:")
+        lines.append("  Type              Status")
+        for cond in status.conditions or []:
+            lines.append(f"  {cond.type:<18}{cond.status}")
+
+        lines.append("Volumes:")
+        for vol in spec.volumes or []:
+            lines.append(f"  {vol.name}:")
+            self.render_volume(lines, vol)
+        if not spec.volumes:
+            lines.append("  <none>")
+
+        lines.append(f"QoS Class:       {status.qos_class or '<none>'}")
+        node_selector = ", ".join(f"{key}={value}" for key, value in (spec.node_selector or {}).items())
+        lines.append(f"Node-Selectors:  {node_selector or '<none>'}")
+        tolerations = [self.format_toleration(toleration) for toleration in spec.tolerations or []]
+        lines.append(f"Tolerations:     {tolerations[0] if tolerations else '<none>'}")
+        lines.extend(f"                 {toleration}" for toleration in tolerations[1:])
+        return "\n".join(lines)
+
+    def render_containers(self, lines, containers, container_statuses):
+        """Render each container with its own status, matched by name."""
+        statuses = {container_status.name: container_status for container_status in container_statuses or []}
+        for container in containers:
+            container_status = statuses.get(container.name)
+            lines.append(f"  {container.name}:")
+            lines.append(f"    Container ID:   {container_status.container_id if container_status and container_status.container_id else '<none>'}")
+            lines.append(f"    Image:          {container.image}")
+            if container_status and container_status.image_id:
+                lines.append(f"    Image ID:       {container_status.image_id}")
+            ports = ", ".join(f"{port.container_port}/{port.protocol}" for port in container.ports or [])
+            lines.append(f"    Port:           {ports or '<none>'}")
+            if container_status:
+                self.render_state(lines, "State", container_status.state)
+                if container_status.last_state and (container_status.last_state.terminated or container_status.last_state.waiting):
+                    self.render_state(lines, "Last State", container_status.last_state)
+            lines.append(f"    Ready:          {container_status.ready if container_status else False}")
+            lines.append(f"    Restart Count:  {container_status.restart_count if container_status else 0}")
+            resources = container.resources
+            for title, values in (("Limits", resources.limits if resources else None), ("Requests", resources.requests if resources else None)):
+                if values:
+                    lines.append(f"    {title}:")
+                    lines.extend(f"      {key}:  {value}" for key, value in values.items())
+            env = container.env or []
+            lines.append(f"    Environment:    {'<none>' if not env else ''}")
+            for var in env:
+                lines.append(f"      {var.name}:  {var.value if var.value is not None else '<set from source>'}")
+            lines.append("    Mounts:")
+            for volume_mount in container.volume_mounts or []:
+                lines.append(f"      {volume_mount.mount_path} from {volume_mount.name} ({'ro' if volume_mount.read_only else 'rw'})")
+            if not container.volume_mounts:
+                lines.append("      <none>")
+
+    def render_state(self, lines, title, state):
+        label = f"    {title}:".ljust(20)
+        if state is None:
+            lines.append(f"{label}<unknown>")
+        elif state.running:
+            lines.append(f"{label}Running")
+            lines.append(f"      Started:      {state.running.started_at}")
+        elif state.waiting:
+            lines.append(f"{label}Waiting")
+            lines.append(f"      Reason:       {state.waiting.reason}")
+        elif state.terminated:
+            lines.append(f"{label}Terminated")
+            lines.append(f"      Reason:       {state.terminated.reason}")
+            lines.append(f"      Exit Code:    {state.terminated.exit_code}")
+            lines.append(f"      Started:      {state.terminated.started_at}")
+            lines.append(f"      Finished:     {state.terminated.finished_at}")
+
+    def render_volume(self, lines, vol):
+        """Render the volume source that is set, with its interesting fields."""
+        for attribute in vol.attribute_map:
+            source = getattr(vol, attribute) if attribute != 'name' else None
+            if source is None:
+                continue
+            lines.append(f"    Type:       {type(source).__name__.replace('V1', '').replace('VolumeSource', '')}")
+            for field in VOLUME_SOURCE_DETAILS.get(attribute, ()):
+                value = getattr(source, field, None)
+                if value is not None:
+                    lines.append(f"    {field.replace('_', ' ').title().replace(' ', '')}:  {value}")
+            return
+        lines.append("    Type:       <unknown>")
+
+    def format_toleration(self, toleration):
+        text = toleration.key or ''
+        if toleration.value:
+            text += f"={toleration.value}"
+        if toleration.effect:
+            text += f":{toleration.effect}"
+        if toleration.operator == 'Exists' and not toleration.value:
+            text += " op=Exists"
+        if toleration.toleration_seconds is not None:
+            text += f" for {toleration.toleration_seconds}s"
+        return text
+
+    def render_events(self, lines, events, now):
+        if isinstance(events, str):
+            lines.append(f"Events:  {events}")
+            return
+        if not events:
+            lines.append("Events:  <none>")
+            return
+        rows = [("Type", "Reason", "Age", "From", "Message"), ("----", "------", "----", "----", "-------")]
+        for event in events:
+            age = short_age(self.event_time(event), now)
+            if (event.count or 0) > 1 and event.first_timestamp:
+                age = f"{age} (x{event.count} over {short_age(event.first_timestamp, now)})"
+            source = event.source.component if event.source and event.source.component else (event.reporting_component or '')
+            rows.append((event.type or '', event.reason or '', age, source, (event.message or '').strip()))
+        widths = [max(len(row[column]) for row in rows) for column in range(4)]
+        lines.append("Events:")
+        for row in rows:
+            lines.append("  " + "  ".join(value.ljust(width) for value, width in zip(row[:4], widths)) + "  " + row[4])
@@ -0,0 +1,60 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class ResponseCache:
+    """Size-bounded LRU cache of list responses with per-kind TTLs.
+
+    Keys are (context, namespace, kind) tuples. An entry younger than its kind's
+    TTL is fresh; an older one is stale but can still be served while a refresh
+    runs (stale-while-revalidate) until it is max_stale seconds old, after which
+    it counts as a miss. The least recently used entry is evicted once more than
+    max_entries are held.
+    """
+    DEFAULT_TTL = 30
+
+    def __init__(self, ttls=None, max_entries=64, max_stale=600):
+        self.ttls = ttls or {}
+        self.max_entries = max_entries
+        self.max_stale = max_stale
+        self.entries = OrderedDict()  # key -> (stored_at, value)
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Return (value, fresh) for key, or (None, False) on a miss."""
+        with self.lock:
+            entry = self.entries.get(key)
+            age = time.monotonic() - entry[0] if entry else None
+            if entry is None or age > self.max_stale:
+                self.entries.pop(key, None)
+                self.misses += 1
+                return None, False
+            self.entries.move_to_end(key)
+            fresh = age <= self.ttls.get(key[-1], self.DEFAULT_TTL)
+            if fresh:
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+            return entry[1], fresh
+
+    def put(self, key, value):
+        with self.lock:
+            self.entries[key] = (time.monotonic(), value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, key=None):
+        """Drop one entry, or everything when key is None."""
+        with self.lock:
+            if key is None:
+                self.entries.clear()
+            else:
+                self.entries.pop(key, None)
+
+    def stats(self):
+        return {'hits': self.hits, 'stale_hits': self.stale_hits, 'misses': self.misses, 'entries': len(self.entries)}
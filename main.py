@@ -1,3 +1,10 @@
+import os
+if os.environ.get('PROFILE_STARTUP'):  # Print time to first frame with per-module import times
+    from ui.startup_profiler import StartupProfiler
+    startup_profiler = StartupProfiler()
+    startup_profiler.install()
+else:
+    startup_profiler = None
 from kivymd.app import MDApp
 from kivy.uix.boxlayout import BoxLayout
 from kivymd.uix.tab import MDTabs
@@ -7,17 +14,23 @@ from data.DATA import *
 from ui.popup import PopupManager
 from ui.tabs.deployments_tab import DeploymentsTab
 from ui.tabs.merge_tab import MergeTab
+from ui.tabs.metrics_tab import MetricsTab
 from ui.tabs.pods_tab import PodsTab
 from ui.tabs.secrets_tab import SecretsTab
 from kivy.core.window import Window
+from kivy.clock import Clock
 from ui.cache import CacheManager
+from ui.snapshot_store import SnapshotStore
+from k8s.discovery import AzCliSource, Discovery, Inventory, StaticSource
 
 # Toggle between real and dummy AzureClient (set USE_DUMMY=True for testing)
 USE_DUMMY = True
 if USE_DUMMY:
     from k8s.dummy_azure_client import DummyAzureClient as AzureClient
 else:
-    from k8s.azure_client import AzureClient
+    from k8s.azure_client import AzureClient  # Imports the kubernetes SDK only once it is used
+if startup_profiler:
+    startup_profiler.mark('imports')
 
 class KubernetesInterface(BoxLayout):
     SPINNER_WIDTH = 0.8
@@ -32,13 +45,26 @@ class KubernetesInterface(BoxLayout):
         self.last_selection = (None, None, None)
         self.progress_update_interval = 0.5
         self.cache_manager = CacheManager()
+        self.snapshot_store = SnapshotStore()
+        self.discovery = Discovery(StaticSource(SUBSCRIPTIONS) if USE_DUMMY else AzCliSource(), CacheManager("./discovery.json"))
+        self.discovery.bind(on_discovery=self.on_discovery)
+        subscriptions, fresh = self.discovery.cached()
+        if subscriptions is None and USE_DUMMY:
+            subscriptions = SUBSCRIPTIONS  # The stand-in's data is at hand; no need to wait for it
+        self.inventory = self.make_inventory(subscriptions or [])
+        if not fresh:
+            self.discovery.refresh()
         self.merge_successful = False
         self.merge_popup_manager = None
         self.azure_client.bind(on_merge_output=self.on_merge_output)
+        self.azure_client.bind(on_namespaces=self.on_namespaces)
+        self.azure_client.bind(on_namespace_events=self.on_namespace_events)
         self.setup_ui()
 
     def setup_ui(self):
         self.ribbon = Ribbon(size_hint_y=self.RIBBON_HEIGHT, spinner_width=self.SPINNER_WIDTH, button_width=self.BUTTON_WIDTH)
+        self.ribbon.region_spinner.values = self.inventory.regions
+        self.ribbon.environment_spinner.values = self.inventory.environments
         self.add_widget(self.ribbon)
         
         # Bind spinners to callbacks
@@ -62,13 +88,16 @@ class KubernetesInterface(BoxLayout):
 
         # Tabs
         self.merge_tab       = MergeTab()
-        self.pods_tab        = PodsTab(azure_client=self.azure_client, namespace_spinner=self.ribbon.namespace_spinner)
-        self.secrets_tab     = SecretsTab(azure_client=self.azure_client, namespace_spinner=self.ribbon.namespace_spinner)
-        self.deployments_tab = DeploymentsTab(azure_client=self.azure_client, namespace_spinner=self.ribbon.namespace_spinner)
+        self.pods_tab        = PodsTab(azure_client=self.azure_client, namespace_spinner=self.ribbon.namespace_spinner, clusters_provider=self.fan_out_clusters, snapshot_store=self.snapshot_store)
+        self.secrets_tab     = SecretsTab(azure_client=self.azure_client, namespace_spinner=self.ribbon.namespace_spinner, snapshot_store=self.snapshot_store)
+        self.deployments_tab = DeploymentsTab(azure_client=self.azure_client, namespace_spinner=self.ribbon.namespace_spinner, snapshot_store=self.snapshot_store)
+        self.metrics_tab     = MetricsTab(metrics=self.azure_client.metrics)
         self.tab_panel.add_widget(self.merge_tab)
         self.tab_panel.add_widget(self.pods_tab)
         self.tab_panel.add_widget(self.secrets_tab)
         self.tab_panel.add_widget(self.deployments_tab)
+        self.tab_panel.add_widget(self.metrics_tab)
+        self.tab_panel.bind(on_tab_switch=self.on_tab_switch)
         self.add_widget(self.tab_panel)
 
         # Merge success tracking
@@ -78,6 +107,42 @@ class KubernetesInterface(BoxLayout):
         self.last_merged_cluster = None
 
         self.load_cached_selections()
+        Window.bind(on_flip=self.record_frame)
+
+    def record_frame(self, window):
+        """Record the work of every drawn frame for the Metrics tab.
+
+        A frame starts at the clock tick that ends the wait for it, so the time
+        since then is its callbacks, input, layout and drawing, not the interval.
+        """
+        self.azure_client.metrics.record('frame', Clock.time() - Clock.get_time())
+
+    def make_inventory(self, subscriptions):
+        return Inventory(subscriptions, NAMESPACES, region_order=REGIONS, environment_order=ENVIRONMENTS)
+
+    def on_discovery(self, instance, subscriptions, errors):
+        """Switch to freshly discovered subscriptions and clusters, keeping the current selections."""
+        if errors:
+            self.merge_tab.merge_output_text.text = "Subscription discovery failed for:\n" + "\n".join(errors)
+        if subscriptions is None:
+            return
+        self.inventory = self.make_inventory(subscriptions)
+        self.ribbon.region_spinner.values = self.inventory.regions
+        self.ribbon.environment_spinner.values = self.inventory.environments
+        cached_cluster = self.cache_manager.get('cluster', {}).get('value')
+        if self.ribbon.cluster_spinner.text == DEFAULT_TEXT_CLUSTER_DROPDOWN and cached_cluster in self.inventory.clusters:
+            self.load_cached_selections()  # The cached cluster was unknown until now
+            return
+        region = self.ribbon.region_spinner.text
+        environment = self.ribbon.environment_spinner.text
+        self.ribbon.subscription_spinner.values = [sub.name for sub in self.inventory.subscriptions_in(region, environment)]
+        if self.selected_subscription:
+            self.selected_subscription = self.inventory.subscription(self.selected_subscription.name) or self.selected_subscription
+
+    def on_tab_switch(self, tabs, tab, tab_label, tab_text):
+        """Build lazily created tabs on first activation."""
+        if hasattr(tab, 'build_content'):
+            tab.build_content()
 
     def region_spinner_selection_callback(self, spinner, text):
         """Update the subscription spinner based on selected region."""
@@ -92,11 +157,7 @@ class KubernetesInterface(BoxLayout):
         region_selected = self.ribbon.region_spinner.text
         environment_selected = self.ribbon.environment_spinner.text
         if region_selected != DEFAULT_TEXT_REGION_DROPDOWN and environment_selected != DEFAULT_TEXT_ENVIRONMENT_DROPDOWN:
-            # Filter subscriptions based on selected region and environment
-            filtered_subscriptions = [
-                sub for sub in SUBSCRIPTIONS
-                if sub.region == region_selected and sub.environment == environment_selected
-            ]
+            filtered_subscriptions = self.inventory.subscriptions_in(region_selected, environment_selected)
             self.ribbon.subscription_spinner.values = [sub.name for sub in filtered_subscriptions]
             self.ribbon.subscription_spinner.text = DEFAULT_TEXT_SUBSCRIPTION_DROPDOWN  # Reset to default
 
@@ -106,24 +167,58 @@ class KubernetesInterface(BoxLayout):
             self.ribbon.resource_group_spinner.text = DEFAULT_TEXT_RESOURCE_GROUP_DROPDOWN
             self.ribbon.cluster_spinner.text = DEFAULT_TEXT_CLUSTER_DROPDOWN
 
+    def fan_out_clusters(self):
+        """Return (resource_group, cluster) of every cluster in the selected region and environment."""
+        return self.inventory.clusters_in(self.ribbon.region_spinner.text, self.ribbon.environment_spinner.text)
+
     def update_namespace_spinner(self):
-        """Update the namespace spinner based on the selected environment."""
+        """Update the namespace spinner with the selected cluster's namespaces, as last seen.
+
+        A cluster never merged falls back to the namespaces of the selected environment;
+        one whose namespaces are stale shows them while they are listed again.
+        """
         environment_selected = self.ribbon.environment_spinner.text
-        current_namespace = self.ribbon.namespace_spinner.text
         if environment_selected == DEFAULT_TEXT_ENVIRONMENT_DROPDOWN:
-            self.ribbon.namespace_spinner.values = []
+            self.set_namespace_values([])
+            return
+        cluster_namespaces = None
+        cluster = self.ribbon.cluster_spinner.text
+        if cluster != DEFAULT_TEXT_CLUSTER_DROPDOWN:
+            cluster_namespaces, fresh = self.discovery.namespaces(cluster)
+            if cluster_namespaces is not None and not fresh:
+                self.azure_client.get_namespaces(cluster)
+        self.set_namespace_values(cluster_namespaces or self.inventory.namespaces_in(environment_selected))
+
+    def set_namespace_values(self, namespaces):
+        """Set the namespace spinner's values, keeping the selected namespace if it is still there."""
+        self.ribbon.namespace_spinner.values = namespaces
+        if self.ribbon.namespace_spinner.text not in namespaces:
             self.ribbon.namespace_spinner.text = DEFAULT_TEXT_NAMESPACE_DROPDOWN
-        else:
-            filtered_namespaces = [ns.name for ns in NAMESPACES if ns.environment == environment_selected]
-            self.ribbon.namespace_spinner.values = filtered_namespaces
-            if current_namespace in filtered_namespaces:
-                self.ribbon.namespace_spinner.text = current_namespace
-            else:
-                self.ribbon.namespace_spinner.text = DEFAULT_TEXT_NAMESPACE_DROPDOWN
+
+    def on_namespaces(self, instance, context, namespaces):
+        """Show the namespaces the merged cluster reported, and remember them for the next visit."""
+        if isinstance(namespaces, str):
+            self.merge_tab.merge_output_text.text = namespaces
+            return
+        self.discovery.put_namespaces(context, namespaces)
+        if context == self.ribbon.cluster_spinner.text:
+            self.update_namespace_spinner()
+
+    def on_namespace_events(self, instance, context, events):
+        """Add and remove the namespaces the merged cluster's watch reported."""
+        namespaces = set(self.discovery.namespaces(context)[0] or [])
+        for event_type, name in events:
+            if event_type == 'ADDED':
+                namespaces.add(name)
+            elif event_type == 'DELETED':
+                namespaces.discard(name)
+        self.discovery.put_namespaces(context, namespaces)
+        if context == self.ribbon.cluster_spinner.text:
+            self.update_namespace_spinner()
 
     def subscription_spinner_selection_callback(self, spinner, text):
         """Update the resource group spinner based on the selected subscription."""
-        self.selected_subscription = next((sub for sub in SUBSCRIPTIONS if sub.name == text), None)
+        self.selected_subscription = self.inventory.subscription(text)
         if self.selected_subscription:
             self.ribbon.resource_group_spinner.values = list(self.selected_subscription.resource_groups.keys())
             self.ribbon.resource_group_spinner.text = DEFAULT_TEXT_RESOURCE_GROUP_DROPDOWN
@@ -141,19 +236,50 @@ class KubernetesInterface(BoxLayout):
         self.check_command_buttons_state()
 
     def cluster_spinner_selection_callback(self, spinner, text):
-        """Reset the merge state when the cluster selection changes."""
+        """Reset the merge state and show the cluster's known namespaces when the cluster selection changes."""
         self.reset_merge_state()
+        self.update_namespace_spinner()
         self.check_merge_button_state()
         self.check_command_buttons_state()
+        self.show_snapshots()
 
     def namespace_spinner_selection_callback(self, spinner, text):
-        """Reset the merge state when the namespace selection changes."""
+        """Show the namespace's snapshots and refresh them if the cluster is merged."""
         self.check_merge_button_state()
         self.check_command_buttons_state()
+        if text != DEFAULT_TEXT_NAMESPACE_DROPDOWN:
+            self.cache_manager.save_selections({'namespace': text})
+            self.show_snapshots()
+            self.refresh_snapshots()
+
+    def show_snapshots(self):
+        """Show the last fetched data of the selected cluster and namespace, marked stale."""
+        cluster = self.ribbon.cluster_spinner.text
+        namespace = self.ribbon.namespace_spinner.text
+        if cluster == DEFAULT_TEXT_CLUSTER_DROPDOWN or namespace == DEFAULT_TEXT_NAMESPACE_DROPDOWN:
+            return
+        for tab in (self.pods_tab, self.secrets_tab, self.deployments_tab):
+            tab.show_snapshot(cluster, namespace)
+
+    def refresh_snapshots(self):
+        """Fetch the data of stale snapshots again in the background, once the cluster is merged."""
+        if not self.cluster_merged():
+            return
+        for tab in (self.pods_tab, self.secrets_tab, self.deployments_tab):
+            tab.refresh_snapshot()
+
+    def cluster_merged(self):
+        """Whether the cluster selected in the spinners is the one the last successful merge made current.
+
+        Only then do commands, and the snapshots shown for the selection, reach the same cluster.
+        """
+        selection = (self.ribbon.subscription_spinner.text, self.ribbon.resource_group_spinner.text, self.ribbon.cluster_spinner.text)
+        return self.merge_successful and selection == (self.last_merged_subscription, self.last_merged_resource_group, self.last_merged_cluster)
 
     def reset_merge_state(self):
         """Reset the merge_successful state if any dropdown selection changes."""
         self.merge_successful = False
+        self.azure_client.stop_watch_namespaces()
 
     def check_merge_button_state(self, *args):
         """Enable the Merge button if all required selections are made."""
@@ -175,11 +301,17 @@ class KubernetesInterface(BoxLayout):
 
     def merge_button_callback(self, instance):
         """Execute the merge command using AzureClient."""
+        self.merge_cluster()
+
+    def merge_cluster(self, refresh_credentials=True):
+        """Make the selected cluster current; az only runs if refresh_credentials is set and needed."""
         subscription = self.ribbon.subscription_spinner.text
         resource_group = self.ribbon.resource_group_spinner.text
         cluster = self.ribbon.cluster_spinner.text
-        self.merge_popup_manager = PopupManager("Executing", "Merging cluster...")
-        self.azure_client.execute_merge(subscription, resource_group, cluster)
+        if self.merge_popup_manager:
+            self.merge_popup_manager.dismiss()
+        self.merge_popup_manager = PopupManager("Executing", "Merging cluster..." if refresh_credentials else "Checking cluster credentials...")
+        self.azure_client.execute_merge(subscription, resource_group, cluster, refresh_credentials=refresh_credentials)
         self.last_merged_subscription = subscription
         self.last_merged_resource_group = resource_group
         self.last_merged_cluster = cluster
@@ -193,9 +325,11 @@ class KubernetesInterface(BoxLayout):
         """Output the command result to the text box."""
         self.merge_tab.merge_output_text.text = output
         self.merge_successful = success
-        self.merge_popup_manager.dismiss()
+        if self.merge_popup_manager:
+            self.merge_popup_manager.dismiss()
         if success:
-            self.azure_client.safe_load_kube_config()
+            self.azure_client.safe_load_kube_config(self.last_merged_cluster)
+            self.azure_client.watch_namespaces()
             selections = {
                 'region': self.ribbon.region_spinner.text,
                 'environment': self.ribbon.environment_spinner.text,
@@ -205,15 +339,17 @@ class KubernetesInterface(BoxLayout):
             }
             self.cache_manager.save_selections(selections)
         self.check_command_buttons_state()
+        self.show_snapshots()  # The merged cluster may not be the one whose snapshots are shown
+        self.refresh_snapshots()
 
     def check_command_buttons_state(self):
-        """Enable/disable command buttons if namespace is selected and merge was successful."""
+        """Enable/disable command buttons if namespace is selected and the selected cluster is merged."""
         namespace_selected = self.ribbon.namespace_spinner.text != DEFAULT_TEXT_NAMESPACE_DROPDOWN
-        buttons_enabled = namespace_selected and self.merge_successful
-        self.pods_tab.get_pods_button.disabled = not buttons_enabled
-        self.secrets_tab.get_secrets_button.disabled = not buttons_enabled
-        self.deployments_tab.get_deployments_button.disabled = not buttons_enabled
-        self.pods_tab.check_get_logs_button_state()
+        buttons_enabled = namespace_selected and self.cluster_merged()
+        self.pods_tab.set_commands_enabled(buttons_enabled)
+        self.pods_tab.fan_out_button.disabled = not namespace_selected  # Needs no merged cluster
+        self.secrets_tab.set_commands_enabled(buttons_enabled)
+        self.deployments_tab.set_commands_enabled(buttons_enabled)
     
     def load_cached_selections(self):
         """Load cached selections, set spinners, and update dependent spinners."""
@@ -225,20 +361,12 @@ class KubernetesInterface(BoxLayout):
             'cluster': DEFAULT_TEXT_CLUSTER_DROPDOWN
         }
 
-        # Populate valid resource groups and clusters from SUBSCRIPTIONS
-        resource_groups = set()
-        clusters = set()
-        for sub in SUBSCRIPTIONS:
-            for rg, cluster_list in sub.resource_groups.items():
-                resource_groups.add(rg)
-                clusters.update(cluster_list)
-
         valid_options = {
-            'region': REGIONS,
-            'environment': ENVIRONMENTS,
-            'subscription': [sub.name for sub in SUBSCRIPTIONS],
-            'resource_group': list(resource_groups),
-            'cluster': list(clusters)
+            'region': self.inventory.regions,
+            'environment': self.inventory.environments,
+            'subscription': self.inventory.by_name,
+            'resource_group': self.inventory.resource_groups,
+            'cluster': self.inventory.clusters
         }
 
         # Load cached selections
@@ -255,15 +383,38 @@ class KubernetesInterface(BoxLayout):
         self.resource_group_spinner_selection_callback(self.ribbon.resource_group_spinner, cached_selections['resource_group'])
         self.ribbon.cluster_spinner.text = cached_selections['cluster']
         self.cluster_spinner_selection_callback(self.ribbon.cluster_spinner, cached_selections['cluster'])
+        cached_namespace = self.cache_manager.get('namespace', {}).get('value')  # Validated against the cluster's namespaces
+        if cached_namespace in self.ribbon.namespace_spinner.values:
+            self.ribbon.namespace_spinner.text = cached_namespace  # Shows its snapshots at once
 
         self.check_merge_button_state()
+        if not self.ribbon.merge_button.disabled:
+            self.merge_cluster(refresh_credentials=False)  # Reuse the cached cluster's kubeconfig context
 
 
 class KubernetesApp(MDApp):
     def build(self):
         self.theme_cls.primary_palette = "Blue"  # Minimal theme for MDDataTable
         self.theme_cls.theme_style = "Light"  # Default to light theme
-        return KubernetesInterface()
+        root = KubernetesInterface()
+        if startup_profiler:
+            startup_profiler.mark('build')
+        return root
+
+    def on_stop(self):
+        self.root.cache_manager.close()
+        self.root.snapshot_store.close()
+        self.root.discovery.cache.close()
+
+    def on_start(self):
+        if startup_profiler:
+            Window.bind(on_flip=self.on_first_frame)
+
+    def on_first_frame(self, window):
+        Window.unbind(on_flip=self.on_first_frame)
+        startup_profiler.mark('first frame')
+        startup_profiler.uninstall()
+        print(startup_profiler.report())
 
 if __name__ == '__main__':
     KubernetesApp().run()
\ No newline at end of file
@@ -0,0 +1,25 @@
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+os.environ.setdefault('KIVY_LOG_MODE', 'PYTHON')
+if not os.environ.get('DISPLAY'):
+    os.environ.setdefault('SDL_VIDEODRIVER', 'offscreen')
+
+
+@pytest.fixture
+def run_until():
+    """Run Kivy clock frames until done() is true or timeout seconds have passed; returns done()."""
+    from kivy.clock import Clock
+
+    def run(done, timeout=5):
+        deadline = time.monotonic() + timeout
+        while not done() and time.monotonic() < deadline:
+            Clock.tick()
+            time.sleep(0.005)
+        return done()
+    return run
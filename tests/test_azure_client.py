@@ -0,0 +1,184 @@
+import subprocess
+
+import pytest
+
+from k8s import fake_api_server
+from k8s.azure_client import AzureClient
+from k8s.dummy_profile import DummyProfile
+from k8s.fake_api_server import FakeApiServer, FakeNamespace
+
+CLUSTERS = [('rg-a', 'aks-a'), ('rg-b', 'aks-b')]
+
+
+@pytest.fixture
+def server():
+    profile = DummyProfile(pod_count=25, latency_median=0.001, latency_sigma=0, churn_interval=3600,
+                           log_lines=20, log_rate=50, secret_count=4, deployment_count=3)
+    server = FakeApiServer(profile).start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def client(server, tmp_path):
+    client = AzureClient(config_file=server.write_kubeconfig(str(tmp_path / 'kubeconfig'), CLUSTERS))
+    client.pod_page_size = 10
+    client.safe_load_kube_config('aks-a')
+    yield client
+    client.stop_watch_pods()
+    client.stop_follow_logs()
+    client.executor.shutdown()
+
+
+def record(client, *events):
+    """Lists collecting the arguments of each event, in order."""
+    received = {event: [] for event in events}
+    for event in events:
+        client.bind(**{event: lambda instance, *args, event=event: received[event].append(args)})
+    return received
+
+
+@pytest.fixture
+def no_az(monkeypatch):
+    def popen(*args, **kwargs):
+        raise AssertionError(f"az was run: {args[0]}")
+    monkeypatch.setattr(subprocess, 'Popen', popen)
+
+
+def test_merge_uses_a_verified_context_without_running_az(client, no_az, run_until):
+    received = record(client, 'on_merge_output')
+    client.execute_merge('sub', 'rg-b', 'aks-b')
+    assert run_until(lambda: received['on_merge_output'])
+    output, success = received['on_merge_output'][0]
+    assert success and 'verified with /version' in output
+
+
+def test_merge_rejects_a_context_of_another_resource_group(client, no_az, run_until):
+    received = record(client, 'on_merge_output')
+    client.execute_merge('sub', 'rg-a', 'aks-b', refresh_credentials=False)
+    assert run_until(lambda: received['on_merge_output'])
+    output, success = received['on_merge_output'][0]
+    assert not success and 'does not belong to resource group rg-a' in output
+
+
+def test_a_merged_cluster_is_verified_again_through_its_pooled_client(client, no_az, run_until):
+    received = record(client, 'on_merge_output')
+    client.execute_merge('sub', 'rg-b', 'aks-b')
+    assert run_until(lambda: received['on_merge_output'])
+    pooled = client.client_pool.get('aks-b')
+    client.execute_merge('sub', 'rg-b', 'aks-b')
+    assert run_until(lambda: len(received['on_merge_output']) == 2)
+    assert received['on_merge_output'][1][1] is True
+    assert client.client_pool.get('aks-b') is pooled
+
+
+def test_pods_are_listed_in_pages_with_limit_and_continue(client, server, run_until):
+    received = record(client, 'on_pods_page', 'on_pods_complete')
+    client.get_pods('default')
+    assert run_until(lambda: received['on_pods_complete'])
+    assert [page_index for pods, page_index in received['on_pods_page']] == [0, 1, 2]
+    names = [pod["name"] for pods, page_index in received['on_pods_page'] for pod in pods]
+    assert names == server.namespace('aks-a', 'default').names
+    assert received['on_pods_complete'] == [(25,)]
+
+
+def test_a_superseded_list_dispatches_nothing(client, run_until):
+    received = record(client, 'on_pods_page', 'on_pods_complete')
+    client.get_pods('default')
+    client.get_pods('kube-system')
+    assert run_until(lambda: received['on_pods_complete'])
+    run_until(lambda: False, timeout=0.3)
+    assert received['on_pods_complete'] == [(25,)]
+    assert [page_index for pods, page_index in received['on_pods_page']] == [0, 1, 2]
+
+
+def test_pods_of_several_clusters_are_listed_at_once(client, run_until):
+    received = record(client, 'on_fan_out_pods', 'on_fan_out_error', 'on_fan_out_complete')
+    client.get_pods_fan_out('default', CLUSTERS + [('rg-c', 'aks-missing')])
+    assert run_until(lambda: received['on_fan_out_complete'])
+    assert sorted((cluster, len(pods)) for cluster, pods in received['on_fan_out_pods']) == [('aks-a', 25), ('aks-b', 25)]
+    assert [cluster for cluster, message in received['on_fan_out_error']] == ['aks-missing']
+    assert received['on_fan_out_complete'] == [(50, 1)]
+
+
+def test_pods_are_described_with_their_events(client, server, run_until):
+    pod = server.namespace('aks-a', 'default').names[0]
+    received = record(client, 'on_describe_output')
+    client.get_describe_pod(pod, 'default')
+    assert run_until(lambda: received['on_describe_output'])
+    output = received['on_describe_output'][0][0]
+    assert f"Name:         {pod}" in output
+    assert 'Successfully assigned' in output
+
+
+def test_a_watch_whose_version_expired_lists_again(client, server, monkeypatch, run_until):
+    monkeypatch.setattr(fake_api_server, 'WATCH_HISTORY', 3)
+    namespace = server.namespace('aks-a', 'default')
+    list_pod_pages = client._list_pod_pages
+    lists = []
+
+    def list_then_churn(*args, **kwargs):
+        yield from list_pod_pages(*args, **kwargs)
+        lists.append(namespace.resource_version)
+        if len(lists) == 1:
+            namespace.churn(10)  # The listed version drops out of the watch history
+    monkeypatch.setattr(client, '_list_pod_pages', list_then_churn)
+    received = record(client, 'on_pods_complete', 'on_pod_events')
+    client.watch_pods('default')
+    assert run_until(lambda: len(received['on_pods_complete']) == 2)
+    assert len(lists) == 2
+    namespace.churn(1)
+    assert run_until(lambda: received['on_pod_events'])
+    [events] = received['on_pod_events'][0]
+    assert events[0][0] in ('ADDED', 'MODIFIED', 'DELETED')
+
+
+def test_a_stopped_log_follow_closes_its_stream(client, server, run_until):
+    pod = server.namespace('aks-a', 'default').names[0]
+    received = record(client, 'on_logs_append', 'on_logs_follow_end')
+    client.follow_logs(pod, 'default', tail_lines=5)
+    assert run_until(lambda: len(received['on_logs_append']) > 1)
+    assert received['on_logs_append'][0][0].count('\n') >= 5
+    follow = client.log_follow
+    client.stop_follow_logs()
+    assert client.log_follow is None
+    assert run_until(lambda: follow[1].closed)
+    appended = len(received['on_logs_append'])
+    run_until(lambda: False, timeout=0.3)
+    assert len(received['on_logs_append']) == appended
+    assert received['on_logs_follow_end'] == []
+
+
+def test_secrets_and_deployments_are_listed_as_metadata_only(client, server, monkeypatch, run_until):
+    rendered = []
+    for method in ('secret_json', 'deployment_json'):
+        original = getattr(FakeNamespace, method)
+        monkeypatch.setattr(FakeNamespace, method, lambda self, name, original=original: rendered.append(name) or original(self, name))
+    namespace = server.namespace('aks-a', 'default')
+    received = record(client, 'on_secrets_output', 'on_deployments_output', 'on_secret_details')
+    client.get_secrets('default')
+    client.get_deployments('default')
+    assert run_until(lambda: received['on_secrets_output'] and received['on_deployments_output'])
+    assert received['on_secrets_output'] == [("\n".join(namespace.secrets),)]
+    assert received['on_deployments_output'] == [("\n".join(namespace.deployments),)]
+    assert rendered == []  # No secret data or deployment spec was sent
+    client.get_secret_details(namespace.secrets[0], 'default')
+    assert run_until(lambda: received['on_secret_details'])
+    assert rendered == [namespace.secrets[0]]
+    secret_type, data = server.profile.secret('aks-a', 'default', namespace.secrets[0])
+    for key, value in data.items():
+        assert f"{key}:  {len(value)} bytes" in received['on_secret_details'][0][0]
+
+
+def test_namespaces_are_listed_once_or_watched(client, server, run_until):
+    cluster = server.cluster('aks-a')
+    received = record(client, 'on_namespaces', 'on_namespace_events')
+    client.get_namespaces('aks-a')
+    assert run_until(lambda: received['on_namespaces'])
+    assert received['on_namespaces'] == [('aks-a', cluster.namespaces)]
+    client.watch_namespaces('aks-a')
+    assert run_until(lambda: len(received['on_namespaces']) == 2)
+    cluster.churn()
+    assert run_until(lambda: received['on_namespace_events'])
+    assert received['on_namespace_events'][0] == ('aks-a', [('ADDED', 'preview-0')])
+    client.stop_watch_namespaces()
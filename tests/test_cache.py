@@ -0,0 +1,77 @@
+import json
+
+from ui.cache import CacheManager, write_json
+
+
+def test_updates_are_served_from_memory_and_written_in_one_flush(tmp_path):
+    path = tmp_path / 'cache.json'
+    cache = CacheManager(str(path))
+    cache.put('region', {'value': 'eu'})
+    cache.update({'environment': {'value': 'sit'}, 'cluster': {'value': 'aks-1'}})
+    assert cache.get('cluster') == {'value': 'aks-1'}
+    assert not path.exists()  # Nothing written before the flush
+    cache.flush().result(5)
+    assert json.loads(path.read_text()) == {'region': {'value': 'eu'}, 'environment': {'value': 'sit'}, 'cluster': {'value': 'aks-1'}}
+    cache.close()
+
+
+def test_updates_flush_on_their_own_after_the_delay(tmp_path, run_until):
+    path = tmp_path / 'cache.json'
+    cache = CacheManager(str(path))
+    cache.put('key', 1)
+    assert run_until(lambda: path.exists(), timeout=CacheManager.FLUSH_DELAY + 5)
+    cache.close()
+
+
+def test_close_writes_pending_updates(tmp_path):
+    path = tmp_path / 'cache.json'
+    cache = CacheManager(str(path))
+    cache.put('key', 1)
+    cache.delete('key')
+    cache.put('other', 2)
+    cache.close()
+    assert CacheManager(str(path)).data == {'other': 2}
+
+
+def test_a_corrupt_file_reads_as_empty(tmp_path):
+    path = tmp_path / 'cache.json'
+    path.write_text('{"truncated": ')
+    assert CacheManager(str(path)).data == {}
+
+
+def test_the_path_is_resolved_when_created(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    cache = CacheManager('./cache.json')
+    monkeypatch.chdir('/')
+    cache.put('key', 1)
+    cache.close()
+    assert json.loads((tmp_path / 'cache.json').read_text()) == {'key': 1}
+
+
+def test_write_json_replaces_the_file_and_leaves_no_temporary_files(tmp_path):
+    path = tmp_path / 'data.json'
+    path.write_text('old')
+    assert write_json(str(path), {'a': 1}) == len('{"a":1}')
+    assert [entry.name for entry in tmp_path.iterdir()] == ['data.json']
+    assert write_json(str(tmp_path / 'missing' / 'data.json'), {}) is None
+
+
+def test_selections_are_validated_against_the_options(tmp_path):
+    cache = CacheManager(str(tmp_path / 'cache.json'))
+    cache.save_selections({'region': 'eu', 'cluster': 'gone'})
+    selections = cache.load_selections({'region': 'Region', 'cluster': 'Cluster'}, {'region': ['eu', 'us'], 'cluster': ['aks-1']})
+    assert selections == {'region': 'eu', 'cluster': 'Cluster'}
+    cache.close()
+
+
+def test_a_failed_write_is_retried(tmp_path, run_until):
+    path = tmp_path / 'cache.json'
+    cache = CacheManager(str(path))
+    cache.RETRY_DELAY = 0.05
+    path.mkdir()  # Replacing a directory with the file fails
+    cache.put('key', 1)
+    cache.flush().result(5)
+    path.rmdir()
+    assert run_until(lambda: path.exists())
+    cache.close()
+    assert json.loads(path.read_text()) == {'key': 1}
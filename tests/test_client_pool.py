@@ -0,0 +1,58 @@
+import pytest
+
+from k8s.client_pool import ApiClientPool
+
+KUBECONFIG = """\
+apiVersion: v1
+kind: Config
+clusters:
+- name: aks-a
+  cluster: {server: 'http://127.0.0.1:8001'}
+- name: aks-b
+  cluster: {server: 'http://127.0.0.1:8002'}
+users:
+- name: user
+  user: {token: secret}
+contexts:
+- name: aks-a
+  context: {cluster: aks-a, user: user}
+- name: aks-b
+  context: {cluster: aks-b, user: user}
+current-context: aks-b
+"""
+
+
+@pytest.fixture
+def pool(tmp_path):
+    path = tmp_path / 'config'
+    path.write_text(KUBECONFIG)
+    return ApiClientPool(config_file=str(path))
+
+
+def test_each_context_gets_one_client_of_its_own(pool):
+    a = pool.get('aks-a')
+    assert pool.get('aks-a') is a
+    b = pool.get('aks-b')
+    assert b is not a
+    assert a.api_client.configuration.host == 'http://127.0.0.1:8001'
+    assert b.api_client.configuration.host == 'http://127.0.0.1:8002'
+    assert a.core_v1.api_client is a.api_client and a.apps_v1.api_client is a.api_client
+
+
+def test_an_invalidated_client_is_rebuilt(pool):
+    a = pool.get('aks-a')
+    assert pool.has('aks-a') and not pool.has('aks-b')
+    pool.invalidate('aks-a')
+    pool.invalidate('aks-b')  # Never built
+    assert not pool.has('aks-a')
+    assert pool.get('aks-a') is not a
+
+
+def test_the_active_context_is_read_from_the_kubeconfig(pool):
+    assert pool.active_context() == 'aks-b'
+
+
+def test_contexts_are_looked_up_by_name(pool, tmp_path):
+    assert pool.find_context('aks-a')['context'] == {'cluster': 'aks-a', 'user': 'user'}
+    assert pool.find_context('aks-c') is None
+    assert ApiClientPool(config_file=str(tmp_path / 'missing')).find_context('aks-a') is None
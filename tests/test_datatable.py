@@ -0,0 +1,126 @@
+import random
+
+import pytest
+
+from ui.datatable import CustomDataTable
+
+
+def make_table(rows, virtualized=True, key_columns=1):
+    return CustomDataTable(column_data=['Name', 'Status'], row_data=rows, virtualized=virtualized, key_columns=key_columns)
+
+
+def rows(count, status='Running'):
+    return [(f"pod-{index}", status) for index in range(count)]
+
+
+def shown_rows(table):
+    """Rows as the table's views hold them, as text."""
+    if table.virtualized:
+        return [tuple(str(value) for value in item['values']) for item in table.scroll_view.data]
+    return [tuple(cell.text for cell in row.cells) for row in table.rows]
+
+
+def assert_consistent(table):
+    assert shown_rows(table) == [tuple(str(value) for value in row) for row in table.row_data]
+    assert table.keys == [table.row_key(row) for row in table.row_data]
+    assert table.positions == {key: index for index, key in enumerate(table.keys)}
+
+
+def test_virtualized_table_keeps_rows_as_data_only():
+    table = make_table(rows(10000))
+    assert len(table.scroll_view.data) == 10000
+    assert table.rows == []
+    assert table.index_of('pod-9999') == 9999
+
+
+def test_virtualized_table_only_builds_views_for_visible_rows(run_until):
+    table = make_table(rows(10000))
+    table.size = (400, 20 * CustomDataTable.ROW_HEIGHT)
+    assert run_until(lambda: table.row_container.children)
+    assert 0 < len(table.row_container.children) < 50
+
+
+@pytest.mark.parametrize('virtualized', [True, False])
+def test_update_row_data_replaces_the_rows(virtualized):
+    table = make_table(rows(20), virtualized=virtualized)
+    table.update_row_data(rows(5, status='Pending'))
+    assert shown_rows(table) == rows(5, status='Pending')
+
+
+@pytest.mark.parametrize('virtualized', [True, False])
+def test_select_row_dispatches_the_first_column(virtualized):
+    table = make_table(rows(20), virtualized=virtualized)
+    selected = []
+    table.bind(on_row_select=lambda instance, value: selected.append(value))
+    table.select_row(7)
+    table.select_row(20)  # Out of range, ignored
+    assert table.selected_row_index == 7
+    assert selected == ['pod-7']
+    table.update_row_data(rows(3))
+    assert table.selected_row_index is None
+
+
+@pytest.mark.parametrize('virtualized', [True, False])
+def test_sync_row_data_matches_the_new_rows(virtualized):
+    rng = random.Random(7)
+    current = rows(200)
+    table = make_table(list(current), virtualized=virtualized)
+    next_name = 200
+    for _ in range(30):
+        kept = [row if rng.random() > 0.1 else (row[0], 'Pending') for row in current if rng.random() > 0.05]
+        for _ in range(rng.randint(0, 10)):
+            kept.insert(rng.randint(0, len(kept)), (f"pod-{next_name}", 'Running'))
+            next_name += 1
+        current = kept
+        table.sync_row_data(current)
+        assert table.row_data == current
+        assert_consistent(table)
+
+
+def test_small_changes_are_applied_to_the_view_data_in_place():
+    table = make_table(rows(1000))
+    data = table.scroll_view.data
+    table.remove_rows(['pod-10', 'pod-11', 'pod-500'])
+    table.upsert_rows([('pod-new', 'Pending')], index=3)
+    table.upsert_rows([('pod-0', 'Failed')])
+    assert table.scroll_view.data is data
+    assert table.row_data[3] == ('pod-new', 'Pending')
+    assert table.row_data[0] == ('pod-0', 'Failed')
+    assert len(table.row_data) == 998
+    assert_consistent(table)
+
+
+def test_scattered_bulk_changes_replace_all_rows_at_once():
+    table = make_table(rows(2000))
+    data = table.scroll_view.data
+    table.remove_rows([f"pod-{index}" for index in range(0, 2000, 2)])  # 1000 separate runs
+    assert table.scroll_view.data is not data
+    assert table.row_data == rows(2000)[1::2]
+    assert_consistent(table)
+
+
+@pytest.mark.parametrize('virtualized', [True, False])
+def test_selection_follows_its_row(virtualized):
+    table = make_table(rows(50), virtualized=virtualized)
+    table.select_row(20)
+    table.upsert_rows([('pod-a', 'Running'), ('pod-b', 'Running')], index=0)
+    table.remove_rows(['pod-30'])
+    assert table.selected_key == 'pod-20'
+    assert table.selected_row_index == 22
+    table.remove_rows(['pod-20'])
+    assert table.selected_row_index is None
+
+
+def test_upsert_chains_batches_and_returns_the_next_position():
+    table = make_table([])
+    cursor = table.upsert_rows(rows(3), index=0)
+    cursor = table.upsert_rows([('pod-3', 'Running'), ('pod-4', 'Running')], index=cursor)
+    assert cursor == 5
+    assert [row[0] for row in table.row_data] == [f"pod-{index}" for index in range(5)]
+
+
+def test_rows_are_keyed_on_several_columns():
+    table = CustomDataTable(column_data=['Cluster', 'Name', 'Status'], row_data=[('a', 'pod', 'Running')], virtualized=True, key_columns=2)
+    table.upsert_rows([('b', 'pod', 'Running'), ('a', 'pod', 'Failed')])
+    assert table.row_data == [('a', 'pod', 'Failed'), ('b', 'pod', 'Running')]
+    assert table.index_of(('b', 'pod')) == 1
@@ -0,0 +1,110 @@
+import time
+
+import pytest
+
+from data.DATA import NAMESPACES, SUBSCRIPTIONS
+from k8s.discovery import Discovery, Inventory, StaticSource, classify
+from k8s.entities import Subscription
+from ui.cache import CacheManager
+
+
+@pytest.mark.parametrize('name, tags, expected', [
+    ('sub-na-sit', None, ('NA', 'SIT')),
+    ('sub-eune-prod', None, ('EMEA', 'PROD')),
+    ('platform-shared', None, ('Other', 'Other')),
+    ('platform-shared', {'Region': 'APAC', 'Environment': 'UAT'}, ('APAC', 'UAT')),
+    ('platform-shared', {'region': ' na ', 'environment': 'Sit'}, ('NA', 'SIT')),
+    ('platform-shared', {'region': 'eune', 'environment': 'dev'}, ('EMEA', 'DEV')),
+    ('sub-na-sit', {'region': '', 'environment': None}, ('NA', 'SIT')),
+])
+def test_classify(name, tags, expected):
+    assert classify(name, tags) == expected
+
+
+def test_inventory_indexes_the_cascade():
+    inventory = Inventory(SUBSCRIPTIONS, NAMESPACES, region_order=['NA', 'EMEA'], environment_order=['SIT', 'UAT', 'PROD'])
+    assert inventory.regions == ['NA', 'EMEA', 'APAC', 'LATAM']
+    assert inventory.environments == ['SIT', 'PROD']
+    assert [subscription.name for subscription in inventory.subscriptions_in('NA', 'SIT')] == ['sub-na-sit']
+    assert sorted(inventory.clusters_in('NA', 'SIT')) == [('rg-na-sit-01', 'aks-na-sit-1'), ('rg-na-sit-01', 'aks-na-sit-3'), ('rg-na-sit-02', 'aks-na-sit-2')]
+    assert inventory.subscription('sub-la-prod').region == 'LATAM'
+    assert inventory.subscription('missing') is None
+    assert 'aks-eune-prod-01' in inventory.clusters and 'rg-apac-sit-01' in inventory.resource_groups
+    assert sorted(inventory.namespaces_in('SIT')) == ['namespace-1-sit', 'namespace-2-sit', 'namespace-3-sit']
+    assert inventory.clusters_in('NA', 'UAT') == [] and inventory.namespaces_in('UAT') == []
+
+
+class FailingSource(StaticSource):
+    """Fails to list the clusters of the named subscriptions."""
+
+    def __init__(self, subscriptions, failing):
+        super().__init__(subscriptions)
+        self.failing = failing
+
+    def list_clusters(self, subscription_id):
+        if subscription_id in self.failing:
+            raise RuntimeError('throttled')
+        return super().list_clusters(subscription_id)
+
+
+def discover(discovery, run_until):
+    results = []
+    discovery.bind(on_discovery=lambda instance, subscriptions, errors: results.append((subscriptions, errors)))
+    discovery.refresh()
+    assert run_until(lambda: results)
+    return results[0]
+
+
+def test_discovery_caches_what_it_found(tmp_path, run_until):
+    cache = CacheManager(str(tmp_path / 'discovery.json'))
+    discovery = Discovery(StaticSource(SUBSCRIPTIONS), cache)
+    assert discovery.cached() == (None, False)
+    subscriptions, errors = discover(discovery, run_until)
+    assert errors == []
+    assert {subscription.name: subscription.resource_groups for subscription in subscriptions} == \
+        {subscription.name: subscription.resource_groups for subscription in SUBSCRIPTIONS}
+    cached, fresh = discovery.cached()
+    assert fresh and [subscription.name for subscription in cached] == [subscription.name for subscription in subscriptions]
+    cache.close()
+
+
+def test_failed_subscriptions_keep_their_cached_clusters(tmp_path, run_until):
+    cache = CacheManager(str(tmp_path / 'discovery.json'))
+    discover(Discovery(StaticSource(SUBSCRIPTIONS), cache), run_until)
+    renamed = [Subscription(s.name, s.region, s.environment, {'rg-new': ['aks-new']}) for s in SUBSCRIPTIONS]
+    subscriptions, errors = discover(Discovery(FailingSource(renamed, {'sub-na-sit'}), cache), run_until)
+    assert errors == ['sub-na-sit: throttled']
+    by_name = {subscription.name: subscription for subscription in subscriptions}
+    assert by_name['sub-na-sit'].resource_groups == SUBSCRIPTIONS[1].resource_groups
+    assert by_name['sub-la-prod'].resource_groups == {'rg-new': ['aks-new']}
+    cache.close()
+
+
+
+def test_an_empty_listing_keeps_the_previous_discovery(tmp_path, run_until):
+    cache = CacheManager(str(tmp_path / 'discovery.json'))
+    discover(Discovery(StaticSource(SUBSCRIPTIONS), cache), run_until)
+    subscriptions, errors = discover(Discovery(StaticSource([]), cache), run_until)
+    assert errors == ["No subscriptions were listed; keeping the previous ones"]
+    assert [subscription.name for subscription in subscriptions] == [subscription.name for subscription in SUBSCRIPTIONS]
+    assert len(Discovery(StaticSource([]), cache).cached()[0]) == len(SUBSCRIPTIONS)
+    cache.close()
+
+
+def test_namespaces_are_only_written_when_they_change_or_go_stale(tmp_path, monkeypatch):
+    cache = CacheManager(str(tmp_path / 'discovery.json'))
+    discovery = Discovery(StaticSource([]), cache, ttl=60)
+    assert discovery.namespaces('aks-1') == (None, False)
+    discovery.put_namespaces('aks-1', {'kube-system', 'default'})
+    assert discovery.namespaces('aks-1') == (['default', 'kube-system'], True)
+    assert cache.flush_trigger.is_triggered
+    cache.flush_trigger.cancel()
+    discovery.put_namespaces('aks-1', ['kube-system', 'default'])
+    assert not cache.flush_trigger.is_triggered
+    now = time.time()
+    monkeypatch.setattr(time, 'time', lambda: now + 120)
+    assert discovery.namespaces('aks-1') == (['default', 'kube-system'], False)
+    discovery.put_namespaces('aks-1', ['kube-system', 'default'])
+    assert cache.flush_trigger.is_triggered
+    assert discovery.namespaces('aks-1') == (['default', 'kube-system'], True)
+    cache.close()
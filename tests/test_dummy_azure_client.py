@@ -0,0 +1,59 @@
+import pytest
+
+from k8s.dummy_azure_client import DummyAzureClient
+from k8s.dummy_profile import DummyProfile
+
+
+def fast_profile(**overrides):
+    settings = dict(latency_median=0.01, latency_sigma=0, page_interval=0.01, pod_count=25, pod_page_size=10)
+    return DummyProfile(**dict(settings, **overrides))
+
+
+def record_pods(client):
+    pages, completed = [], []
+    client.bind(on_pods_page=lambda instance, pods, page_index: pages.append((page_index, pods)))
+    client.bind(on_pods_complete=lambda instance, total: completed.append(total))
+    return pages, completed
+
+
+def test_profiles_reject_unknown_settings_and_too_many_pods():
+    with pytest.raises(ValueError):
+        DummyProfile(pods=10)
+    with pytest.raises(ValueError):
+        DummyProfile(pod_count=DummyProfile.MAX_POD_COUNT + 1)
+    with pytest.raises(ValueError):
+        DummyProfile.preset('tiny')
+    assert DummyProfile.preset('huge').pod_count == DummyProfile.MAX_POD_COUNT
+
+
+def test_the_same_profile_generates_the_same_pods():
+    first = list(DummyAzureClient(fast_profile())._generate_pods('aks-a', 'default'))
+    second = list(DummyAzureClient(fast_profile())._generate_pods('aks-a', 'default'))
+    other = list(DummyAzureClient(fast_profile(seed=7))._generate_pods('aks-a', 'default'))
+    assert first == second
+    assert first != other
+    assert len({pod["name"] for pod in first}) == 25
+
+
+def test_pods_are_listed_page_by_page(run_until):
+    client = DummyAzureClient(fast_profile())
+    pages, completed = record_pods(client)
+    client.get_pods('default')
+    assert run_until(lambda: completed)
+    assert [page_index for page_index, pods in pages] == [0, 1, 2]
+    assert [len(pods) for page_index, pods in pages] == [10, 10, 5]
+    assert completed == [25]
+
+
+def test_a_new_list_supersedes_the_previous_one(run_until):
+    client = DummyAzureClient(fast_profile(page_interval=0.05))
+    pages, completed = record_pods(client)
+    client.get_pods('first')
+    assert run_until(lambda: pages)
+    client.get_pods('second')
+    assert run_until(lambda: completed)
+    run_until(lambda: len(completed) > 1, timeout=0.3)
+    second = {pod["name"] for pod in client._generate_pods(None, 'second')}
+    first_pages = [pods for page_index, pods in pages if not {pod["name"] for pod in pods} <= second]
+    assert len(first_pages) == 1  # Only the page dispatched before the new list began
+    assert completed == [25]
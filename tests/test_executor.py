@@ -0,0 +1,72 @@
+import threading
+
+from k8s.executor import RequestExecutor
+
+
+def test_a_newer_request_supersedes_the_previous_one_of_its_kind():
+    executor = RequestExecutor(max_workers=2)
+    release = threading.Event()
+    first = executor.submit('pods', lambda handle: release.wait(5))
+    second = executor.submit('pods', lambda handle: 'listed')
+    other = executor.submit('secrets', lambda handle: 'secrets')
+    assert first.cancelled and not first.is_current()
+    assert second.is_current() and other.is_current()
+    assert second.generation == first.generation + 1
+    release.set()
+    assert second.future.result(5) == 'listed'
+    executor.shutdown()
+
+
+def test_a_queued_request_that_is_cancelled_never_runs():
+    executor = RequestExecutor(max_workers=1)
+    release = threading.Event()
+    ran = []
+    executor.submit('merge', lambda handle: release.wait(5))
+    queued = executor.submit('pods', lambda handle: ran.append(handle))
+    executor.cancel('pods')
+    release.set()
+    executor.shutdown()
+    executor.pool.shutdown(wait=True)
+    assert queued.future.cancelled() and ran == []
+
+
+def test_a_running_request_sees_it_is_no_longer_current():
+    executor = RequestExecutor()
+    started, release = threading.Event(), threading.Event()
+
+    def run(handle):
+        started.set()
+        release.wait(5)
+        return handle.is_current()
+    handle = executor.submit('logs', run)
+    assert started.wait(5)
+    executor.cancel('logs')
+    release.set()
+    assert handle.future.result(5) is False
+    executor.shutdown()
+
+
+def test_a_queued_request_that_is_superseded_never_runs():
+    executor = RequestExecutor(max_workers=1)
+    release = threading.Event()
+    ran = []
+    executor.submit('merge', lambda handle: release.wait(5))
+    first = executor.submit('pods', lambda handle: ran.append('first'))
+    second = executor.submit('pods', lambda handle: ran.append('second'))
+    release.set()
+    second.future.result(5)
+    assert first.future.cancelled() and ran == ['second']
+    executor.shutdown()
+
+
+def test_cancelling_a_kind_leaves_the_other_kinds_alone():
+    executor = RequestExecutor()
+    release = threading.Event()
+    pods = executor.submit('pods', lambda handle: release.wait(5))
+    secrets = executor.submit('secrets', lambda handle: release.wait(5))
+    executor.cancel('pods')
+    executor.cancel('deployments')  # Nothing active of that kind
+    assert not pods.is_current() and secrets.is_current()
+    release.set()
+    assert secrets.future.result(5) is True
+    executor.shutdown()
@@ -0,0 +1,30 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from k8s import kube
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_importing_the_client_does_not_load_the_sdk():
+    script = (
+        "import sys\n"
+        "import k8s.azure_client, k8s.client_pool, k8s.pod_describer\n"
+        "assert 'kubernetes' not in sys.modules, 'kubernetes was imported'\n"
+        "from k8s import kube\n"
+        "kube.ApiException\n"
+        "assert 'kubernetes' in sys.modules\n"
+    )
+    process = subprocess.run([sys.executable, '-c', script], cwd=ROOT, env=dict(os.environ), capture_output=True, text=True)
+    assert process.returncode == 0, process.stderr
+
+
+def test_sdk_attributes_are_resolved_once():
+    from kubernetes.client.rest import ApiException
+    assert kube.ApiException is ApiException
+    assert 'ApiException' in vars(kube)
+    with pytest.raises(AttributeError):
+        kube.missing
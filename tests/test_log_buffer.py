@@ -0,0 +1,58 @@
+from ui.log_buffer import LogBuffer
+
+
+def test_lines_are_numbered_across_appends_and_partial_lines():
+    buffer = LogBuffer()
+    buffer.append("first\nsec")
+    buffer.append("ond\nthird")
+    assert buffer.window(0, 10) == ['first', 'second', 'third']
+    buffer.append("")
+    buffer.append(" line\n")
+    assert buffer.line(2) == 'third line'
+    assert len(buffer) == 3
+
+
+def test_text_without_newline_extends_the_open_line():
+    buffer = LogBuffer()
+    buffer.append("a")
+    buffer.append("b")
+    buffer.append("c\n")
+    assert buffer.window(0, 10) == ['abc']
+
+
+def test_oldest_lines_are_dropped_beyond_max_lines():
+    buffer = LogBuffer(max_lines=3000)
+    buffer.append("".join(f"line {index}\n" for index in range(5000)))
+    assert len(buffer) == 3000
+    assert buffer.first_line == buffer.dropped == 2000
+    assert buffer.line(1999) is None
+    assert buffer.line(2000) == 'line 2000'
+    assert buffer.tail(2) == ['line 4998', 'line 4999']
+    assert buffer.window(2998, 4) == ['line 2998', 'line 2999', 'line 3000', 'line 3001']  # Across the ring's end
+
+
+def test_ring_grows_with_the_log():
+    buffer = LogBuffer(max_lines=100000)
+    buffer.append("x\n")
+    assert buffer.capacity == LogBuffer.MIN_CAPACITY
+    buffer.append("x\n" * 5000)
+    assert LogBuffer.MIN_CAPACITY < buffer.capacity < 100000
+
+
+def test_lowercased_copies_count_towards_max_chars():
+    buffer = LogBuffer(max_chars=100)
+    buffer.append("lower\n" * 10)  # 5 characters a line, copy shared
+    assert buffer.chars == 50
+    buffer.append("UPPER\n" * 10)  # 10 characters a line with the copy
+    assert buffer.chars <= 100
+    assert buffer.window_lower(buffer.end_line - 1, 1) == ['upper']
+    assert buffer.tail(1) == ['UPPER']
+
+
+def test_clear_forgets_everything():
+    buffer = LogBuffer()
+    buffer.append("a\nb")
+    buffer.clear()
+    assert len(buffer) == 0 and buffer.chars == 0 and buffer.end_line == 0
+    buffer.append("c\n")
+    assert buffer.window(0, 1) == ['c']
@@ -0,0 +1,65 @@
+import pytest
+
+from ui.log_filter import LogFilter, parse_query
+
+LINES = [
+    'info get /api/v1/orders/1 200 12ms',
+    'warn slow query on orders took 1500ms',
+    'error upstream billing returned 503',
+    'debug cache hit for key order:7',
+]
+
+
+def matching(query):
+    predicate = parse_query(query)
+    return [line for line in LINES if predicate(line)]
+
+
+def test_empty_query_has_no_predicate():
+    assert parse_query('   ') is None
+
+
+@pytest.mark.parametrize('query, expected', [
+    ('ORDERS', [0, 1]),
+    ('orders slow', [1]),
+    ('billing OR cache', [2, 3]),
+    ('orders -slow', [0]),
+    ('orders NOT slow', [0]),
+    ('"hit for"', [3]),
+    (r'/took\s1\d{3}ms/', [1]),
+    ('re:^(warn|error)', [1, 2]),
+])
+def test_query_syntax(query, expected):
+    assert matching(query) == [LINES[index] for index in expected]
+
+
+def test_malformed_regex_is_a_value_error():
+    with pytest.raises(ValueError):
+        parse_query('/(unclosed/')
+
+
+def test_filter_delivers_line_numbers_of_the_newest_query(run_until):
+    results = []
+    log_filter = LogFilter(lambda matches, error: results.append((matches, error)))
+    log_filter.submit('orders', LINES, 100)
+    log_filter.submit('billing', LINES, 100)  # Supersedes the first query
+    assert run_until(lambda: results)
+    run_until(lambda: False, timeout=0.1)
+    assert results == [([102], None)]
+
+
+def test_filter_reports_a_malformed_query(run_until):
+    results = []
+    log_filter = LogFilter(lambda matches, error: results.append((matches, error)))
+    log_filter.submit('re:[', LINES, 0)
+    assert run_until(lambda: results)
+    assert results[0][0] == [] and 'Invalid regex' in results[0][1]
+
+
+def test_cancelled_query_is_never_delivered(run_until):
+    results = []
+    log_filter = LogFilter(lambda matches, error: results.append(matches))
+    log_filter.submit('orders', LINES * 50000, 0)
+    log_filter.cancel()
+    run_until(lambda: results, timeout=0.5)
+    assert results == []
@@ -0,0 +1,52 @@
+import csv
+import json
+
+import pytest
+
+from k8s.metrics import Histogram, Metrics
+
+
+def test_percentiles_are_within_the_bucket_precision():
+    histogram = Histogram('seconds')
+    for value in range(1, 1001):
+        histogram.record(value / 1000)
+    assert histogram.percentile(0.5) == pytest.approx(0.5, rel=0.05)
+    assert histogram.percentile(0.99) == pytest.approx(0.99, rel=0.05)
+    assert histogram.percentile(1.0) <= histogram.max == 1.0
+    assert len(histogram.buckets) < 200  # Memory does not grow with the count
+
+
+def test_zeros_and_empty_histograms_are_summarized():
+    histogram = Histogram('bytes')
+    assert histogram.summary()['p50'] is None
+    histogram.record(0)
+    histogram.record(0)
+    histogram.record(10)
+    summary = histogram.summary()
+    assert summary['p50'] == 0.0 and summary['max'] == 10
+    assert summary['count'] == 3 and summary['unit'] == 'bytes'
+
+
+def test_spans_record_each_stage_and_the_size():
+    metrics = Metrics()
+    span = metrics.span('pods.page')
+    span.mark('received', size=2048)
+    span.mark('parsed')
+    span.end()
+    summaries = metrics.summaries()
+    assert list(summaries) == ['pods.page.bytes', 'pods.page.parsed', 'pods.page.received', 'pods.page.total']
+    assert summaries['pods.page.bytes']['max'] == 2048
+    assert summaries['pods.page.total']['max'] >= summaries['pods.page.parsed']['max']
+
+
+def test_summaries_are_exported_as_csv_or_json(tmp_path):
+    metrics = Metrics()
+    with metrics.timer('frame'):
+        pass
+    with open(metrics.export(str(tmp_path / 'metrics.csv')), newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert [row['name'] for row in rows] == ['frame'] and rows[0]['count'] == '1'
+    with open(metrics.export(str(tmp_path / 'metrics.json'))) as f:
+        assert json.load(f)['metrics']['frame']['count'] == 1
+    metrics.reset()
+    assert metrics.summaries() == {}
@@ -0,0 +1,83 @@
+from datetime import datetime, timedelta, timezone
+
+from kubernetes import client
+
+from k8s.pod_describer import PodDescriber, short_age
+
+
+class FakeCoreV1:
+    """Answers read_namespaced_pod and list_namespaced_event, counting the calls."""
+
+    def __init__(self, pod, events):
+        self.pod = pod
+        self.events = events
+        self.reads = 0
+        self.event_lists = 0
+
+    def read_namespaced_pod(self, name, namespace):
+        self.reads += 1
+        return self.pod
+
+    def list_namespaced_event(self, namespace, field_selector):
+        self.event_lists += 1
+        return client.CoreV1EventList(items=list(self.events))
+
+
+def make_pod(resource_version='1'):
+    return client.V1Pod(
+        metadata=client.V1ObjectMeta(name='web-0', namespace='default', uid='uid-1', resource_version=resource_version),
+        spec=client.V1PodSpec(containers=[client.V1Container(name='app', image='nginx:1.25')]),
+        status=client.V1PodStatus(
+            phase='Running',
+            container_statuses=[client.V1ContainerStatus(
+                name='app', image='nginx:1.25', image_id='', ready=True, restart_count=2,
+                state=client.V1ContainerState(waiting=client.V1ContainerStateWaiting(reason='CrashLoopBackOff')),
+            )],
+        ),
+    )
+
+
+def make_event(reason, minutes_ago):
+    return client.CoreV1Event(
+        metadata=client.V1ObjectMeta(name=f"web-0.{reason}"),
+        involved_object=client.V1ObjectReference(kind='Pod', name='web-0'),
+        type='Normal', reason=reason, message=f"{reason} happened",
+        last_timestamp=datetime.now(timezone.utc) - timedelta(minutes=minutes_ago),
+        source=client.V1EventSource(component='kubelet'),
+    )
+
+
+def test_pods_are_described_with_container_state_and_events_oldest_first():
+    core_v1 = FakeCoreV1(make_pod(), [make_event('Started', 1), make_event('Pulled', 5)])
+    output = PodDescriber().describe(core_v1, 'web-0', 'default')
+    assert 'Name:         web-0' in output
+    assert 'CrashLoopBackOff' in output and 'Restart Count:  2' in output
+    assert output.index('Pulled happened') < output.index('Started happened')
+
+
+def test_a_known_version_skips_the_pod_read_but_not_the_events():
+    describer = PodDescriber()
+    core_v1 = FakeCoreV1(make_pod(), [make_event('Pulled', 5)])
+    describer.describe(core_v1, 'web-0', 'default')
+    core_v1.events.append(make_event('Killing', 0))
+    output = describer.describe(core_v1, 'web-0', 'default', ('uid-1', '1'))
+    assert core_v1.reads == 1 and core_v1.event_lists == 2
+    assert 'Killing happened' in output
+
+
+def test_a_new_version_is_rendered_again():
+    describer = PodDescriber()
+    core_v1 = FakeCoreV1(make_pod(), [])
+    describer.describe(core_v1, 'web-0', 'default')
+    core_v1.pod = make_pod('2')
+    core_v1.pod.status.phase = 'Succeeded'
+    output = describer.describe(core_v1, 'web-0', 'default', ('uid-1', '2'))
+    assert core_v1.reads == 2
+    assert 'Status:       Succeeded' in output and 'Events:  <none>' in output
+
+
+def test_ages_use_the_largest_unit():
+    now = datetime(2024, 1, 2, tzinfo=timezone.utc)
+    assert short_age(now - timedelta(seconds=45), now) == '45s'
+    assert short_age(now - timedelta(hours=3, minutes=5), now) == '3h'
+    assert short_age(None, now) == '<unknown>'
@@ -0,0 +1,61 @@
+import types
+
+import pytest
+
+from k8s import response_cache
+from k8s.response_cache import ResponseCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A settable monotonic clock for the cache."""
+    now = types.SimpleNamespace(value=1000.0)
+    monkeypatch.setattr(response_cache, 'time', types.SimpleNamespace(monotonic=lambda: now.value))
+    return now
+
+
+def test_entries_are_fresh_then_stale_then_missing(clock):
+    cache = ResponseCache(ttls={'pods': 10}, max_stale=60)
+    key = ('ctx', 'ns', 'pods')
+    cache.put(key, ['pod'])
+    assert cache.get(key) == (['pod'], True)
+    clock.value += 11
+    assert cache.get(key) == (['pod'], False)
+    clock.value += 50
+    assert cache.get(key) == (None, False)
+    assert cache.stats() == {'hits': 1, 'stale_hits': 1, 'misses': 1, 'entries': 0}
+
+
+def test_kinds_without_a_ttl_use_the_default(clock):
+    cache = ResponseCache(ttls={'pods': 1})
+    cache.put(('ctx', 'ns', 'secrets'), 'secrets')
+    clock.value += ResponseCache.DEFAULT_TTL - 1
+    assert cache.get(('ctx', 'ns', 'secrets')) == ('secrets', True)
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = ResponseCache(max_entries=2)
+    cache.put(('ctx', 'a', 'pods'), 1)
+    cache.put(('ctx', 'b', 'pods'), 2)
+    cache.get(('ctx', 'a', 'pods'))
+    cache.put(('ctx', 'c', 'pods'), 3)
+    assert cache.get(('ctx', 'b', 'pods')) == (None, False)
+    assert cache.get(('ctx', 'a', 'pods')) == (1, True) and cache.get(('ctx', 'c', 'pods')) == (3, True)
+
+
+def test_put_restarts_the_ttl(clock):
+    cache = ResponseCache(ttls={'pods': 10})
+    cache.put(('ctx', 'ns', 'pods'), 1)
+    clock.value += 20
+    cache.put(('ctx', 'ns', 'pods'), 2)
+    assert cache.get(('ctx', 'ns', 'pods')) == (2, True)
+
+
+def test_invalidate_one_or_all(clock):
+    cache = ResponseCache()
+    cache.put(('ctx', 'a', 'pods'), 1)
+    cache.put(('ctx', 'b', 'pods'), 2)
+    cache.invalidate(('ctx', 'a', 'pods'))
+    assert cache.get(('ctx', 'a', 'pods')) == (None, False) and cache.get(('ctx', 'b', 'pods')) == (2, True)
+    cache.invalidate()
+    assert cache.stats()['entries'] == 0
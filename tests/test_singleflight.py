@@ -0,0 +1,93 @@
+import threading
+import time
+
+import pytest
+
+from k8s.singleflight import SingleFlight
+
+
+def run_concurrently(count, target):
+    threads = [threading.Thread(target=target) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+
+def test_concurrent_identical_calls_share_one_call():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls, results = [], []
+
+    def fetch():
+        calls.append(1)
+        release.wait(5)
+        return 'pods'
+    threads = run_concurrently(5, lambda: results.append(flight.do(('ctx', 'ns', 'pods'), fetch)))
+    wait_for(lambda: flight.shared == 4)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert calls == [1]
+    assert results == ['pods'] * 5
+    assert flight.shared == 4
+
+
+def test_waiters_get_the_leader_s_exception():
+    flight = SingleFlight()
+    release = threading.Event()
+    errors = []
+
+    def fail():
+        release.wait(5)
+        raise RuntimeError('API unavailable')
+
+    def call():
+        try:
+            flight.do('key', fail)
+        except RuntimeError as e:
+            errors.append(str(e))
+    threads = run_concurrently(3, call)
+    wait_for(lambda: flight.shared == 2)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert errors == ['API unavailable'] * 3
+
+
+def test_a_finished_call_frees_its_key():
+    flight = SingleFlight()
+    assert flight.do('key', lambda: 1) == 1
+    assert flight.do('key', lambda: 2) == 2
+    with pytest.raises(ValueError):
+        flight.do('key', lambda: int('x'))
+    assert flight.calls == {} and flight.shared == 0
+
+
+def test_waiters_get_errors_that_are_not_exceptions():
+    class Stop(BaseException):
+        pass
+    flight = SingleFlight()
+    release = threading.Event()
+    errors = []
+
+    def stop():
+        release.wait(5)
+        raise Stop()
+
+    def call():
+        try:
+            flight.do('key', stop)
+        except Stop:
+            errors.append('stopped')
+    threads = run_concurrently(2, call)
+    wait_for(lambda: flight.shared == 1)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert errors == ['stopped'] * 2
@@ -0,0 +1,88 @@
+import json
+import os
+import time
+
+import pytest
+
+from ui.snapshot_store import SnapshotStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SnapshotStore(tmp_path / 'snapshots')
+    yield store
+    store.close()
+
+
+def written(store, run_until):
+    """Wait until every snapshot put so far is on disk and its size recorded."""
+    store.writer.submit(lambda: None).result(5)
+    return run_until(lambda: not store.pending)
+
+
+def test_put_then_get_reads_the_file_lazily(store, run_until):
+    store.put('aks-1', 'default', 'pods', [['api-1', 'Running']])
+    assert store.get('aks-1', 'default', 'pods')['items'] == [['api-1', 'Running']]
+    assert written(store, run_until)
+    store.recent.clear()
+    assert store.get('aks-1', 'default', 'pods')['items'] == [['api-1', 'Running']]
+    assert store.get('aks-1', 'default', 'secrets') is None
+
+
+def test_oldest_snapshots_are_evicted_beyond_max_snapshots(store, run_until):
+    store.MAX_SNAPSHOTS = 3
+    for index in range(5):
+        store.put(f"aks-{index}", 'default', 'secrets', ['token'])
+        time.sleep(0.001)
+    assert written(store, run_until)
+    assert sorted(store.snapshot_keys()) == [f"aks-{index}|default|secrets" for index in (2, 3, 4)]
+    assert sorted(name for name in os.listdir(store.directory) if name != 'index.json') == ['aks-2%7Cdefault%7Csecrets.json', 'aks-3%7Cdefault%7Csecrets.json', 'aks-4%7Cdefault%7Csecrets.json']
+    assert store.get('aks-0', 'default', 'secrets') is None
+
+
+def test_oldest_snapshots_are_evicted_beyond_max_bytes(store, run_until):
+    store.MAX_BYTES = 2500
+    for index in range(5):
+        store.put(f"aks-{index}", 'default', 'pods', ['x' * 100] * 10)  # About 1 KB a file
+        time.sleep(0.001)
+        assert written(store, run_until)
+    assert sorted(store.snapshot_keys()) == ['aks-3|default|pods', 'aks-4|default|pods']
+    assert sum(store.index.get(key)['bytes'] for key in store.snapshot_keys()) <= store.MAX_BYTES
+
+
+def test_lists_beyond_max_items_replace_the_snapshot_with_none(store):
+    store.put('aks-1', 'default', 'pods', ['pod'])
+    store.put('aks-1', 'default', 'pods', ['pod'] * (store.MAX_ITEMS + 1))
+    assert store.get('aks-1', 'default', 'pods') is None
+
+
+def test_expired_snapshots_are_not_served(store):
+    store.put('aks-1', 'default', 'pods', ['pod'])
+    store.index.put('aks-1|default|pods', dict(store.index.get('aks-1|default|pods'), saved=time.time() - store.MAX_AGE - 1))
+    assert store.get('aks-1', 'default', 'pods') is None
+
+
+def test_snapshots_survive_a_restart_and_stray_files_do_not(tmp_path, run_until):
+    store = SnapshotStore(tmp_path / 'snapshots')
+    store.put('aks-1', 'default', 'pods', ['pod'])
+    assert written(store, run_until)
+    store.close()
+    (tmp_path / 'snapshots' / 'stray.json').write_text('{}')
+    reopened = SnapshotStore(tmp_path / 'snapshots')
+    reopened.close()
+    assert reopened.get('aks-1', 'default', 'pods')['items'] == ['pod']
+    assert not (tmp_path / 'snapshots' / 'stray.json').exists()
+
+
+def test_an_index_of_another_version_is_discarded_with_the_files(tmp_path, run_until):
+    store = SnapshotStore(tmp_path / 'snapshots')
+    store.put('aks-1', 'default', 'pods', ['pod'])
+    assert written(store, run_until)
+    store.close()
+    index_path = tmp_path / 'snapshots' / 'index.json'
+    index_path.write_text(json.dumps(dict(json.loads(index_path.read_text()), version=SnapshotStore.VERSION + 1)))
+    reopened = SnapshotStore(tmp_path / 'snapshots')
+    reopened.close()
+    assert reopened.snapshot_keys() == []
+    assert sorted(path.name for path in (tmp_path / 'snapshots').iterdir()) == ['index.json']
+    assert json.loads(index_path.read_text()) == {'version': SnapshotStore.VERSION}
@@ -1,30 +1,111 @@
-from kivy.storage.jsonstore import JsonStore
+import json
 import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from kivy.clock import Clock
+from kivy.logger import Logger
+
+def write_json(path, data):
+    """Write data as JSON to a temporary file that then replaces path; returns its size, or None if it failed."""
+    try:
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), prefix='.' + os.path.basename(path), suffix='.tmp')
+    except OSError:
+        return None
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, separators=(',', ':'))
+            f.flush()
+            os.fsync(f.fileno())
+            size = os.fstat(f.fileno()).st_size
+        os.replace(temp_path, path)
+        return size
+    except OSError:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        return None
 
 class CacheManager:
+    """JSON key-value cache, read once into memory and written back in batches.
+
+    Reads are served from memory. Updates mark the cache dirty and schedule a
+    write FLUSH_DELAY seconds later, so a burst of updates costs one write. The
+    file is written off the UI thread to a temporary file that then replaces
+    it atomically, so a crash mid-write leaves the previous version intact.
+    A write that fails is logged and retried RETRY_DELAY seconds later.
+    """
+    FLUSH_DELAY = 0.5  # Seconds
+    RETRY_DELAY = 5  # Seconds
+
     def __init__(self, file_path="./cache.json"):
-        self.file_path = os.path.expanduser(file_path)
+        self.file_path = os.path.abspath(os.path.expanduser(file_path))  # Flushes go here even if the working directory changes
         os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
-        self.store = JsonStore(self.file_path)
+        self.data = self.read()
+        self.writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='cache-writer')  # One write at a time, in order
+        self.flush_trigger = Clock.create_trigger(self.flush, self.FLUSH_DELAY)
+        self.closed = False
+
+    def read(self):
+        try:
+            with open(self.file_path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def get(self, key, default=None):
+        return self.data.get(key, default)
+
+    def keys(self):
+        return list(self.data)
+
+    def put(self, key, value):
+        self.update({key: value})
+
+    def update(self, entries):
+        """Set several keys as one batch: they reach the file in the same write."""
+        self.data.update(entries)
+        self.flush_trigger()
+
+    def delete(self, *keys):
+        removed = [key for key in keys if self.data.pop(key, None) is not None]
+        if removed:
+            self.flush_trigger()
+
+    def clear(self):
+        self.data = {}
+        self.flush_trigger()
+
+    def flush(self, *args):
+        """Write the current contents in the background; returns the write's future."""
+        self.flush_trigger.cancel()
+        return self.writer.submit(self.write, dict(self.data))  # Values are replaced, never mutated, so a shallow copy is a snapshot
+
+    def close(self):
+        """Write pending updates and wait for them, e.g. when the app stops."""
+        self.flush().result()
+        self.closed = True
+        self.writer.shutdown()
+
+    def write(self, data):
+        if write_json(self.file_path, data) is None:
+            Logger.warning(f"CacheManager: writing {self.file_path} failed, retrying in {self.RETRY_DELAY}s")
+            Clock.schedule_once(self.retry, self.RETRY_DELAY)  # Scheduling is safe from the writer thread
+
+    def retry(self, dt):
+        if not self.closed:
+            self.flush()
 
     def save_selections(self, selections):
         """Save spinner selections to JSON file."""
-        for key, value in selections.items():
-            self.store.put(key, value=value)
+        self.update({key: {'value': value} for key, value in selections.items()})
 
     def load_selections(self, defaults, valid_options):
         """Load selections, validate against valid_options, and return valid values."""
         selections = {}
         for dropdown, default_value in defaults.items():
-            try:
-                if self.store.exists(dropdown):
-                    stored_value = self.store.get(dropdown)["value"]
-                    if stored_value in valid_options[dropdown]:
-                        selections[dropdown] = stored_value
-                    else:
-                        selections[dropdown] = default_value
-                else:
-                    selections[dropdown] = default_value
-            except (KeyError, FileNotFoundError, OSError):
-                selections[dropdown] = default_value
-        return selections
\ No newline at end of file
+            stored = self.data.get(dropdown)
+            stored_value = stored.get('value') if isinstance(stored, dict) else None
+            selections[dropdown] = stored_value if stored_value in valid_options[dropdown] else default_value
+        return selections
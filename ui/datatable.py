@@ -3,6 +3,9 @@ from kivy.uix.label import Label
 from kivy.uix.scrollview import ScrollView
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.behaviors import ButtonBehavior
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
 from kivy.metrics import dp
 from kivy.properties import BooleanProperty, ObjectProperty
 from kivy.graphics import Color, Rectangle
@@ -68,17 +71,92 @@ class DataTableRow(BoxLayout):
         for cell in self.cells:
             cell.bg_color.rgba = color
 
+    def set_values(self, row_data):
+        """Update only the cells whose text changed."""
+        for cell, cell_data in zip(self.cells, row_data):
+            text = str(cell_data)
+            if cell.text != text:
+                cell.text = text
+
+    def set_index(self, row_index):
+        """Move the row to a new position, restriping its background."""
+        for cell in self.cells:
+            cell.row_index = row_index
+        bg_color = colors.DATATABLE_EVEN_ROW_BG_COLOR if row_index % 2 == 0 else colors.DATATABLE_ODD_ROW_BG_COLOR
+        if bg_color != self.bg_color_default:
+            self.bg_color_default = bg_color
+            self.update_colors()
+
+class DataTableRecycleRow(RecycleDataViewBehavior, BoxLayout):
+    """Row view reused by the RecycleView for whichever data row is scrolled into view."""
+    table = ObjectProperty(None)
+
+    def __init__(self, **kwargs):
+        super().__init__(orientation='horizontal', **kwargs)
+        self.index = None
+        self.cells = []
+
+    def refresh_view_attrs(self, rv, index, data):
+        """Rebind this view to the data row at index."""
+        self.table = rv.table
+        self.index = index
+        values = data['values']
+        if len(self.cells) != len(values):
+            self.clear_widgets()
+            self.cells = []
+            for i in range(len(values)):
+                cell = DataTableCell(row_index=index, size_hint_x=None, width=self.table.column_widths[i])
+                self.add_widget(cell)
+                self.cells.append(cell)
+        for cell, value in zip(self.cells, values):
+            cell.row_index = index
+            cell.text = str(value)
+        self.update_colors()
+
+    def update_colors(self):
+        if self.index is None:
+            return
+        if self.index == self.table.selected_row_index:
+            color = colors.DATATABLE_ROW_SELECTED_BG_COLOR
+        elif self.index % 2 == 0:
+            color = colors.DATATABLE_EVEN_ROW_BG_COLOR
+        else:
+            color = colors.DATATABLE_ODD_ROW_BG_COLOR
+        for cell in self.cells:
+            cell.bg_color.rgba = color
+
+class DataTableRecycleView(RecycleView):
+    table = ObjectProperty(None)
+
 class CustomDataTable(BoxLayout, EventDispatcher):
+    """Table with a fixed header and scrollable rows.
+
+    With virtualized=True rows are rendered through a RecycleView: only the rows
+    currently in view get widgets, and those widgets are reused while scrolling,
+    so the widget count does not grow with len(row_data).
+
+    Rows are identified by their first key_columns columns, e.g. 2 for rows that
+    are only unique per (cluster, pod name). Inserts and removals are applied to
+    the rows in place, so a watch event costs about as much as the rows it
+    changes rather than the table size.
+    """
     __events__ = ('on_row_select',)
+    ROW_HEIGHT = dp(30)
+    BULK_CHANGES = 256  # Scattered inserts or removed runs beyond which all rows are replaced at once
 
-    def __init__(self, column_data, row_data, column_widths=None, **kwargs):
+    def __init__(self, column_data, row_data, column_widths=None, virtualized=False, key_columns=1, **kwargs):
         super().__init__(orientation='vertical', **kwargs)
         EventDispatcher.__init__(self)
         self.column_data = column_data
         self.row_data = row_data
         self.column_widths = column_widths or [dp(100)] * len(column_data)
-        self.rows = []
+        self.virtualized = virtualized
+        self.key_columns = key_columns
+        self.rows = []  # Row widgets (non-virtualized mode only)
+        self.keys = []  # Row keys, in row_data order
+        self.positions = {}  # Row key -> position in row_data
         self.selected_row_index = None
+        self._scroll_restore = None
 
         # Header layout
         self.header_layout = GridLayout(cols=len(column_data), size_hint=(None, None), height=dp(30))
@@ -89,18 +167,31 @@ class CustomDataTable(BoxLayout, EventDispatcher):
         self.add_widget(self.header_layout)
 
         # Scrollable content
-        self.scroll_view = ScrollView(
+        scroll_kwargs = dict(
             do_scroll_x=True,
             do_scroll_y=True,
             scroll_type=['bars', 'content'],
             bar_width=dp(10),
         )
-        self.row_container = BoxLayout(orientation='vertical', size_hint=(None, None))
-        self.row_container.bind(minimum_height=self.row_container.setter('height'))
-        self.row_container.bind(minimum_width=self.setter('minimum_width'))
-        self.update_row_data(row_data)
-
-        self.scroll_view.add_widget(self.row_container)
+        if virtualized:
+            self.scroll_view = DataTableRecycleView(table=self, **scroll_kwargs)
+            self.row_container = RecycleBoxLayout(
+                orientation='vertical',
+                size_hint=(None, None),
+                default_size=(None, self.ROW_HEIGHT),
+                default_size_hint=(None, None),
+            )
+            self.row_container.bind(minimum_height=self.row_container.setter('height'))
+            self.scroll_view.add_widget(self.row_container)
+            self.scroll_view.viewclass = DataTableRecycleRow
+            self.update_row_data(row_data)
+        else:
+            self.scroll_view = ScrollView(**scroll_kwargs)
+            self.row_container = BoxLayout(orientation='vertical', size_hint=(None, None))
+            self.row_container.bind(minimum_height=self.row_container.setter('height'))
+            self.row_container.bind(minimum_width=self.setter('minimum_width'))
+            self.update_row_data(row_data)
+            self.scroll_view.add_widget(self.row_container)
         self.add_widget(self.scroll_view)
 
         # Bind scroll_x for header alignment and debug
@@ -112,29 +203,220 @@ class CustomDataTable(BoxLayout, EventDispatcher):
 
     def update_row_data(self, row_data):
         """Update table with new row data."""
-        self.row_container.clear_widgets()
-        self.rows = []
         self.selected_row_index = None
-        self.row_data = row_data
+        self.row_data = list(row_data)
+        self._reindex()
         total_width = sum([w.value if hasattr(w, 'value') else w for w in self.column_widths])
         self.row_container.width = total_width
         self.header_layout.width = total_width
+        if self.virtualized:
+            self.row_container.default_size = (total_width, self.ROW_HEIGHT)
+            self.scroll_view.data = [{'values': row} for row in row_data]
+            return
+        self.row_container.clear_widgets()
+        self.rows = []
         for i, row in enumerate(row_data):
             bg_color = colors.DATATABLE_EVEN_ROW_BG_COLOR if i % 2 == 0 else colors.DATATABLE_ODD_ROW_BG_COLOR
             row_widget = DataTableRow(row, self.column_widths, bg_color, table=self)
             self.row_container.add_widget(row_widget)
             self.rows.append(row_widget)
 
+    def row_key(self, row):
+        """Rows are keyed on their first column (e.g. pod name), or a tuple of the first key_columns."""
+        return row[0] if self.key_columns == 1 else tuple(row[:self.key_columns])
+
+    @property
+    def selected_key(self):
+        if self.selected_row_index is None:
+            return None
+        return self.row_key(self.row_data[self.selected_row_index])
+
+    def index_of(self, key):
+        """Return the position of the row with the given key, or None."""
+        return self.positions.get(key)
+
+    def _reindex(self, start=0):
+        """Bring the key -> position map up to date for the rows from start on."""
+        if start == 0:
+            self.keys = [self.row_key(row) for row in self.row_data]
+            self.positions = {}
+        self.positions.update(zip(self.keys[start:], range(start, len(self.keys))))
+
+    def sync_row_data(self, row_data):
+        """Bring the table in line with row_data by diffing on row keys.
+
+        Unlike update_row_data this only touches rows that were inserted, removed
+        or changed, and keeps the current selection and scroll position.
+        """
+        new_keys = {self.row_key(row) for row in row_data}
+        self.remove_rows([key for key in self.positions if key not in new_keys])
+        self.upsert_rows(row_data, index=0)
+
+    def upsert_rows(self, rows, index=None):
+        """Insert or update rows by key.
+
+        Existing rows are updated in place. New rows are inserted starting at index
+        (appended when None) in the order given, each one after the previous row of
+        the batch. Returns the position just after the last row of the batch, so
+        consecutive batches can be chained.
+        """
+        positions = self.positions
+        cursor = len(self.row_data) if index is None else min(index, len(self.row_data))
+        inserts = []
+        for row in rows:
+            i = positions.get(self.row_key(row))
+            if i is None:
+                inserts.append((cursor, row))
+                continue
+            if self.row_data[i] != row:
+                self.row_data[i] = row  # Same key, so keys and positions still hold
+                if self.virtualized:
+                    self.scroll_view.data[i] = {'values': row}
+                else:
+                    self.rows[i].set_values(row)
+            cursor = i + 1
+        if inserts:
+            self._insert_rows(inserts)
+        if not rows:
+            return cursor
+        return self.index_of(self.row_key(rows[-1])) + 1
+
+    def remove_rows(self, keys):
+        """Remove the rows with the given keys."""
+        removed = sorted({self.positions[key] for key in keys if key in self.positions})
+        if not removed:
+            return
+        selected_key = self.selected_key
+        self._keep_scroll_position()
+        runs = []  # [start, stop) of consecutive removed rows
+        for i in removed:
+            if runs and runs[-1][1] == i:
+                runs[-1][1] = i + 1
+            else:
+                runs.append([i, i + 1])
+        if len(runs) > self.BULK_CHANGES:
+            removed_set = set(removed)
+            self._resync([row for i, row in enumerate(self.row_data) if i not in removed_set])
+        else:
+            for start, stop in reversed(runs):  # Back to front, so earlier positions stay valid
+                for key in self.keys[start:stop]:
+                    del self.positions[key]
+                del self.keys[start:stop]
+                del self.row_data[start:stop]
+                if self.virtualized:
+                    del self.scroll_view.data[start:stop]
+                else:
+                    for row_widget in self.rows[start:stop]:
+                        self.row_container.remove_widget(row_widget)
+                    del self.rows[start:stop]
+            self._reindex(removed[0])
+        self._restore_selection(selected_key, renumber_from=removed[0])
+
+    def _insert_rows(self, inserts):
+        """Insert (position, row) pairs, positions relative to the current rows."""
+        selected_key = self.selected_key
+        self._keep_scroll_position()
+        inserts.sort(key=lambda item: item[0])  # Stable: keeps batch order at equal positions
+        first = inserts[0][0]
+        if len(inserts) > self.BULK_CHANGES and inserts[0][0] != len(self.row_data):
+            merged, k = [], 0
+            for i in range(len(self.row_data) + 1):
+                while k < len(inserts) and inserts[k][0] == i:
+                    merged.append(inserts[k][1])
+                    k += 1
+                if i < len(self.row_data):
+                    merged.append(self.row_data[i])
+            self._resync(merged)
+        else:
+            for offset, (position, row) in enumerate(inserts):
+                self._insert_row(position + offset, row)
+            self._reindex(first)
+        self._restore_selection(selected_key, renumber_from=first)
+
+    def _insert_row(self, position, row):
+        """Insert one row before position, touching only that row's view."""
+        self.row_data.insert(position, row)
+        self.keys.insert(position, self.row_key(row))
+        if self.virtualized:
+            if position == len(self.scroll_view.data):
+                self.scroll_view.data.append({'values': row})
+            else:
+                self.scroll_view.data.insert(position, {'values': row})
+            return
+        bg_color = colors.DATATABLE_EVEN_ROW_BG_COLOR if position % 2 == 0 else colors.DATATABLE_ODD_ROW_BG_COLOR
+        row_widget = DataTableRow(row, self.column_widths, bg_color, table=self)
+        # Children are stored in reverse display order
+        self.row_container.add_widget(row_widget, index=len(self.row_container.children) - position)
+        self.rows.insert(position, row_widget)
+
+    def _resync(self, row_data):
+        """Replace every row at once, for changes too scattered to apply one by one.
+
+        Rows are either kept rows or new ones; kept row widgets are reused.
+        """
+        if self.virtualized:
+            self.row_data = row_data
+            self._reindex()
+            self.scroll_view.data = [{'values': row} for row in row_data]
+            return
+        widgets = {self.row_key(row): row_widget for row, row_widget in zip(self.row_data, self.rows)}
+        self.row_data = row_data
+        self._reindex()
+        self.row_container.clear_widgets()
+        self.rows = []
+        for i, row in enumerate(row_data):
+            row_widget = widgets.get(self.row_key(row))
+            if row_widget is None:
+                bg_color = colors.DATATABLE_EVEN_ROW_BG_COLOR if i % 2 == 0 else colors.DATATABLE_ODD_ROW_BG_COLOR
+                row_widget = DataTableRow(row, self.column_widths, bg_color, table=self)
+            self.row_container.add_widget(row_widget)
+            self.rows.append(row_widget)
+
+    def _restore_selection(self, selected_key, renumber_from=0):
+        """Re-resolve the selected row by key after rows moved."""
+        self.selected_row_index = None if selected_key is None else self.index_of(selected_key)
+        if self.virtualized:
+            for row in self.row_container.children:
+                row.update_colors()
+            return
+        for i in range(renumber_from, len(self.rows)):
+            row_widget = self.rows[i]
+            row_widget.set_index(i)
+            if row_widget.selected != (i == self.selected_row_index):
+                row_widget.selected = (i == self.selected_row_index)
+                row_widget.update_colors()
+
+    def _keep_scroll_position(self):
+        """Hold the content at the same distance from the top once the row count changes."""
+        viewport = self.scroll_view.height
+        content = self.row_container.height
+        if self._scroll_restore or content <= viewport:
+            return
+        offset = (1 - self.scroll_view.scroll_y) * (content - viewport)
+
+        def restore(instance, height):
+            instance.unbind(height=restore)
+            self._scroll_restore = None
+            if height > viewport:
+                self.scroll_view.scroll_y = max(0, min(1, 1 - offset / (height - viewport)))
+        self._scroll_restore = restore
+        self.row_container.bind(height=restore)
+
     def select_row(self, row_index):
         """Select a row and dispatch on_row_select event."""
-        if row_index < 0 or row_index >= len(self.rows):
+        if row_index < 0 or row_index >= len(self.row_data):
             return
         self.selected_row_index = row_index
-        for i, row in enumerate(self.rows):
-            row.selected = (i == row_index)
-            row.update_colors()
+        if self.virtualized:
+            # Only the recycled views currently on screen need repainting
+            for row in self.row_container.children:
+                row.update_colors()
+        else:
+            for i, row in enumerate(self.rows):
+                row.selected = (i == row_index)
+                row.update_colors()
         if row_index < len(self.row_data):
-            self.dispatch('on_row_select', self.row_data[row_index][0])
+            self.dispatch('on_row_select', self.row_key(self.row_data[row_index]))
 
     def on_row_select(self, value):
         """Default handler for row selection."""
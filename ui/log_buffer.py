@@ -0,0 +1,126 @@
+class LogBuffer:
+    """Line-oriented ring buffer holding the most recent lines of a log.
+
+    Lines are numbered from 0 in the order they were appended. Once the buffer
+    holds more than max_lines lines or max_chars characters the oldest lines are
+    dropped, so first_line moves forward while line numbers stay stable. Appending
+    is O(1) per line and reading a window costs only the lines returned. The ring
+    grows with the log up to max_lines slots, so a short log costs little.
+
+    A lowercased copy of every line is kept alongside, so case-insensitive
+    filtering does not have to lowercase the whole log on every query. Copies
+    count towards max_chars; a line that is already lowercase shares its copy.
+    """
+    MIN_CAPACITY = 1024  # Slots of a ring that has not grown yet
+
+    def __init__(self, max_lines=200000, max_chars=64 * 1024 * 1024):
+        self.max_lines = max_lines
+        self.max_chars = max_chars
+        self.clear()
+
+    def clear(self):
+        self.lines = []
+        self.lower_lines = []
+        self.head = 0  # Slot of the oldest line
+        self.count = 0
+        self.chars = 0  # Characters of the lines and of their distinct lowercased copies
+        self.first_line = 0  # Number of the oldest line still held
+        self.open_line = False  # Last line had no trailing newline yet
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def capacity(self):
+        return len(self.lines)
+
+    @property
+    def end_line(self):
+        """Number one past the newest line."""
+        return self.first_line + self.count
+
+    @property
+    def dropped(self):
+        """Lines evicted since the last clear."""
+        return self.first_line
+
+    def append(self, text):
+        """Append raw text; a trailing partial line is completed by the next append."""
+        if not text:
+            return
+        parts = text.split('\n')
+        if self.open_line:
+            last = (self.head + self.count - 1) % self.capacity
+            self.chars -= self._size(last)
+            self._store(last, self.lines[last] + parts[0])
+            parts = parts[1:]
+        if parts:  # Otherwise the open line is still open
+            self.open_line = parts[-1] != ''
+            if not self.open_line:
+                parts.pop()
+        for line in parts:
+            self._push(line)
+        while self.chars > self.max_chars and self.count > 1:
+            self._pop()
+
+    def _store(self, slot, line):
+        lower = line.lower()
+        self.lines[slot] = line
+        self.lower_lines[slot] = line if lower == line else lower
+        self.chars += self._size(slot)
+
+    def _size(self, slot):
+        line = self.lines[slot]
+        return len(line) if self.lower_lines[slot] is line else 2 * len(line)
+
+    def _push(self, line):
+        if self.count == self.max_lines:
+            self._pop()
+        elif self.count == self.capacity:
+            self._grow()
+        self._store((self.head + self.count) % self.capacity, line)
+        self.count += 1
+
+    def _grow(self):
+        """Double the ring, up to max_lines slots, with the oldest line moved to slot 0."""
+        extra = min(max(self.capacity, self.MIN_CAPACITY), self.max_lines - self.capacity)
+        self.lines = self.lines[self.head:] + self.lines[:self.head] + [None] * extra
+        self.lower_lines = self.lower_lines[self.head:] + self.lower_lines[:self.head] + [None] * extra
+        self.head = 0
+
+    def _pop(self):
+        self.chars -= self._size(self.head)
+        self.lines[self.head] = None
+        self.lower_lines[self.head] = None
+        self.head = (self.head + 1) % self.capacity
+        self.count -= 1
+        self.first_line += 1
+
+    def line(self, number):
+        """Return line by number, or None if it was dropped."""
+        if number < self.first_line or number >= self.end_line:
+            return None
+        return self.lines[(self.head + number - self.first_line) % self.capacity]
+
+    def window(self, start, count):
+        """Return up to count lines starting at line number start."""
+        return self._window(self.lines, start, count)
+
+    def window_lower(self, start, count):
+        """Like window, but from the lowercased copy."""
+        return self._window(self.lower_lines, start, count)
+
+    def _window(self, ring, start, count):
+        start = max(start, self.first_line)
+        stop = min(start + count, self.end_line)
+        if stop <= start:
+            return []
+        begin = (self.head + start - self.first_line) % self.capacity
+        end = begin + (stop - start)
+        if end <= self.capacity:
+            return ring[begin:end]
+        return ring[begin:] + ring[:end - self.capacity]
+
+    def tail(self, count):
+        """Return the newest count lines."""
+        return self.window(self.end_line - count, count)
@@ -0,0 +1,131 @@
+import re
+import threading
+from functools import lru_cache
+from kivy.clock import Clock
+
+TOKEN_PATTERN = re.compile(r'-?"[^"]*"|\S+')
+
+
+@lru_cache(maxsize=64)
+def compile_pattern(pattern):
+    """Compile a filter regex once; repeated queries reuse the cached pattern."""
+    return re.compile(pattern, re.IGNORECASE)
+
+
+def parse_query(query):
+    """Turn a filter query into a predicate over a lowercased line.
+
+    Terms separated by spaces must all match (AND); OR separates alternatives.
+    A term prefixed with - or NOT must not match. /regex/ or re:regex is a regular
+    expression, "quoted text" a literal with spaces, anything else a substring.
+    Returns None for an empty query; raises ValueError for a malformed one.
+    """
+    tokens = TOKEN_PATTERN.findall(query)
+    groups = [[]]
+    negate = False
+    for token in tokens:
+        if token == 'OR':
+            groups.append([])
+            continue
+        if token == 'NOT':
+            negate = True
+            continue
+        if token.startswith('-') and len(token) > 1:
+            negate, token = True, token[1:]
+        if len(token) > 1 and token.startswith('"') and token.endswith('"'):
+            token = token[1:-1]
+        groups[-1].append((negate, _term_matcher(token)))
+        negate = False
+    groups = [group for group in groups if group]
+    if not groups:
+        return None
+    if len(groups) == 1 and len(groups[0]) == 1 and not groups[0][0][0]:
+        return groups[0][0][1]
+
+    def matches(line):
+        return any(all(match(line) != negated for negated, match in group) for group in groups)
+    return matches
+
+
+def _term_matcher(token):
+    if token.startswith('re:') or (len(token) > 2 and token.startswith('/') and token.endswith('/')):
+        pattern = token[3:] if token.startswith('re:') else token[1:-1]
+        try:
+            search = compile_pattern(pattern).search
+        except re.error as e:
+            raise ValueError(f"Invalid regex {pattern!r}: {e}")
+        return lambda line: search(line) is not None
+    needle = token.lower()
+    matcher = lambda line: needle in line
+    matcher.needle = needle  # Lets plain substring queries skip the per-line call
+    return matcher
+
+
+class LogFilter:
+    """Runs filter queries over log lines on a worker thread.
+
+    Only the newest query is kept: submitting one cancels any query still
+    running, and results of superseded queries are never delivered. Results are
+    passed to on_result(matches, error) on the Kivy thread, where matches is a
+    list of matching line numbers.
+    """
+    CHUNK_LINES = 20000  # Lines scanned between cancellation checks
+
+    def __init__(self, on_result):
+        self.on_result = on_result
+        self.generation = 0
+        self.job = None
+        self.condition = threading.Condition()
+        self.thread = None
+
+    def submit(self, query, lines, first_line):
+        """Filter lowercased lines numbered from first_line with query."""
+        with self.condition:
+            self.generation += 1
+            self.job = (self.generation, query, lines, first_line)
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, daemon=True)
+                self.thread.start()
+            self.condition.notify()
+
+    def cancel(self):
+        """Drop the running query, if any."""
+        with self.condition:
+            self.generation += 1
+            self.job = None
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while self.job is None:
+                    self.condition.wait()
+                generation, query, lines, first_line = self.job
+                self.job = None
+            try:
+                matches = self._filter(generation, parse_query(query), lines, first_line)
+                error = None
+            except ValueError as e:
+                matches, error = [], str(e)
+            if matches is not None:
+                Clock.schedule_once(lambda dt, generation=generation, matches=matches, error=error: self._deliver(generation, matches, error), 0)
+
+    def _filter(self, generation, matches_line, lines, first_line):
+        """Return matching line numbers, or None if the query was superseded."""
+        if matches_line is None:
+            return list(range(first_line, first_line + len(lines)))
+        needle = getattr(matches_line, 'needle', None)
+        matches = []
+        for offset in range(0, len(lines), self.CHUNK_LINES):
+            if generation != self.generation:
+                return None
+            chunk = lines[offset:offset + self.CHUNK_LINES]
+            start = first_line + offset
+            if needle is not None:
+                matches.extend(number for number, line in enumerate(chunk, start=start) if needle in line)
+            else:
+                matches.extend(number for number, line in enumerate(chunk, start=start) if matches_line(line))
+        return matches
+
+    def _deliver(self, generation, matches, error):
+        if generation == self.generation:
+            self.on_result(matches, error)
@@ -0,0 +1,141 @@
+import json
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from urllib.parse import quote
+from humanize import naturaltime
+from kivy.clock import Clock
+from ui.cache import CacheManager, write_json
+
+class SnapshotStore:
+    """Last fetched pods, secrets and deployments per cluster and namespace, kept across runs.
+
+    Snapshots let a tab show data the moment the app opens or a namespace is
+    selected, marked stale until a fresh list replaces it. Each snapshot is a
+    file of its own in directory, written off the UI thread and only read when
+    it is shown. A CacheManager index, tagged with VERSION, records when each
+    was saved and its size; an index of another version is discarded with the
+    files. Snapshots older than MAX_AGE are dropped, lists longer than
+    MAX_ITEMS are not kept, and beyond MAX_SNAPSHOTS or MAX_BYTES the oldest
+    are evicted.
+    """
+    VERSION = 1
+    MAX_SNAPSHOTS = 100
+    MAX_ITEMS = 20000  # Items of one snapshot; a 20k pod list is about 1.5 MB
+    MAX_BYTES = 100 * 1024 * 1024  # Of all snapshot files together
+    MAX_AGE = 7 * 24 * 3600  # Seconds
+    RECENT = 3  # Snapshots kept in memory, e.g. the pods, secrets and deployments shown
+
+    def __init__(self, directory="./snapshots"):
+        self.directory = os.path.abspath(os.path.expanduser(directory))
+        self.index = CacheManager(os.path.join(self.directory, 'index.json'))  # key -> {'saved', 'bytes'}
+        self.writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='snapshot-writer')  # Files change in the order they are put
+        self.pending = {}  # key -> snapshot put but not written yet
+        self.recent = OrderedDict()  # key -> snapshot, the RECENT last read or put
+        if self.index.get('version') != self.VERSION:
+            self.index.clear()
+            self.index.put('version', self.VERSION)
+        self.delete(*[key for key in self.snapshot_keys() if self.expired(self.index.get(key))])
+        known = {self.file_name(key) for key in self.snapshot_keys()} | {'index.json'}
+        orphans = [name for name in os.listdir(self.directory) if name.endswith('.json') and name not in known]  # Of other versions and failed writes
+        self.writer.submit(self.remove_files, [os.path.join(self.directory, name) for name in orphans])
+
+    def key(self, cluster, namespace, kind):
+        return f"{cluster}|{namespace}|{kind}"
+
+    def file_name(self, key):
+        return quote(key, safe='') + '.json'
+
+    def snapshot_keys(self):
+        return [key for key in self.index.keys() if key != 'version']
+
+    def expired(self, snapshot):
+        return snapshot['saved'] < time.time() - self.MAX_AGE
+
+    def get(self, cluster, namespace, kind):
+        """The snapshot {'saved', 'items'} of kind in cluster and namespace, or None; read from its file unless recent."""
+        key = self.key(cluster, namespace, kind)
+        entry = self.index.get(key)
+        if entry is None or self.expired(entry):
+            return None
+        snapshot = self.pending.get(key) or self.recent.get(key)
+        if snapshot is None:
+            try:
+                with open(os.path.join(self.directory, self.file_name(key))) as f:
+                    snapshot = json.load(f)
+            except (OSError, ValueError):
+                return None
+        self.remember(key, snapshot)
+        return snapshot
+
+    def remember(self, key, snapshot):
+        self.recent[key] = snapshot
+        self.recent.move_to_end(key)
+        while len(self.recent) > self.RECENT:
+            self.recent.popitem(last=False)
+
+    def put(self, cluster, namespace, kind, items):
+        """Store items, a list of JSON-serializable values, as the latest snapshot."""
+        if not cluster or not namespace:
+            return
+        key = self.key(cluster, namespace, kind)
+        if len(items) > self.MAX_ITEMS:
+            self.delete(key)  # An outdated snapshot is worse than none
+            return
+        snapshot = {'saved': time.time(), 'items': list(items)}
+        self.pending[key] = snapshot
+        self.remember(key, snapshot)
+        self.index.put(key, {'saved': snapshot['saved'], 'bytes': self.index.get(key, {}).get('bytes', 0)})
+        future = self.writer.submit(write_json, os.path.join(self.directory, self.file_name(key)), snapshot)
+        future.add_done_callback(lambda future: Clock.schedule_once(lambda dt: self.written(key, snapshot, future.result()), 0))
+        self.evict()
+
+    def written(self, key, snapshot, size):
+        """Record the size of a snapshot's file once written, or drop the snapshot if writing it failed."""
+        if self.pending.get(key) is snapshot:
+            del self.pending[key]
+        entry = self.index.get(key)
+        if entry is None or entry['saved'] != snapshot['saved']:
+            return  # Replaced or deleted meanwhile
+        if size is None:
+            self.delete(key)
+        else:
+            self.index.put(key, dict(entry, bytes=size))
+            self.evict()
+
+    def evict(self):
+        """Delete the oldest snapshots beyond MAX_SNAPSHOTS or MAX_BYTES."""
+        keys = sorted(self.snapshot_keys(), key=lambda key: self.index.get(key)['saved'])
+        total = sum(self.index.get(key)['bytes'] for key in keys)
+        evicted = 0
+        while len(keys) - evicted > self.MAX_SNAPSHOTS or total > self.MAX_BYTES:
+            total -= self.index.get(keys[evicted])['bytes']
+            evicted += 1
+        self.delete(*keys[:evicted])
+
+    def delete(self, *keys):
+        if not keys:
+            return
+        self.index.delete(*keys)
+        for key in keys:
+            self.pending.pop(key, None)
+            self.recent.pop(key, None)
+        self.writer.submit(self.remove_files, [os.path.join(self.directory, self.file_name(key)) for key in keys])
+
+    def remove_files(self, paths):
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass  # Never written, or already gone
+
+    def close(self):
+        """Write pending snapshots and the index and wait for them, e.g. when the app stops."""
+        self.writer.shutdown()
+        self.index.close()
+
+    def stale_text(self, snapshot):
+        """Label marking data shown from snapshot."""
+        return f"Cached {naturaltime(timedelta(seconds=time.time() - snapshot['saved']))} - refreshing when connected"
@@ -0,0 +1,62 @@
+import builtins
+import sys
+import threading
+import time
+
+
+class StartupProfiler:
+    """Measures time to first frame, split into phases and per-module import times.
+
+    install() must run before the imports to be measured. Import times are self
+    times: a module's figure excludes the modules it imports in turn.
+    """
+    TOP_MODULES = 20  # Slowest imports listed in the report
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.phases = []  # (label, seconds since start)
+        self.import_times = {}  # module -> seconds spent importing it, excluding nested imports
+        self.nested = []  # Time of nested imports, one entry per import in progress
+        self.original_import = None
+
+    def install(self):
+        self.original_import = builtins.__import__
+        builtins.__import__ = self.timed_import
+
+    def uninstall(self):
+        if self.original_import is not None:
+            builtins.__import__ = self.original_import
+            self.original_import = None
+
+    def timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        if level or name in sys.modules or threading.current_thread() is not threading.main_thread():
+            return self.original_import(name, globals, locals, fromlist, level)
+        start = time.perf_counter()
+        self.nested.append(0.0)
+        try:
+            return self.original_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            nested = self.nested.pop()
+            self.import_times[name] = self.import_times.get(name, 0.0) + elapsed - nested
+            if self.nested:
+                self.nested[-1] += elapsed
+
+    def mark(self, label):
+        """Record the end of a startup phase."""
+        self.phases.append((label, time.perf_counter() - self.start))
+
+    def report(self):
+        """Return the measurements as text."""
+        lines = ["Startup profile"]
+        previous = 0.0
+        for label, at in self.phases:
+            lines.append(f"  {label:<24} {at * 1000:8.1f} ms  (+{(at - previous) * 1000:.1f} ms)")
+            previous = at
+        total_imports = sum(self.import_times.values())
+        lines.append(f"  Imports: {len(self.import_times)} modules, {total_imports * 1000:.1f} ms")
+        slowest = sorted(self.import_times.items(), key=lambda item: item[1], reverse=True)[:self.TOP_MODULES]
+        for name, seconds in slowest:
+            lines.append(f"    {seconds * 1000:8.1f} ms  {name}")
+        lines.append(f"  kubernetes SDK loaded: {'kubernetes' in sys.modules}")
+        return "\n".join(lines)
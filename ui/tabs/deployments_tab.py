@@ -5,53 +5,131 @@ from kivy.uix.button import Button
 from kivy.uix.scrollview import ScrollView
 from kivy.uix.gridlayout import GridLayout
 from kivy.uix.togglebutton import ToggleButton
+from kivy.uix.textinput import TextInput
+from kivy.uix.label import Label
+from kivy.metrics import dp
 from ui.popup import PopupManager
 from data.colors import *
 from kivymd.uix.button import MDRaisedButton
 
 
 class DeploymentsTab(MDFloatLayout, MDTabsBase):
-    def __init__(self, azure_client, namespace_spinner, **kwargs):
+    def __init__(self, azure_client, namespace_spinner, snapshot_store=None, **kwargs):
         super().__init__(title='Deployments', _md_bg_color=TAB_GRAY, **kwargs)  # Pass title to MDTabsBase
         self.azure_client = azure_client
         self.namespace_spinner = namespace_spinner
+        self.snapshot_store = snapshot_store
+        self.snapshot_scope = None  # (cluster, namespace) of the deployments being listed
+        self.stale_scope = None  # (cluster, namespace) of the snapshot shown, until fresh deployments replace it
         self.deployments_popup_manager = None  # Store PopupManager for get_deployments
+        self.commands_enabled = False
+        self.built = False  # Widgets are created when the tab is first shown
 
+    def build_content(self):
+        """Create the tab's widgets; deferred until the tab is first shown."""
+        if self.built:
+            return
+        self.built = True
         # Bind to AzureClient's on_deployments_output event
         self.azure_client.bind(on_deployments_output=self.on_deployments_output)
+        self.azure_client.bind(on_deployment_details=self.on_deployment_details)
 
         # UI
         self.content = BoxLayout(orientation='vertical')
-        self.get_deployments_button = MDRaisedButton(text='Get Deployments', size_hint=(1.0, None), height=40, disabled=True, md_bg_color=BUTTON_DARK_GRAY, text_color=WHITE)
+        self.get_deployments_button = MDRaisedButton(text='Get Deployments', size_hint=(1.0, None), height=40, disabled=not self.commands_enabled, md_bg_color=BUTTON_DARK_GRAY, text_color=WHITE)
         self.get_deployments_button.bind(on_press=self.get_deployments_button_callback)
         self.content.add_widget(self.get_deployments_button)
-        self.deployments_container = ScrollView(size_hint_y=0.9)
+        self.stale_label = Label(text="", size_hint=(1.0, None), height=0, color=BLACK)
+        self.content.add_widget(self.stale_label)
+        self.deployments_layout = BoxLayout(orientation='horizontal', size_hint_y=0.9)
+        self.deployments_container = ScrollView(size_hint_x=0.4)
         self.deployments_grid = GridLayout(cols=1, size_hint_y=None)
         self.deployments_grid.bind(minimum_height=self.deployments_grid.setter('height'))
         self.deployments_container.add_widget(self.deployments_grid)
-        self.content.add_widget(self.deployments_container)
+        self.deployments_layout.add_widget(self.deployments_container)
+        self.deployment_details = TextInput(multiline=True, readonly=True, size_hint_x=0.6)
+        self.deployments_layout.add_widget(self.deployment_details)
+        self.content.add_widget(self.deployments_layout)
         self.add_widget(self.content)
+        if self.stale_scope:
+            self.display_snapshot(self.snapshot_store.get(*self.stale_scope, 'deployments'))
+            self.refresh_snapshot()
+
+    def set_commands_enabled(self, enabled):
+        """Enable or disable the Get button and the deployments' details, now or once the tab is built."""
+        self.commands_enabled = enabled
+        if self.built:
+            self.get_deployments_button.disabled = not enabled
+            for button in self.deployments_grid.children:
+                button.disabled = not enabled  # Snapshot rows of a cluster not merged yet stay read-only
 
     def get_deployments_button_callback(self, instance):
         """Fetch deployments using AzureClient."""
         namespace = self.namespace_spinner.text
+        if self.deployments_popup_manager:
+            self.deployments_popup_manager.dismiss()
         self.deployments_popup_manager = PopupManager("Getting Deployments", "Fetching deployments...")
+        self.snapshot_scope = (self.azure_client.current_context, namespace)
         self.azure_client.get_deployments(namespace)
 
+    def show_snapshot(self, cluster, namespace):
+        """Show the deployments last listed in cluster and namespace, marked stale, now or once the tab is built."""
+        if (cluster, namespace) == self.stale_scope:
+            return
+        snapshot = self.snapshot_store.get(cluster, namespace, 'deployments') if self.snapshot_store else None
+        self.stale_scope = (cluster, namespace) if snapshot else None
+        if self.built:
+            self.display_snapshot(snapshot)
+
+    def display_snapshot(self, snapshot):
+        """Render a snapshot's deployments with the stale mark; None only clears the mark."""
+        if snapshot:
+            self.display_get_deployments_result("\n".join(snapshot['items']))
+        self.set_stale_text(self.snapshot_store.stale_text(snapshot) if snapshot else "")
+
+    def refresh_snapshot(self):
+        """List the deployments again in the background if a stale snapshot is shown."""
+        if self.stale_scope is None or not self.built or not self.commands_enabled:
+            return
+        self.snapshot_scope = self.stale_scope
+        self.azure_client.get_deployments(self.stale_scope[1])
+
+    def set_stale_text(self, text):
+        self.stale_label.text = text
+        self.stale_label.height = dp(20) if text else 0
+
     def on_deployments_output(self, instance, output):
         """Handle deployments output event from AzureClient."""
         self.display_get_deployments_result(output)
-        self.deployments_popup_manager.dismiss()
-        self.deployments_popup_manager = None
+        if self.snapshot_store and self.snapshot_scope and not output.startswith("Error"):
+            self.snapshot_store.put(*self.snapshot_scope, 'deployments', [line for line in output.strip().split('\n') if line])
+        self.stale_scope = None
+        self.set_stale_text("")
+        if self.deployments_popup_manager:
+            self.deployments_popup_manager.dismiss()
+            self.deployments_popup_manager = None
 
     def display_get_deployments_result(self, output):
         """Update deployments based on the command result."""
         self.deployments_grid.clear_widgets()
+        self.deployment_details.text = ""
         deployments_output = output.strip()
         if deployments_output:
             deployments_lines = deployments_output.split('\n')  # SDK returns deployment names, one per line
             for line in deployments_lines:
                 if line:
                     deployment_name = line
-                    radio_button = ToggleButton(text=deployment_name, group='deployments', size_hint_y=None, height=40)
-                    self.deployments_grid.add_widget(radio_button)
\ No newline at end of file
+                    radio_button = ToggleButton(text=deployment_name, group='deployments', size_hint_y=None, height=40, disabled=not self.commands_enabled)
+                    radio_button.bind(state=self.deployment_toggle_callback)
+                    self.deployments_grid.add_widget(radio_button)
+
+    def deployment_toggle_callback(self, instance, state):
+        """Fetch the full deployment only once it is selected."""
+        if state != 'down':
+            return
+        self.deployment_details.text = "Fetching deployment..."
+        self.azure_client.get_deployment_details(instance.text, self.namespace_spinner.text)
+
+    def on_deployment_details(self, instance, output):
+        """Handle deployment details event from AzureClient."""
+        self.deployment_details.text = output
@@ -0,0 +1,86 @@
+import time
+from kivymd.uix.tab import MDTabsBase
+from kivymd.uix.floatlayout import MDFloatLayout
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.label import Label
+from kivy.metrics import dp
+from kivymd.uix.button import MDRaisedButton
+from data.colors import *
+from ui.datatable import CustomDataTable
+
+class MetricsTab(MDFloatLayout, MDTabsBase):
+    """Percentiles of the durations and sizes the client and tabs record, with JSON/CSV export."""
+
+    def __init__(self, metrics, **kwargs):
+        super().__init__(title='Metrics', _md_bg_color=TAB_GRAY, **kwargs)
+        self.metrics = metrics
+        self.built = False  # Widgets are created when the tab is first shown
+
+    def build_content(self):
+        """Create the tab's widgets on first activation; refresh the figures on every one."""
+        if self.built:
+            self.refresh()
+            return
+        self.built = True
+
+        # UI
+        self.content = BoxLayout(orientation='vertical')
+        self.buttons_layout = BoxLayout(orientation='horizontal', size_hint=(1.0, None), height=40)
+        for text, callback in (('Refresh', self.refresh_button_callback),
+                               ('Export JSON', self.export_json_button_callback),
+                               ('Export CSV', self.export_csv_button_callback),
+                               ('Reset', self.reset_button_callback)):
+            button = MDRaisedButton(text=text, size_hint=(0.25, None), height=40, md_bg_color=BUTTON_DARK_GRAY, text_color=WHITE)
+            button.bind(on_press=callback)
+            self.buttons_layout.add_widget(button)
+        self.content.add_widget(self.buttons_layout)
+        self.metrics_table = CustomDataTable(
+            column_data=["Operation", "Count", "p50", "p95", "p99", "Max"],
+            row_data=[],
+            column_widths=[dp(260), dp(80), dp(100), dp(100), dp(100), dp(100)],
+            virtualized=True
+        )
+        self.content.add_widget(self.metrics_table)
+        self.status_label = Label(text="", size_hint=(1.0, None), height=30, color=BLACK)
+        self.content.add_widget(self.status_label)
+        self.add_widget(self.content)
+        self.refresh()
+
+    def refresh(self):
+        """Show the current summaries, one row per operation."""
+        rows = []
+        for name, summary in self.metrics.summaries().items():
+            rows.append((name, str(summary['count'])) + tuple(
+                self.format_value(summary[field], summary['unit']) for field in ('p50', 'p95', 'p99', 'max')))
+        self.metrics_table.sync_row_data(rows)
+
+    def format_value(self, value, unit):
+        """Durations in milliseconds, sizes in KiB."""
+        if value is None:
+            return ""
+        if unit == 'bytes':
+            return f"{value / 1024:.1f} KiB"
+        return f"{value * 1000:.1f} ms"
+
+    def refresh_button_callback(self, instance):
+        self.refresh()
+
+    def export_json_button_callback(self, instance):
+        self.export('json')
+
+    def export_csv_button_callback(self, instance):
+        self.export('csv')
+
+    def reset_button_callback(self, instance):
+        self.metrics.reset()
+        self.refresh()
+        self.status_label.text = "Metrics reset"
+
+    def export(self, extension):
+        """Write the summaries to metrics-<timestamp>.<extension> in the working directory."""
+        path = f"metrics-{time.strftime('%Y%m%d-%H%M%S')}.{extension}"
+        try:
+            self.metrics.export(path)
+            self.status_label.text = f"Exported to {path}"
+        except OSError as e:
+            self.status_label.text = f"Error exporting metrics: {e}"
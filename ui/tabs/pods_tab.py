@@ -3,45 +3,104 @@ from kivymd.uix.floatlayout import MDFloatLayout
 from kivy.uix.boxlayout import BoxLayout
 from kivymd.uix.button import MDRaisedButton
 from kivy.uix.textinput import TextInput
+from kivy.uix.label import Label
 from kivy.uix.scrollview import ScrollView
 from kivy.metrics import dp
+from kivy.clock import Clock
 from data.colors import *
 from ui.popup import PopupManager
 from ui.datatable import CustomDataTable
+from ui.log_buffer import LogBuffer
+from ui.log_filter import LogFilter, parse_query
 
 class PodsTab(MDFloatLayout, MDTabsBase):
     POD_LAYOUT_SIZE_HINT = (0.35, 1)
     OUTPUT_LAYOUT_SIZE_HINT = (0.65, 1)
+    LOG_FOLLOW_TAIL_LINES = 500
+    LOG_BUFFER_MAX_LINES = 2000000
+    LOG_BUFFER_MAX_CHARS = 256 * 1024 * 1024  # Room for a 100 MB log and its lowercased copies
+    OUTPUT_WINDOW_LINES = 1000  # Lines rendered into command_output at a time
+    FILTER_DEBOUNCE_SECONDS = 0.3
 
-    def __init__(self, azure_client, namespace_spinner, **kwargs):
+    def __init__(self, azure_client, namespace_spinner, clusters_provider=None, snapshot_store=None, **kwargs):
         super().__init__(title='Pods', _md_bg_color=TAB_GRAY, **kwargs)
         self.azure_client = azure_client
         self.namespace_spinner = namespace_spinner
+        self.clusters_provider = clusters_provider  # Returns the (resource_group, cluster) pairs to fan out to
+        self.snapshot_store = snapshot_store
+        self.snapshot_scope = None  # (cluster, namespace) of the pods being listed
+        self.stale_scope = None  # (cluster, namespace) of the snapshot shown, until fresh pods replace it
         self.last_selected_pod = None
-        self.full_output = ""
+        self.commands_enabled = False  # The selected cluster is the merged one, so commands reach it
+        self.pods_namespace = None  # Namespace the table rows belong to
+        self.requested_namespace = None
+        self.log_buffer = LogBuffer(max_lines=self.LOG_BUFFER_MAX_LINES, max_chars=self.LOG_BUFFER_MAX_CHARS)
+        self.view_matches = None  # Line numbers matching the filter, None when unfiltered
+        self.filter_matcher = None  # Predicate of the current filter, for streamed lines
+        self.filter_snapshot_end = 0  # First line that may change after the running filter's snapshot
+        self.log_filter = LogFilter(self.on_filter_result)
+        self.filter_trigger = Clock.create_trigger(self.filter_output, self.FILTER_DEBOUNCE_SECONDS)
+        self.view_start = None  # First position shown, None to stick to the newest lines
         self.pods_popup_manager = None
         self.logs_popup_manager = None
+        self.watching = False
+        self.following = False
+        self.page_cursor = 0  # Table position after the last page applied
+        self.listed_pods = set()  # Pod names seen so far in the current list
+        self.fan_out = False  # Showing the multi-cluster table
+        self.fan_out_namespace = None
+        self.fan_out_clusters = 0  # Clusters asked in the current fan-out list
+        self.fan_out_errors = []  # (cluster, message) of the current fan-out list
         
         self.azure_client.bind(on_pods_output=self.on_pods_output)
+        self.azure_client.bind(on_pods_page=self.on_pods_page)
+        self.azure_client.bind(on_pods_complete=self.on_pods_complete)
+        self.azure_client.bind(on_pod_events=self.on_pod_events)
+        self.azure_client.bind(on_fan_out_pods=self.on_fan_out_pods)
+        self.azure_client.bind(on_fan_out_error=self.on_fan_out_error)
+        self.azure_client.bind(on_fan_out_complete=self.on_fan_out_complete)
         self.azure_client.bind(on_logs_output=self.on_logs_output)
+        self.azure_client.bind(on_logs_append=self.on_logs_append)
+        self.azure_client.bind(on_logs_follow_end=self.on_logs_follow_end)
         self.azure_client.bind(on_describe_output=self.on_describe_output)
 
         self.content = BoxLayout(orientation='horizontal')
         
         # LEFT PANEL
         self.left_panel = BoxLayout(orientation='vertical', size_hint=self.POD_LAYOUT_SIZE_HINT)
-        self.get_pods_button = MDRaisedButton(text='Get Pods', size_hint=(1.0, None), height=40, disabled=True, md_bg_color=BUTTON_DARK_GRAY, text_color=WHITE)
+        self.pods_command_layout = BoxLayout(orientation='horizontal', size_hint=(1.0, None), height=40, spacing=2)
+        self.get_pods_button = MDRaisedButton(text='Get Pods', size_hint=(0.4, 1), disabled=True, md_bg_color=BUTTON_DARK_GRAY, text_color=WHITE)
         self.get_pods_button.bind(on_press=self.get_pods_button_callback)
-        self.left_panel.add_widget(self.get_pods_button)
+        self.watch_pods_button = MDRaisedButton(text='Watch', size_hint=(0.3, 1), disabled=True, md_bg_color=BUTTON_DARK_GRAY, text_color=WHITE)
+        self.watch_pods_button.bind(on_press=self.watch_pods_button_callback)
+        self.fan_out_button = MDRaisedButton(text='All Clusters', size_hint=(0.3, 1), disabled=True, md_bg_color=BUTTON_DARK_GRAY, text_color=WHITE)
+        self.fan_out_button.bind(on_press=self.fan_out_button_callback)
+        self.pods_command_layout.add_widget(self.get_pods_button)
+        self.pods_command_layout.add_widget(self.watch_pods_button)
+        self.pods_command_layout.add_widget(self.fan_out_button)
+        self.left_panel.add_widget(self.pods_command_layout)
+        self.stale_label = Label(text="", size_hint=(1.0, None), height=0, color=BLACK)
+        self.left_panel.add_widget(self.stale_label)
+        self.namespace_spinner.bind(text=self.stop_watching)
+        self.namespace_spinner.bind(text=self.stop_following)
         
         self.pods_container = ScrollView(size_hint=(1, 1), do_scroll_x=False, do_scroll_y=True)
         self.pods_table = CustomDataTable(
             column_data=["Name", "Status", "Age", "Restarts"],
             row_data=[],
-            column_widths=[dp(200), dp(150), dp(100), dp(100)]
+            column_widths=[dp(200), dp(150), dp(100), dp(100)],
+            virtualized=True
         )
         self.pods_table.bind(on_row_select=self.pod_row_press)
         self.pods_container.add_widget(self.pods_table)
+        self.fan_out_table = CustomDataTable(
+            column_data=["Cluster", "Name", "Status", "Age", "Restarts"],
+            row_data=[],
+            column_widths=[dp(150), dp(200), dp(150), dp(100), dp(100)],
+            virtualized=True,
+            key_columns=2
+        )
+        self.fan_out_table.bind(on_row_select=self.pod_row_press)
         self.left_panel.add_widget(self.pods_container)
         self.content.add_widget(self.left_panel)
         
@@ -49,22 +108,36 @@ class PodsTab(MDFloatLayout, MDTabsBase):
         self.right_panel = BoxLayout(orientation='vertical', size_hint=self.OUTPUT_LAYOUT_SIZE_HINT)
         
         self.command_layout = BoxLayout(orientation='horizontal', size_hint_y=0.10, spacing=2)
-        self.fetch_logs_button = MDRaisedButton(text='Fetch Logs', size_hint=(0.5, 1), disabled=True, md_bg_color=BUTTON_DARK_GRAY, text_color=WHITE)
+        self.fetch_logs_button = MDRaisedButton(text='Fetch Logs', size_hint=(0.333, 1), disabled=True, md_bg_color=BUTTON_DARK_GRAY, text_color=WHITE)
         self.fetch_logs_button.bind(on_press=self.get_logs_button_callback)
-        self.describe_pod_button = MDRaisedButton(text='Describe Pod', size_hint=(0.5, 1), disabled=True, md_bg_color=BUTTON_DARK_GRAY, text_color=WHITE)
+        self.follow_logs_button = MDRaisedButton(text='Follow Logs', size_hint=(0.333, 1), disabled=True, md_bg_color=BUTTON_DARK_GRAY, text_color=WHITE)
+        self.follow_logs_button.bind(on_press=self.follow_logs_button_callback)
+        self.describe_pod_button = MDRaisedButton(text='Describe Pod', size_hint=(0.333, 1), disabled=True, md_bg_color=BUTTON_DARK_GRAY, text_color=WHITE)
         self.describe_pod_button.bind(on_press=self.describe_pod_button_callback)
         self.command_layout.add_widget(self.fetch_logs_button)
+        self.command_layout.add_widget(self.follow_logs_button)
         self.command_layout.add_widget(self.describe_pod_button)
         self.right_panel.add_widget(self.command_layout)
         
         self.output_layout = BoxLayout(orientation='vertical', size_hint_y=0.90)
+        self.filter_layout = BoxLayout(orientation='horizontal', size_hint_y=0.1, spacing=2)
         self.filter_input = TextInput(
             multiline=False,
-            size_hint_y=0.1,
+            size_hint_x=0.6,
             hint_text='Filter (e.g., req_id, error)',
         )
         self.filter_input.bind(on_text_validate=self.filter_output)
-        self.output_layout.add_widget(self.filter_input)
+        self.filter_input.bind(text=lambda instance, text: self.filter_trigger())  # Filter as you type
+        self.older_output_button = MDRaisedButton(text='<', size_hint=(0.08, 1), md_bg_color=BUTTON_DARK_GRAY, text_color=WHITE)
+        self.older_output_button.bind(on_press=self.show_older_output)
+        self.newer_output_button = MDRaisedButton(text='>', size_hint=(0.08, 1), md_bg_color=BUTTON_DARK_GRAY, text_color=WHITE)
+        self.newer_output_button.bind(on_press=self.show_newer_output)
+        self.output_position_label = Label(size_hint_x=0.24, color=BLACK)
+        self.filter_layout.add_widget(self.filter_input)
+        self.filter_layout.add_widget(self.older_output_button)
+        self.filter_layout.add_widget(self.newer_output_button)
+        self.filter_layout.add_widget(self.output_position_label)
+        self.output_layout.add_widget(self.filter_layout)
         self.command_output = TextInput(
             multiline=True,
             readonly=True,
@@ -76,96 +149,413 @@ class PodsTab(MDFloatLayout, MDTabsBase):
         self.content.add_widget(self.right_panel)
         self.add_widget(self.content)
 
+    def set_commands_enabled(self, enabled):
+        """Enable or disable the commands that need the selected cluster to be merged."""
+        self.commands_enabled = enabled
+        self.get_pods_button.disabled = not enabled
+        self.watch_pods_button.disabled = not enabled
+        if not enabled:
+            self.stop_watching()
+        self.check_get_logs_button_state()
+
     def get_pods_button_callback(self, instance):
         """Fetch pods using AzureClient."""
         namespace = self.namespace_spinner.text
+        self.stop_watching()
+        self.show_fan_out_table(False)
+        self.requested_namespace = namespace
+        self.snapshot_scope = (self.azure_client.current_context, namespace)
+        if self.pods_popup_manager:
+            self.pods_popup_manager.dismiss()
         self.pods_popup_manager = PopupManager("Getting Pods", "Fetching pods...")
         self.azure_client.get_pods(namespace)
 
+    def show_snapshot(self, cluster, namespace):
+        """Show the pods last listed in cluster and namespace, marked stale, if there is a snapshot."""
+        if (cluster, namespace) == self.stale_scope or self.watching or self.fan_out:
+            return
+        snapshot = self.snapshot_store.get(cluster, namespace, 'pods') if self.snapshot_store else None
+        if snapshot is None:
+            self.stale_scope = None
+            self.set_stale_text("")
+            return
+        self.pods_namespace = self.requested_namespace = namespace
+        self.pods_table.update_row_data([tuple(row) for row in snapshot['items']])
+        self.clear_pod_selection()
+        self.stale_scope = (cluster, namespace)
+        self.set_stale_text(self.snapshot_store.stale_text(snapshot))
+
+    def refresh_snapshot(self):
+        """List the pods again in the background if a stale snapshot is shown."""
+        if self.stale_scope is None or self.watching or self.fan_out:
+            return
+        cluster, namespace = self.stale_scope
+        self.requested_namespace = namespace
+        self.snapshot_scope = self.stale_scope
+        self.azure_client.get_pods(namespace)
+
+    def save_snapshot(self):
+        """Keep the freshly listed pods and drop the stale mark."""
+        if self.snapshot_store and self.snapshot_scope:
+            self.snapshot_store.put(*self.snapshot_scope, 'pods', self.pods_table.row_data)
+        self.stale_scope = None
+        self.set_stale_text("")
+
+    def set_stale_text(self, text):
+        self.stale_label.text = text
+        self.stale_label.height = dp(20) if text else 0
+
     def on_pods_output(self, instance, output):
-        """Handle pods output event from AzureClient."""
+        """Handle a pod list error from AzureClient."""
         self.display_get_pods_result(output)
-        self.pods_popup_manager.dismiss()
-        self.pods_popup_manager = None
+        if self.pods_popup_manager:  # A watch relists without a popup
+            self.pods_popup_manager.dismiss()
+            self.pods_popup_manager = None
+
+    def on_pods_page(self, instance, pods, page_index):
+        """Render one page of pods as soon as it arrives."""
+        if page_index == 0:
+            if self.pods_popup_manager:
+                self.pods_popup_manager.dismiss()
+                self.pods_popup_manager = None
+            if self.requested_namespace != self.pods_namespace:
+                self.pods_namespace = self.requested_namespace
+                self.pods_table.update_row_data([])
+            self.page_cursor = 0
+            self.listed_pods = set()
+        with self.azure_client.metrics.timer('pods_tab.apply_page'):
+            rows = [self.pod_row(pod) for pod in pods]
+            self.listed_pods.update(row[0] for row in rows)
+            self.page_cursor = self.pods_table.upsert_rows(rows, self.page_cursor)
+
+    def on_pods_complete(self, instance, total):
+        """Drop the pods that were not in any page of the finished list."""
+        self.pods_table.remove_rows([row[0] for row in self.pods_table.row_data if row[0] not in self.listed_pods])
+        self.listed_pods = set()
+        self.save_snapshot()
+        if self.pods_table.selected_key != self.last_selected_pod:
+            self.clear_pod_selection()
+
+    def watch_pods_button_callback(self, instance):
+        """Toggle the live pod watch for the selected namespace."""
+        if self.watching:
+            self.stop_watching()
+            return
+        namespace = self.namespace_spinner.text
+        self.show_fan_out_table(False)
+        self.requested_namespace = namespace
+        self.snapshot_scope = (self.azure_client.current_context, namespace)
+        self.watching = True
+        self.watch_pods_button.text = 'Stop Watch'
+        if self.pods_popup_manager:
+            self.pods_popup_manager.dismiss()
+        self.pods_popup_manager = PopupManager("Watching Pods", "Fetching pods...")
+        self.azure_client.watch_pods(namespace)
+
+    def stop_watching(self, *args):
+        """Stop the live pod watch, if any."""
+        if not self.watching:
+            return
+        self.watching = False
+        self.watch_pods_button.text = 'Watch'
+        self.azure_client.stop_watch_pods()
+
+    def on_pod_events(self, instance, events):
+        """Apply a batch of (type, pod) watch events to the table."""
+        latest = {}
+        for event_type, pod in events:
+            latest.pop(pod["name"], None)  # Keep the last event per pod, in arrival order
+            latest[pod["name"]] = (event_type, pod)
+        with self.azure_client.metrics.timer('pods_tab.apply_events'):
+            deleted = [name for name, (event_type, pod) in latest.items() if event_type == 'DELETED']
+            upserts = [self.pod_row(pod) for event_type, pod in latest.values() if event_type != 'DELETED']
+            self.pods_table.remove_rows(deleted)
+            self.pods_table.upsert_rows(upserts)
+        if self.pods_table.selected_key != self.last_selected_pod:
+            self.clear_pod_selection()
+
+    def fan_out_button_callback(self, instance):
+        """List the namespace's pods on every cluster of the selected region and environment."""
+        clusters = self.clusters_provider() if self.clusters_provider else []
+        if not clusters:
+            self.set_output("No clusters in the selected region and environment")
+            return
+        namespace = self.namespace_spinner.text
+        self.stop_watching()
+        self.show_fan_out_table(True)
+        if namespace != self.fan_out_namespace:
+            self.fan_out_namespace = namespace
+            self.fan_out_table.update_row_data([])
+            self.clear_pod_selection()
+        self.fan_out_clusters = len(clusters)
+        self.fan_out_errors = []
+        if self.pods_popup_manager:
+            self.pods_popup_manager.dismiss()
+        self.pods_popup_manager = PopupManager("Getting Pods", f"Fetching pods from {len(clusters)} clusters...")
+        self.azure_client.get_pods_fan_out(namespace, clusters)
+
+    def show_fan_out_table(self, fan_out):
+        """Swap between the single-cluster and the multi-cluster pods table."""
+        if fan_out == self.fan_out:
+            return
+        self.fan_out = fan_out
+        self.pods_container.clear_widgets()
+        self.pods_container.add_widget(self.fan_out_table if fan_out else self.pods_table)
+        self.clear_pod_selection()
+
+    def on_fan_out_pods(self, instance, cluster, pods):
+        """Replace the rows of one cluster with its freshly listed pods."""
+        if self.pods_popup_manager:
+            self.pods_popup_manager.dismiss()
+            self.pods_popup_manager = None
+        with self.azure_client.metrics.timer('pods_tab.apply_fan_out'):
+            rows = [(cluster,) + self.pod_row(pod) for pod in pods]
+            keys = {self.fan_out_table.row_key(row) for row in rows}
+            self.fan_out_table.remove_rows([
+                self.fan_out_table.row_key(row) for row in self.fan_out_table.row_data
+                if row[0] == cluster and self.fan_out_table.row_key(row) not in keys
+            ])
+            self.fan_out_table.upsert_rows(rows)
+
+    def on_fan_out_error(self, instance, cluster, message):
+        """Drop the rows of a cluster that failed or timed out, and report it."""
+        self.fan_out_errors.append((cluster, message))
+        self.fan_out_table.remove_rows([self.fan_out_table.row_key(row) for row in self.fan_out_table.row_data if row[0] == cluster])
+        if not self.last_selected_pod:
+            self.show_fan_out_report()
+
+    def on_fan_out_complete(self, instance, total, failed):
+        """Report the outcome of the fan-out list."""
+        if self.pods_popup_manager:
+            self.pods_popup_manager.dismiss()
+            self.pods_popup_manager = None
+        if self.fan_out_table.selected_key != self.last_selected_pod:
+            self.clear_pod_selection()
+        if not self.last_selected_pod:
+            self.show_fan_out_report(total)
+
+    def show_fan_out_report(self, total=None):
+        """Show which clusters of the fan-out list failed."""
+        lines = [f"{cluster}: {message}" for cluster, message in self.fan_out_errors]
+        if total is not None:
+            answered = self.fan_out_clusters - len(self.fan_out_errors)
+            lines.insert(0, f"{total} pods from {answered} of {self.fan_out_clusters} clusters")
+        self.set_output("\n".join(lines))
+
+    def pod_row(self, pod):
+        """Convert a pod dict from AzureClient to a table row."""
+        return (pod["name"], pod["status"], pod["age"], str(pod["restarts"]))
 
     def display_get_pods_result(self, output):
-        """Display pods based on the command result."""
+        """Clear the table after a failed pod list; pods themselves arrive with on_pods_page."""
+        self.pods_table.update_row_data([])
+        self.clear_pod_selection()
+        self.stale_scope = None
+        self.set_stale_text("")
+
+    def clear_pod_selection(self):
+        """Forget the selected pod and its output."""
+        self.stop_following()
         self.last_selected_pod = None
         self.fetch_logs_button.disabled = True
+        self.follow_logs_button.disabled = True
         self.describe_pod_button.disabled = True
-        self.full_output = ""
-        self.command_output.text = ""
-        self.filter_input.text = ""
-        
-        if isinstance(output, str) and "Error" in output:
-            self.pods_table.update_row_data([])
-            return
-        
-        # Update table with pod data
-        row_data = [
-            (pod["name"], pod["status"], pod["age"], str(pod["restarts"]))
-            for pod in output
-        ]
-        self.pods_table.update_row_data(row_data)
+        self.set_output("")
 
     def pod_row_press(self, instance, pod_name):
         """Handle row selection in the table."""
+        if pod_name != self.last_selected_pod:
+            self.stop_following()
         self.last_selected_pod = pod_name
         self.check_get_logs_button_state()
 
+    def selected_pod(self):
+        """Return (pod name, context) of the selected pod; context is None for the current cluster."""
+        if self.fan_out and self.last_selected_pod:
+            cluster, name = self.last_selected_pod
+            return name, cluster
+        return self.last_selected_pod, None
+
     def check_get_logs_button_state(self):
-        """Enable/disable command buttons based on pod selection."""
-        enabled = bool(self.last_selected_pod)
+        """Enable/disable command buttons based on pod selection.
+
+        Rows of another cluster than the merged one, such as a snapshot shown
+        before its cluster is merged, stay read-only; fan-out rows name their cluster.
+        """
+        enabled = bool(self.last_selected_pod) and (self.commands_enabled or self.fan_out)
         self.fetch_logs_button.disabled = not enabled
+        self.follow_logs_button.disabled = not enabled
         self.describe_pod_button.disabled = not enabled
 
     def get_logs_button_callback(self, instance):
         """Fetch logs for the selected pod using AzureClient."""
         namespace = self.namespace_spinner.text
+        self.stop_following()
+        if self.logs_popup_manager:
+            self.logs_popup_manager.dismiss()
         self.logs_popup_manager = PopupManager("Getting Logs", "Fetching logs...")
-        self.azure_client.get_logs(self.last_selected_pod, namespace)
+        pod, context = self.selected_pod()
+        self.azure_client.get_logs(pod, namespace, context=context)
     
     def on_logs_output(self, instance, output):
         """Handle logs output event from AzureClient."""
         self.display_get_logs_result(output)
-        self.logs_popup_manager.dismiss()
-        self.logs_popup_manager = None
+        if self.logs_popup_manager:
+            self.logs_popup_manager.dismiss()
+            self.logs_popup_manager = None
 
     def display_get_logs_result(self, output):
         """Display the logs based on the command result."""
-        self.full_output = output
-        self.filter_input.text = ""
-        self.command_output.text = output
+        self.set_output(output)
+
+    def follow_logs_button_callback(self, instance):
+        """Toggle streaming the selected pod's logs."""
+        if self.following:
+            self.stop_following()
+            return
+        self.following = True
+        self.follow_logs_button.text = 'Stop Follow'
+        self.set_output("", keep_filter=True)
+        pod, context = self.selected_pod()
+        self.azure_client.follow_logs(pod, self.namespace_spinner.text, tail_lines=self.LOG_FOLLOW_TAIL_LINES, context=context)
+
+    def stop_following(self, *args):
+        """Stop the log follow, if any."""
+        if not self.following:
+            return
+        self.following = False
+        self.follow_logs_button.text = 'Follow Logs'
+        self.azure_client.stop_follow_logs()
+
+    def on_logs_append(self, instance, text):
+        """Append streamed log text, applying the current filter to the new lines."""
+        if not self.following:
+            return
+        # A partial last line is completed by this append, so rescan it too
+        first_new = self.log_buffer.end_line - 1 if self.log_buffer.open_line else self.log_buffer.end_line
+        self.log_buffer.append(text)
+        if self.view_matches is not None:
+            if self.view_matches and self.view_matches[-1] == first_new:
+                self.view_matches.pop()
+            self.view_matches.extend(self.match_new_lines(first_new))
+        if self.view_start is None:
+            self.render_output()
+
+    def on_logs_follow_end(self, instance, message):
+        """Handle the log stream ending on its own."""
+        if self.following:
+            self.on_logs_append(instance, f"\n[{message}]\n")
+            self.stop_following()
 
     def describe_pod_button_callback(self, instance):
         """Fetch describe for the selected pod using AzureClient."""
         namespace = self.namespace_spinner.text
+        self.stop_following()
+        if self.logs_popup_manager:
+            self.logs_popup_manager.dismiss()
         self.logs_popup_manager = PopupManager("Getting Describe", "Fetching pod describe...")
-        self.azure_client.get_describe_pod(self.last_selected_pod, namespace)
+        pod, context = self.selected_pod()
+        self.azure_client.get_describe_pod(pod, namespace, context=context)
 
     def on_describe_output(self, instance, output):
         """Handle describe output event from AzureClient."""
         self.display_get_describe_result(output)
-        self.logs_popup_manager.dismiss()  # Reuse var
-        self.logs_popup_manager = None
+        if self.logs_popup_manager:
+            self.logs_popup_manager.dismiss()  # Reuse var
+            self.logs_popup_manager = None
 
     def display_get_describe_result(self, output):
         """Display the describe output based on the command result."""
-        self.full_output = output
-        self.filter_input.text = ""
-        self.command_output.text = output
-
-    def filter_output(self, instance):
-        """Filter command_output based on filter_input text."""
-        if not self.full_output:
-            self.command_output.text = ""
+        self.set_output(output)
+
+    def set_output(self, output, keep_filter=False):
+        """Replace the output buffer and show its newest lines."""
+        self.log_buffer.clear()
+        self.log_buffer.append(output)
+        self.view_start = None
+        self.log_filter.cancel()
+        if keep_filter and self.filter_matcher:
+            self.view_matches = self.match_new_lines(self.log_buffer.first_line)
+        else:
+            self.view_matches = None
+            self.filter_matcher = None
+            self.filter_input.text = ""
+            self.filter_trigger.cancel()
+        self.render_output()
+
+    def render_output(self):
+        """Render one window of the buffer (or of the filter matches) into command_output."""
+        window = self.OUTPUT_WINDOW_LINES
+        if self.view_matches is None:
+            first, end = self.log_buffer.first_line, self.log_buffer.end_line
+        else:
+            first, end = 0, len(self.view_matches)
+        last_start = max(first, end - window)
+        start = last_start if self.view_start is None else max(first, min(self.view_start, last_start))
+        if self.view_matches is None:
+            lines = self.log_buffer.window(start, window)
+        else:
+            lines = [self.log_buffer.line(number) for number in self.view_matches[start:start + window]]
+            lines = [line for line in lines if line is not None]  # Dropped from the buffer meanwhile
+        self.command_output.text = '\n'.join(lines)
+        shown = min(window, end - start)
+        self.output_position_label.text = f"{start - first + 1 if shown else 0}-{start - first + shown} of {end - first}"
+        self.older_output_button.disabled = start <= first
+        self.newer_output_button.disabled = start >= last_start
+
+    def show_older_output(self, instance):
+        """Page back one window."""
+        first = self.log_buffer.first_line if self.view_matches is None else 0
+        end = self.log_buffer.end_line if self.view_matches is None else len(self.view_matches)
+        start = max(first, end - self.OUTPUT_WINDOW_LINES) if self.view_start is None else self.view_start
+        self.view_start = max(first, start - self.OUTPUT_WINDOW_LINES)
+        self.render_output()
+
+    def show_newer_output(self, instance):
+        """Page forward one window; reaching the end sticks to the newest lines again."""
+        if self.view_start is None:
+            return
+        end = self.log_buffer.end_line if self.view_matches is None else len(self.view_matches)
+        self.view_start += self.OUTPUT_WINDOW_LINES
+        if self.view_start >= end - self.OUTPUT_WINDOW_LINES:
+            self.view_start = None
+        self.render_output()
+
+    def filter_output(self, *args):
+        """Filter command_output based on filter_input text, on the filter worker."""
+        self.filter_trigger.cancel()
+        query = self.filter_input.text
+        try:
+            self.filter_matcher = parse_query(query)
+        except ValueError as e:
+            self.log_filter.cancel()
+            self.output_position_label.text = str(e)
             return
-        filter_text = instance.text.lower()
-        if not filter_text:
-            self.command_output.text = self.full_output
+        if self.filter_matcher is None:
+            self.log_filter.cancel()
+            self.view_matches = None
+            self.view_start = None
+            self.render_output()
             return
-        filtered_lines = [
-            line for line in self.full_output.split('\n')
-            if filter_text in line.lower()
-        ]
-        self.command_output.text = '\n'.join(filtered_lines)
\ No newline at end of file
+        first = self.log_buffer.first_line
+        self.filter_snapshot_end = self.log_buffer.end_line - 1 if self.log_buffer.open_line else self.log_buffer.end_line
+        self.log_filter.submit(query, self.log_buffer.window_lower(first, len(self.log_buffer)), first)
+        self.output_position_label.text = "Filtering..."
+
+    def on_filter_result(self, matches, error):
+        """Show the matches of a finished filter query."""
+        if error:
+            self.output_position_label.text = error
+            return
+        # Lines streamed in while the worker ran were not part of its snapshot
+        if matches and matches[-1] >= self.filter_snapshot_end:
+            matches.pop()
+        self.view_matches = matches
+        self.view_matches.extend(self.match_new_lines(self.filter_snapshot_end))
+        self.view_start = None
+        self.render_output()
+
+    def match_new_lines(self, start):
+        """Return numbers of the lines from start onwards that match the current filter."""
+        lines = self.log_buffer.window_lower(start, self.log_buffer.end_line - start)
+        return [number for number, line in enumerate(lines, start=max(start, self.log_buffer.first_line)) if self.filter_matcher(line)]
\ No newline at end of file
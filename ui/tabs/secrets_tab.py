@@ -5,51 +5,129 @@ from kivy.uix.button import Button
 from kivy.uix.scrollview import ScrollView
 from kivy.uix.gridlayout import GridLayout
 from kivy.uix.togglebutton import ToggleButton
+from kivy.uix.textinput import TextInput
+from kivy.uix.label import Label
+from kivy.metrics import dp
 from ui.popup import PopupManager
 from data.colors import *
 from kivymd.uix.button import MDRaisedButton
 
 class SecretsTab(MDFloatLayout, MDTabsBase):
-    def __init__(self, azure_client, namespace_spinner, **kwargs):
+    def __init__(self, azure_client, namespace_spinner, snapshot_store=None, **kwargs):
         super().__init__(title='Secrets', _md_bg_color=TAB_GRAY, **kwargs)
         self.azure_client = azure_client
         self.namespace_spinner = namespace_spinner
+        self.snapshot_store = snapshot_store
+        self.snapshot_scope = None  # (cluster, namespace) of the secrets being listed
+        self.stale_scope = None  # (cluster, namespace) of the snapshot shown, until fresh secrets replace it
         self.secrets_popup_manager = None
+        self.commands_enabled = False
+        self.built = False  # Widgets are created when the tab is first shown
 
+    def build_content(self):
+        """Create the tab's widgets; deferred until the tab is first shown."""
+        if self.built:
+            return
+        self.built = True
         self.azure_client.bind(on_secrets_output=self.on_secrets_output)
+        self.azure_client.bind(on_secret_details=self.on_secret_details)
 
         # UI
         self.content = BoxLayout(orientation='vertical')
-        self.get_secrets_button = MDRaisedButton(text='Get Secrets', size_hint=(1.0, None), height=40, disabled=True, md_bg_color=BUTTON_DARK_GRAY, text_color=WHITE)
+        self.get_secrets_button = MDRaisedButton(text='Get Secrets', size_hint=(1.0, None), height=40, disabled=not self.commands_enabled, md_bg_color=BUTTON_DARK_GRAY, text_color=WHITE)
         self.get_secrets_button.bind(on_press=self.get_secrets_button_callback)
         self.content.add_widget(self.get_secrets_button)
-        self.secrets_container = ScrollView(size_hint_y=0.9)
+        self.stale_label = Label(text="", size_hint=(1.0, None), height=0, color=BLACK)
+        self.content.add_widget(self.stale_label)
+        self.secrets_layout = BoxLayout(orientation='horizontal', size_hint_y=0.9)
+        self.secrets_container = ScrollView(size_hint_x=0.4)
         self.secrets_grid = GridLayout(cols=1, size_hint_y=None)
         self.secrets_grid.bind(minimum_height=self.secrets_grid.setter('height'))
         self.secrets_container.add_widget(self.secrets_grid)
-        self.content.add_widget(self.secrets_container)
+        self.secrets_layout.add_widget(self.secrets_container)
+        self.secret_details = TextInput(multiline=True, readonly=True, size_hint_x=0.6)
+        self.secrets_layout.add_widget(self.secret_details)
+        self.content.add_widget(self.secrets_layout)
         self.add_widget(self.content)
+        if self.stale_scope:
+            self.display_snapshot(self.snapshot_store.get(*self.stale_scope, 'secrets'))
+            self.refresh_snapshot()
+
+    def set_commands_enabled(self, enabled):
+        """Enable or disable the Get button and the secrets' details, now or once the tab is built."""
+        self.commands_enabled = enabled
+        if self.built:
+            self.get_secrets_button.disabled = not enabled
+            for button in self.secrets_grid.children:
+                button.disabled = not enabled  # Snapshot rows of a cluster not merged yet stay read-only
 
     def get_secrets_button_callback(self, instance):
         """Fetch secrets using AzureClient."""
         namespace = self.namespace_spinner.text
+        if self.secrets_popup_manager:
+            self.secrets_popup_manager.dismiss()
         self.secrets_popup_manager = PopupManager("Getting Secrets", "Fetching secrets...")
+        self.snapshot_scope = (self.azure_client.current_context, namespace)
         self.azure_client.get_secrets(namespace)
 
+    def show_snapshot(self, cluster, namespace):
+        """Show the secrets last listed in cluster and namespace, marked stale, now or once the tab is built."""
+        if (cluster, namespace) == self.stale_scope:
+            return
+        snapshot = self.snapshot_store.get(cluster, namespace, 'secrets') if self.snapshot_store else None
+        self.stale_scope = (cluster, namespace) if snapshot else None
+        if self.built:
+            self.display_snapshot(snapshot)
+
+    def display_snapshot(self, snapshot):
+        """Render a snapshot's secrets with the stale mark; None only clears the mark."""
+        if snapshot:
+            self.display_get_secrets_result("\n".join(snapshot['items']))
+        self.set_stale_text(self.snapshot_store.stale_text(snapshot) if snapshot else "")
+
+    def refresh_snapshot(self):
+        """List the secrets again in the background if a stale snapshot is shown."""
+        if self.stale_scope is None or not self.built or not self.commands_enabled:
+            return
+        self.snapshot_scope = self.stale_scope
+        self.azure_client.get_secrets(self.stale_scope[1])
+
+    def set_stale_text(self, text):
+        self.stale_label.text = text
+        self.stale_label.height = dp(20) if text else 0
+
     def on_secrets_output(self, instance, output):
         """Handle secrets output event from AzureClient."""
         self.display_get_secrets_result(output)
-        self.secrets_popup_manager.dismiss()
-        self.secrets_popup_manager = None
+        if self.snapshot_store and self.snapshot_scope and not output.startswith("Error"):
+            self.snapshot_store.put(*self.snapshot_scope, 'secrets', [line for line in output.strip().split('\n') if line])
+        self.stale_scope = None
+        self.set_stale_text("")
+        if self.secrets_popup_manager:
+            self.secrets_popup_manager.dismiss()
+            self.secrets_popup_manager = None
 
     def display_get_secrets_result(self, output):
         """Update secrets based on the command result."""
         self.secrets_grid.clear_widgets()
+        self.secret_details.text = ""
         secrets_output = output.strip()
         if secrets_output:
             secrets_lines = secrets_output.split('\n')  # SDK returns secret names, one per line
             for line in secrets_lines:
                 if line:
                     secret_name = line
-                    radio_button = ToggleButton(text=secret_name, group='secrets', size_hint_y=None, height=40)
-                    self.secrets_grid.add_widget(radio_button)
\ No newline at end of file
+                    radio_button = ToggleButton(text=secret_name, group='secrets', size_hint_y=None, height=40, disabled=not self.commands_enabled)
+                    radio_button.bind(state=self.secret_toggle_callback)
+                    self.secrets_grid.add_widget(radio_button)
+
+    def secret_toggle_callback(self, instance, state):
+        """Fetch the full secret only once it is selected."""
+        if state != 'down':
+            return
+        self.secret_details.text = "Fetching secret..."
+        self.azure_client.get_secret_details(instance.text, self.namespace_spinner.text)
+
+    def on_secret_details(self, instance, output):
+        """Handle secret details event from AzureClient."""
+        self.secret_details.text = output